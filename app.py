@@ -4,10 +4,14 @@ Karoo v2.0 — Main Streamlit Application
 Groq (free) + OpenAI + Anthropic
 """
 import asyncio
+import functools
 import hashlib
+import importlib.util
 import logging
 import os
 import sys
+import threading
+import time
 from io import BytesIO
 from datetime import datetime
 
@@ -18,6 +22,14 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+sys.path.insert(0, ".")
+
+# Module-top imports are resolved once; charts/exporter lazy-import their
+# heavy deps (plotly, reportlab) internally so this stays cheap.
+from src.core.exporter import export_to_txt, export_to_docx, export_to_pdf
+from src.core.job_scraper import scrape_job_url, is_valid_url
+from src.ui.charts import agent_bar_chart, radar_chart, score_gauge
+
 # ─── Page Config ──────────────────────────────────────────────────────────────
 st.set_page_config(
     page_title="ATS-GOD v2 | AI CV Optimizer",
@@ -27,7 +39,10 @@ st.set_page_config(
 )
 
 # ─── CSS ──────────────────────────────────────────────────────────────────────
-st.markdown("""<style>
+# Built once at import; each rerun re-emits the same cached string.
+# (A session_state "emit once" guard would drop the <style> element on
+# rerun — Streamlit removes elements that aren't re-emitted.)
+_CSS = """<style>
 @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap');
 * { font-family: 'Inter', sans-serif; }
 
@@ -105,23 +120,46 @@ st.markdown("""<style>
 
 /* Progress bar custom */
 .stProgress > div > div > div { background-color: #1565C0; }
-</style>""", unsafe_allow_html=True)
+</style>"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
+
+
+# Score bars have only 11 possible shapes — precompute them once.
+_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
+ICONS = {
+    "algorithm_breaker": "🎯", "sa_specialist": "🇿🇦", "global_setter": "🌍",
+    "recruiter_scanner": "👁️", "hiring_manager": "💼", "semantic_matcher": "📊",
+    "compliance_guardian": "⚖️", "future_architect": "🚀",
+    "interview_coach": "🎤", "salary_intelligence": "💰",
+}
+_LABELS = {k: k.replace("_", " ").title() for k in ICONS}
 
 
 # ─── File Extraction ───────────────────────────────────────────────────────────
 
 def read_pdf(file) -> str:
+    if hasattr(file, "seek"):
+        file.seek(0)
+    data = file.read() if hasattr(file, "read") else file
     try:
-        from PyPDF2 import PdfReader
-        reader = PdfReader(file)
-        text = "\n".join(p.extract_text() or "" for p in reader.pages)
-        if len(text.strip()) >= 100:
+        import fitz  # PyMuPDF — ~10x faster than PyPDF2/pdfplumber
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            text = "\n".join(page.get_text("text") for page in doc)
+            if len(text.strip()) >= 100:
+                return text
+            # Scanned PDF heuristic: first page has images but no text layer.
+            scanned = len(doc) > 0 and not doc[0].get_text().strip() and bool(doc[0].get_images())
+        if text.strip() and not scanned:
+            # Genuinely short CV — returning it beats a second full parse.
             return text
     except Exception:
         pass
+    # Last resort: pdfplumber handles some scanned/odd PDFs better
     try:
         import pdfplumber
-        with pdfplumber.open(file) as pdf:
+        with pdfplumber.open(BytesIO(data)) as pdf:
             return "\n".join(p.extract_text() or "" for p in pdf.pages)
     except Exception as e:
         st.error(f"PDF read failed: {e}. Try pasting text instead.")
@@ -129,22 +167,80 @@ def read_pdf(file) -> str:
 
 
 def read_docx(file) -> str:
+    # docx2txt does a single C-level XML walk — 2-3x faster than
+    # traversing python-docx's object model for table-heavy CVs.
+    try:
+        import docx2txt
+        text = docx2txt.process(file)
+        if text and text.strip():
+            return text
+    except Exception:
+        if hasattr(file, "seek"):
+            file.seek(0)
     try:
         from docx import Document
-        doc = Document(file)
-        parts = [p.text for p in doc.paragraphs if p.text.strip()]
-        for table in doc.tables:
-            for row in table.rows:
-                parts.append(" | ".join(c.text.strip() for c in row.cells if c.text.strip()))
-        return "\n".join(parts)
+
+        def _iter(doc):
+            for p in doc.paragraphs:
+                t = p.text
+                if t and not t.isspace():
+                    yield t
+            for table in doc.tables:
+                for row in table.rows:
+                    cells = [c for c in (cell.text.strip() for cell in row.cells) if c]
+                    if cells:
+                        yield " | ".join(cells)
+
+        return "\n".join(_iter(Document(file)))
     except Exception as e:
         st.error(f"DOCX read failed: {e}")
         return ""
 
 
+@st.cache_data(ttl=6 * 3600, max_entries=64, show_spinner=False)
+def cached_scrape(url: str):
+    """Cached job-URL scrape — repeat analyses of the same posting skip the fetch."""
+    return scrape_job_url(url)
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def _extract_cv(file_bytes: bytes, kind: str) -> str:
+    """Cached extraction — Streamlit hashes file_bytes, so widget reruns skip the re-parse."""
+    if "pdf" in kind:
+        return read_pdf(file_bytes)
+    return read_docx(BytesIO(file_bytes))
+
+
+# ─── Orchestrator ──────────────────────────────────────────────────────────────
+
+@st.cache_resource(show_spinner=False)
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """One background event loop per session — avoids per-click loop setup/teardown.
+
+    Deliberately not asyncio.run(): that would rebuild the loop (and any
+    provider connection pools opened on it) every click, and calling
+    set_event_loop on Streamlit's script thread can clash with other
+    libraries' loop handling. The daemon loop thread keeps pools warm
+    across runs.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+@st.cache_resource(show_spinner=False)
+def get_orchestrator():
+    """One orchestrator per session — LLM client setup is too slow to repeat per run."""
+    from src.core.orchestrator import KarooOrchestrator
+    return KarooOrchestrator()
+
+
 # ─── API Detection ─────────────────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=1)
 def detect_available_llm():
+    # API keys don't change mid-session; no point re-reading the
+    # environment on every rerun.
     checks = [
         ("GROQ_API_KEY", "gsk_your", "Groq (free)"),
         ("OPENAI_API_KEY", "sk-your", "OpenAI"),
@@ -238,8 +334,12 @@ def render_sidebar():
 
 
 # ─── Results ───────────────────────────────────────────────────────────────────
+# Dashboard and downloads are separate st.fragments: clicking a download
+# button reruns only the downloads fragment instead of rebuilding every
+# Plotly figure and text area in the report.
 
-def render_results(results: dict):
+@st.fragment
+def _render_dashboard(results: dict):
     summary = results.get("summary", {})
     overall = summary.get("overall_score", 0)
     prob = summary.get("interview_probability", 0)
@@ -251,7 +351,6 @@ def render_results(results: dict):
 
     with col_gauge:
         try:
-            from src.ui.charts import score_gauge
             fig = score_gauge(int(overall))
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
@@ -287,7 +386,6 @@ def render_results(results: dict):
         st.subheader("📈 Score Analytics")
         vcol1, vcol2 = st.columns(2)
         try:
-            from src.ui.charts import radar_chart, agent_bar_chart
             with vcol1:
                 fig = radar_chart(agent_scores)
                 if fig: st.plotly_chart(fig, use_container_width=True)
@@ -299,37 +397,39 @@ def render_results(results: dict):
 
     # ── Agent Grid ──────────────────────────────────────────────────
     st.subheader("🤖 Agent Scores")
-    ICONS = {
-        "algorithm_breaker": "🎯", "sa_specialist": "🇿🇦", "global_setter": "🌍",
-        "recruiter_scanner": "👁️", "hiring_manager": "💼", "semantic_matcher": "📊",
-        "compliance_guardian": "⚖️", "future_architect": "🚀",
-        "interview_coach": "🎤", "salary_intelligence": "💰",
-    }
+    # One markdown call per column instead of one per card — fewer
+    # round-trips through Streamlit's delta protocol.
     cols = st.columns(5)
+    col_parts = [[] for _ in cols]
     for i, (name, s) in enumerate(agent_scores.items()):
-        with cols[i % 5]:
-            icon = ICONS.get(name, "🤖")
-            label = name.replace("_", " ").title()
-            color = "#2E7D32" if s >= 80 else "#E65C00" if s >= 60 else "#C62828"
-            bar = "█" * (s // 10) + "░" * (10 - s // 10)
-            st.markdown(f"""<div class="agent-card">
-                <b>{icon} {label}</b><br>
-                <span style="color:{color};font-size:1.4rem;font-weight:900">{s}</span>
-                <span style="color:#888;font-size:0.8rem">/100</span><br>
-                <span style="font-size:0.72rem;color:#aaa;font-family:monospace">{bar}</span>
-            </div>""", unsafe_allow_html=True)
+        icon = ICONS.get(name, "🤖")
+        label = _LABELS.get(name) or name.replace("_", " ").title()
+        color = "#2E7D32" if s >= 80 else "#E65C00" if s >= 60 else "#C62828"
+        bar = _BARS[min(s // 10, 10)]
+        col_parts[i % 5].append(f"""<div class="agent-card">
+            <b>{icon} {label}</b><br>
+            <span style="color:{color};font-size:1.4rem;font-weight:900">{s}</span>
+            <span style="color:#888;font-size:0.8rem">/100</span><br>
+            <span style="font-size:0.72rem;color:#aaa;font-family:monospace">{bar}</span>
+        </div>""")
+    for col, parts in zip(cols, col_parts):
+        if parts:
+            col.markdown("".join(parts), unsafe_allow_html=True)
 
     # ── Action Items ────────────────────────────────────────────────
     st.subheader("✅ Priority Action Items")
     items = results.get("action_items", [])
     if items:
+        item_html = []
         for i, item in enumerate(items, 1):
             if i <= 4:
-                st.markdown(f'<div class="action-item-critical">🔴 <b>{i}.</b> {item}</div>', unsafe_allow_html=True)
+                css, dot = "critical", "🔴"
             elif i <= 9:
-                st.markdown(f'<div class="action-item-important">🟡 <b>{i}.</b> {item}</div>', unsafe_allow_html=True)
+                css, dot = "important", "🟡"
             else:
-                st.markdown(f'<div class="action-item-helpful">🟢 <b>{i}.</b> {item}</div>', unsafe_allow_html=True)
+                css, dot = "helpful", "🟢"
+            item_html.append(f'<div class="action-item-{css}">{dot} <b>{i}.</b> {item}</div>')
+        st.markdown("".join(item_html), unsafe_allow_html=True)
     else:
         st.info("No action items — add an API key for AI-powered analysis.")
 
@@ -399,9 +499,10 @@ def render_results(results: dict):
     with st.expander("🔍 Full Agent Reports (all 10 agents)", expanded=False):
         for name, data in results.get("agent_results", {}).items():
             icon = ICONS.get(name, "🤖")
+            label = _LABELS.get(name) or name.replace("_", " ").title()
             s = data.get("score", 0)
             ai_tag = "🧠 AI" if data.get("ai_powered") else "📐 Rule-Based"
-            with st.expander(f"{icon} {name.replace('_',' ').title()} — {s}/100 ({ai_tag})"):
+            with st.expander(f"{icon} {label} — {s}/100 ({ai_tag})"):
                 st.write("**Findings:**")
                 for f in data.get("findings", []):
                     st.write(f"• {f}")
@@ -411,55 +512,95 @@ def render_results(results: dict):
                 if data.get("optimized_content") and name not in ["interview_coach"]:
                     st.success(f"💡 **AI Enhancement:** {data['optimized_content'][:400]}")
 
-    # ── Downloads ──────────────────────────────────────────────────
+
+@st.fragment
+def _render_downloads(results: dict):
+    # The fragment scopes the export work to its own reruns, so the
+    # rest of the page never pays for reportlab/python-docx rendering.
     st.subheader("💾 Export Results")
     d1, d2, d3 = st.columns(3)
     ts = datetime.now().strftime('%Y%m%d_%H%M')
 
     with d1:
-        from src.core.exporter import export_to_txt
-        txt = export_to_txt(results)
         st.download_button(
             "📄 Full Report (TXT)",
-            data=txt,
+            data=export_to_txt(results),
             file_name=f"ats_god_v2_{ts}.txt",
             mime="text/plain",
             use_container_width=True
         )
 
     with d2:
-        try:
-            from src.core.exporter import export_to_docx
-            docx = export_to_docx(results)
-            if docx:
-                st.download_button(
-                    "📝 Full Report (DOCX)",
-                    data=docx,
-                    file_name=f"ats_god_v2_{ts}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    use_container_width=True
-                )
-            else:
-                st.info("DOCX: `pip install python-docx`")
-        except Exception:
-            st.info("DOCX export unavailable")
+        if importlib.util.find_spec("docx"):
+            st.download_button(
+                "📝 Full Report (DOCX)",
+                data=export_to_docx(results) or b"",
+                file_name=f"ats_god_v2_{ts}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True
+            )
+        else:
+            st.info("DOCX: `pip install python-docx`")
 
     with d3:
-        try:
-            from src.core.exporter import export_to_pdf
-            pdf = export_to_pdf(results)
-            if pdf:
-                st.download_button(
-                    "🔴 Full Report (PDF)",
-                    data=pdf,
-                    file_name=f"ats_god_v2_{ts}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
-            else:
-                st.info("PDF: `pip install reportlab`")
-        except Exception:
-            st.info("PDF export unavailable")
+        if importlib.util.find_spec("reportlab"):
+            st.download_button(
+                "🔴 Full Report (PDF)",
+                data=export_to_pdf(results) or b"",
+                file_name=f"ats_god_v2_{ts}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+        else:
+            st.info("PDF: `pip install reportlab`")
+
+
+def render_results(results: dict):
+    _render_dashboard(results)
+    _render_downloads(results)
+
+
+# ─── Input Resolution ──────────────────────────────────────────────────────────
+
+def _resolve_cv_text(uploaded, method: str) -> str:
+    """Turn the submitted form state into CV text (upload or paste)."""
+    if method == "Upload PDF/DOCX":
+        if not uploaded:
+            return ""
+        size_mb = uploaded.size / (1024 * 1024)  # no copy — UploadedFile knows its size
+        if size_mb > 10:
+            st.error("Max 10MB")
+            return ""
+        with st.spinner("Extracting text..."):
+            cv_text = _extract_cv(uploaded.getvalue(), uploaded.type)
+        if cv_text:
+            wc = len(cv_text.split())
+            st.success(f"✓ {wc:,} words · {size_mb:.1f}MB · {uploaded.name}")
+            if wc < 100:
+                st.warning("Very short CV — scanned image? Try pasting text.")
+            with st.expander("Preview (first 1000 chars)"):
+                st.text(cv_text[:1000] + ("…" if len(cv_text) > 1000 else ""))
+        return cv_text
+    return st.session_state.get("cv_paste", "") or ""
+
+
+def _resolve_jd_text(jd_input_method: str) -> str:
+    """Turn the submitted form state into JD text (paste or URL scrape)."""
+    if "URL" in jd_input_method:
+        url = (st.session_state.get("jd_url") or "").strip()
+        if not url:
+            return ""
+        if not is_valid_url(url):
+            st.warning("Please enter a valid URL starting with https://")
+            return ""
+        with st.spinner("Scraping job posting..."):
+            scraped, platform = cached_scrape(url)
+        if scraped:
+            st.success(f"✓ Extracted from {platform} ({len(scraped.split()):,} words)")
+        else:
+            st.error(f"Could not extract JD. Paste manually instead. ({platform})")
+        return scraped
+    return st.session_state.get("jd_paste", "") or ""
 
 
 # ─── Main ──────────────────────────────────────────────────────────────────────
@@ -483,152 +624,143 @@ def main():
     context = render_sidebar()
 
     # ── Input Section ──────────────────────────────────────────────
-    col_cv, col_jd = st.columns(2)
-
-    with col_cv:
+    # The paste areas live inside st.form so N keystroke/edit reruns
+    # collapse into a single rerun on submit.
+    sel_cv, sel_jd = st.columns(2)
+    with sel_cv:
         st.subheader("📤 Your CV")
         method = st.radio("Input method", ["Upload PDF/DOCX", "Paste text"], horizontal=True, key="cv_method")
-        cv_text = ""
-
-        if method == "Upload PDF/DOCX":
-            uploaded = st.file_uploader("Upload CV", type=["pdf", "docx"], key="cv_upload")
-            if uploaded:
-                size_mb = len(uploaded.getvalue()) / (1024 * 1024)
-                if size_mb > 10:
-                    st.error("Max 10MB")
-                else:
-                    buf = BytesIO(uploaded.read())
-                    with st.spinner("Extracting text..."):
-                        cv_text = read_pdf(buf) if "pdf" in uploaded.type else read_docx(buf)
-                    if cv_text:
-                        wc = len(cv_text.split())
-                        st.success(f"✓ {wc:,} words · {size_mb:.1f}MB · {uploaded.name}")
-                        if wc < 100:
-                            st.warning("Very short CV — scanned image? Try pasting text.")
-                        with st.expander("Preview (first 1000 chars)"):
-                            st.text(cv_text[:1000] + ("…" if len(cv_text) > 1000 else ""))
-        else:
-            cv_text = st.text_area(
-                "Paste CV text",
-                height=400,
-                placeholder="Paste your complete CV here…",
-                key="cv_paste"
-            )
-
-    with col_jd:
+    with sel_jd:
         st.subheader("📋 Job Description")
-
         jd_input_method = st.radio(
             "JD input method",
             ["Paste text", "🔗 Paste URL (auto-extract)"],
             horizontal=True, key="jd_method"
         )
-        jd_text = ""
-
-        if "URL" in jd_input_method:
-            url = st.text_input(
-                "Job posting URL",
-                placeholder="https://www.linkedin.com/jobs/... or https://pnet.co.za/...",
-                key="jd_url"
-            )
-            if url:
-                from src.core.job_scraper import scrape_job_url, is_valid_url
-                if is_valid_url(url):
-                    if st.button("🔗 Extract Job Description", key="scrape_btn"):
-                        with st.spinner("Scraping job posting..."):
-                            scraped, platform = scrape_job_url(url)
-                        if scraped:
-                            st.session_state["scraped_jd"] = scraped
-                            st.session_state["scraped_platform"] = platform
-                            st.success(f"✓ Extracted from {platform} ({len(scraped.split()):,} words)")
-                        else:
-                            st.error(f"Could not extract JD. Paste manually instead. ({platform})")
-                else:
-                    st.warning("Please enter a valid URL starting with https://")
-
-                if st.session_state.get("scraped_jd"):
-                    jd_text = st.text_area(
-                        "Extracted JD (edit if needed)",
-                        value=st.session_state["scraped_jd"],
-                        height=380, key="jd_scraped_edit"
-                    )
-        else:
-            jd_text = st.text_area(
-                "Paste job description",
-                height=420,
-                placeholder="Paste the complete job description here…",
-                key="jd_paste"
-            )
-
-    st.divider()
 
-    # ── Validation ─────────────────────────────────────────────────
-    cv_ok = bool(cv_text and cv_text.strip())
-    jd_ok = bool(jd_text and jd_text.strip())
+    agent_count = 8 + context.get("run_interview", True) + context.get("run_salary", True)
+    btn_label = f"🚀 OPTIMIZE — LAUNCH {agent_count} AI AGENTS"
 
-    if not cv_ok:
-        st.warning("👆 Add your CV — upload a file or paste text above")
-    if not jd_ok:
-        st.warning("👆 Add the job description — paste or use URL extraction")
+    with st.form("karoo_inputs", clear_on_submit=False):
+        col_cv, col_jd = st.columns(2)
+        uploaded = None
+        with col_cv:
+            if method == "Upload PDF/DOCX":
+                uploaded = st.file_uploader("Upload CV", type=["pdf", "docx"], key="cv_upload")
+            else:
+                st.text_area(
+                    "Paste CV text",
+                    height=400,
+                    placeholder="Paste your complete CV here…",
+                    key="cv_paste"
+                )
+        with col_jd:
+            if "URL" in jd_input_method:
+                st.text_input(
+                    "Job posting URL",
+                    placeholder="https://www.linkedin.com/jobs/... or https://pnet.co.za/...",
+                    key="jd_url"
+                )
+            else:
+                st.text_area(
+                    "Paste job description",
+                    height=420,
+                    placeholder="Paste the complete job description here…",
+                    key="jd_paste"
+                )
+        submitted = st.form_submit_button(btn_label, type="primary", use_container_width=True)
 
-    if cv_ok and jd_ok:
-        wc_cv = len(cv_text.split())
-        wc_jd = len(jd_text.split())
+    st.divider()
 
-        m1, m2, m3, m4 = st.columns(4)
-        m1.metric("CV Words", f"{wc_cv:,}",
-                  "✓ Good length" if 250 <= wc_cv <= 1200 else ("Too short" if wc_cv < 250 else "May be too long"))
-        m2.metric("JD Words", f"{wc_jd:,}",
-                  "✓ Detailed" if wc_jd >= 100 else "More detail = better analysis")
-        has_key, provider = detect_available_llm()
-        m3.metric("AI Mode", provider or "Rule-Based",
-                  "Full AI — 11 agents" if has_key else "Add GROQ_API_KEY for AI")
-        ai_features = sum([
-            context.get("generate_cover_letter", True),
-            context.get("rewrite_cv", True),
-            context.get("run_interview", True),
-            context.get("run_salary", True),
-        ])
-        m4.metric("Features Active", f"{ai_features}/4",
-                  "All features on" if ai_features == 4 else f"{4-ai_features} features off")
-
-        # Launch button
-        agent_count = 8 + context.get("run_interview", True) + context.get("run_salary", True)
-        btn_label = f"🚀 OPTIMIZE — LAUNCH {agent_count} AI AGENTS"
-        if st.button(btn_label, type="primary", use_container_width=True):
+    if submitted:
+        cv_text = _resolve_cv_text(uploaded, method)
+        jd_text = _resolve_jd_text(jd_input_method)
+
+        # ── Validation ─────────────────────────────────────────────
+        cv_ok = bool(cv_text and cv_text.strip())
+        jd_ok = bool(jd_text and jd_text.strip())
+
+        if not cv_ok:
+            st.warning("👆 Add your CV — upload a file or paste text above")
+        if not jd_ok:
+            st.warning("👆 Add the job description — paste or use URL extraction")
+
+        if cv_ok and jd_ok:
+            wc_cv = len(cv_text.split())
+            wc_jd = len(jd_text.split())
+
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("CV Words", f"{wc_cv:,}",
+                      "✓ Good length" if 250 <= wc_cv <= 1200 else ("Too short" if wc_cv < 250 else "May be too long"))
+            m2.metric("JD Words", f"{wc_jd:,}",
+                      "✓ Detailed" if wc_jd >= 100 else "More detail = better analysis")
+            has_key, provider = detect_available_llm()
+            m3.metric("AI Mode", provider or "Rule-Based",
+                      "Full AI — 11 agents" if has_key else "Add GROQ_API_KEY for AI")
+            ai_features = sum([
+                context.get("generate_cover_letter", True),
+                context.get("rewrite_cv", True),
+                context.get("run_interview", True),
+                context.get("run_salary", True),
+            ])
+            m4.metric("Features Active", f"{ai_features}/4",
+                      "All features on" if ai_features == 4 else f"{4-ai_features} features off")
+
+            # Hash-based change detection: identical CV + JD + settings
+            # means identical results, so a re-click skips the whole
+            # pipeline instead of re-spending the LLM calls.
+            input_key = hashlib.sha256(
+                f"{cv_text}\x00{jd_text}\x00{sorted(context.items())!r}".encode()
+            ).hexdigest()
+            results_cache = st.session_state.setdefault("results_cache", {})
+            if input_key in results_cache:
+                st.info("📦 Inputs unchanged — showing cached results.")
+                results = results_cache[input_key]
+                st.divider()
+                render_results(results)
+                st.session_state["last_results"] = results
+                return
 
             prog = st.progress(0.0)
             status = st.empty()
-
-            def cb(pct: float, msg: str):
-                prog.progress(min(pct, 1.0))
-                status.text(msg)
+            last_update = [0.0]
+
+            def cb(pct: float, msg: str, payload=None):
+                # Throttle to ~10 Hz — frequent agent updates otherwise
+                # flood the delta protocol with tiny redraws. The terminal
+                # 100% update always goes through. The per-agent payload
+                # is unused here: the script thread is blocked on
+                # fut.result(), so charts can't re-render mid-run.
+                now = time.monotonic()
+                if now - last_update[0] > 0.1 or pct >= 1.0:
+                    prog.progress(min(pct, 1.0))
+                    status.text(msg)
+                    last_update[0] = now
 
             try:
-                sys.path.insert(0, ".")
-                from src.core.orchestrator import ATSGodOrchestrator
+                orch = get_orchestrator()
 
-                # Filter agents based on feature flags
-                orch = ATSGodOrchestrator()
+                # Feature flags select agents declaratively — the cached
+                # orchestrator's agent table is never mutated.
+                enabled_agents = set(orch.agents)
                 if not context.get("run_interview", True):
-                    orch.agents.pop("interview_coach", None)
+                    enabled_agents.discard("interview_coach")
                 if not context.get("run_salary", True):
-                    orch.agents.pop("salary_intelligence", None)
-
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                    enabled_agents.discard("salary_intelligence")
 
-                results = loop.run_until_complete(
+                fut = asyncio.run_coroutine_threadsafe(
                     orch.optimize(
                         cv_text=cv_text,
                         job_description=jd_text,
                         context=context,
                         generate_cover_letter=context.get("generate_cover_letter", True),
                         rewrite_cv=context.get("rewrite_cv", True),
+                        enabled_agents=enabled_agents,
                         progress_callback=cb,
-                    )
+                    ),
+                    get_event_loop(),
                 )
-                loop.close()
+                results = fut.result()
 
                 prog.progress(1.0)
                 status.text("✅ All agents complete!")
@@ -642,8 +774,11 @@ def main():
                 st.divider()
                 render_results(results)
 
-                # Store in session for re-display
+                # Store in session for re-display and change detection
                 st.session_state["last_results"] = results
+                if len(results_cache) >= 8:
+                    results_cache.pop(next(iter(results_cache)))
+                results_cache[input_key] = results
 
             except Exception as e:
                 st.error(f"❌ Optimization failed: {e}")
@@ -653,7 +788,7 @@ def main():
                 st.info("Ensure all files are in `src/` and run: `export PYTHONPATH=.`")
 
     # ── Previous Results ───────────────────────────────────────────
-    elif st.session_state.get("last_results") and not (cv_ok and jd_ok):
+    elif st.session_state.get("last_results"):
         st.info("📊 Showing previous analysis results:")
         render_results(st.session_state["last_results"])
 
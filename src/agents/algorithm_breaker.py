@@ -2,8 +2,10 @@
 Agent 1: The Algorithm Breaker v2
 Enhanced: deeper ATS parser simulation, format scoring, keyword density analysis.
 """
+import functools
 import re
-import time
+from collections import Counter
+from itertools import islice
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -29,23 +31,76 @@ FIXES:
 - [fix 5]
 OPTIMIZED_SUMMARY: [Rewrite the professional summary for maximum ATS compatibility, 2-3 sentences, keyword-rich]"""
 
+# Compiled once at import — these run dozens of times per CV, and going
+# through re's pattern cache costs a dict lookup per call.
+_RE_TABLE = re.compile(r'\|.{3,}\|')
+_RE_EMAIL = re.compile(r'[\w.]+@[\w.]+')
+_RE_IMG = re.compile(r'header text|footer text|\[image\]|\[photo\]', re.IGNORECASE)
+_RE_CVLABEL = re.compile(r'curriculum vitae|c\.v\.|cv:', re.IGNORECASE)
+_RE_WORD = re.compile(r'\b[a-zA-Z]{3,}\b')
+_RE_CONTACT = re.compile(r'@|phone|\+\d')
+_RE_SUMMARY = re.compile(r'summary|objective|profile|professional')
+_RE_EXPERIENCE = re.compile(r'experience|employment|work history')
+_RE_EDUCATION = re.compile(r'education|degree|qualification|university|college')
+_RE_SKILLS = re.compile(r'skills|competencies|technologies')
+_RE_INT = re.compile(r'\d+')
+
+_BULLET_CHARS = frozenset('●■▪►✓✗')
+
+_FLAG_FIXES = {
+    'markdown_tables': 'Remove all tables — replace with plain bullet-point lists.',
+    'excessive_tabs': 'Replace tab indentation with spaces throughout.',
+    'unicode_characters': 'Replace all special/unicode characters with ASCII equivalents.',
+    'special_bullet_chars': 'Replace fancy bullet symbols (●►✓) with standard hyphens or asterisks.',
+    'too_short': 'CV under 200 words — expand experience descriptions with metrics.',
+    'too_long': 'CV exceeds 1500 words — trim to 2 pages max for ATS.',
+    'no_email_detected': 'Ensure email address is in plain text format, not an image.',
+    'redundant_cv_label': 'Remove "Curriculum Vitae" header — wastes prime ATS real estate.',
+}
+
+_STOP_WORDS = frozenset({
+    'and','the','for','with','that','are','will','you','have','this',
+    'from','they','been','has','was','our','your','their','but','not',
+    'all','can','its','who','may','also','any','use','one','two','new',
+})
+
+
+@functools.lru_cache(maxsize=64)
+def _jd_tokens(jd: str) -> tuple:
+    """Unique JD tokens in first-seen order — batch runs test many CVs
+    against the same JD, so this is the piece worth amortizing.
+    dict.fromkeys dedups in one pass without a set→list copy and keeps
+    JD order, so reported matched/missing keywords follow the posting."""
+    return tuple(dict.fromkeys(
+        w for w in _RE_WORD.findall(BaseAgent._lower(jd)) if w not in _STOP_WORDS))
+
 
 class AlgorithmBreaker(BaseAgent):
     def __init__(self, llm=None):
         super().__init__("The Algorithm Breaker", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
-        black_flags = self._detect_black_flags(cv_text)
-        keyword_data = self._analyze_keywords(cv_text, job_description)
-        format_score = self._format_score(cv_text)
-        section_scores = self._score_sections(cv_text)
-
-        user_prompt = f"""CV TEXT:
-{cv_text[:4000]}
+        t0 = self._now()
+        scan = self._scan(cv_text)
+        black_flags = self._detect_black_flags(scan)
+        keyword_data = self._analyze_keywords(cv_text, job_description, scan)
+        format_score = self._format_score(scan)
+        section_scores = self._score_sections(scan)
+
+        if self.llm is None:
+            # Skip building the multi-KB prompt — the fallback ignores it.
+            llm_response = self._rule_based_fallback("")
+        else:
+            # Truncated copies are taken exactly once per call — keep any new
+            # prompt text referencing these instead of re-slicing.
+            cv_snip = cv_text[:4000]
+            jd_snip = job_description[:2500]
+
+            user_prompt = f"""CV TEXT:
+{cv_snip}
 
 JOB DESCRIPTION:
-{job_description[:2500]}
+{jd_snip}
 
 TARGET MARKET: {context.get('target_market', 'Both')}
 EXPERIENCE LEVEL: {context.get('experience_level', 'Mid')}
@@ -60,7 +115,7 @@ Pre-analysis results:
 
 Perform exhaustive ATS analysis. Be specific and actionable."""
 
-        llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+            llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
         score = self._extract_score(llm_response, keyword_data)
 
         return AgentOutput(
@@ -80,38 +135,65 @@ Perform exhaustive ATS analysis. Be specific and actionable."""
             optimized_content=self._extract_section(llm_response, 'OPTIMIZED_SUMMARY'),
             raw_analysis=llm_response,
             weight=1.8,
-            execution_ms=int((time.time() - t0) * 1000),
+            execution_ms=self._ms_since(t0),
             ai_powered=self.llm is not None,
         )
 
-    def _detect_black_flags(self, text: str) -> List[str]:
+    def _scan(self, text: str) -> Dict:
+        """One pass over the CV computing every format/flag predicate.
+
+        Black-flag detection, format scoring and section scoring used to
+        re-run the same regexes over the full text; this fuses them so each
+        pattern traverses the CV exactly once.
+        """
+        lower = self._lower(text)
+        # Counting is capped just past the flag thresholds (>15 / >8) so a
+        # CV full of unicode stops scanning early, and generator counting
+        # avoids materializing a list of every matched character.
+        nonascii = sum(1 for _ in islice((c for c in text if ord(c) > 127), 16))
+        bullets = sum(1 for _ in islice((c for c in text if c in _BULLET_CHARS), 9))
+        # Anchor-character guards: str.__contains__ is a tight C scan that
+        # rejects the common no-table/no-placeholder case far cheaper than
+        # starting the regex engine.
+        return {
+            'has_table': '|' in text and bool(_RE_TABLE.search(text)),
+            'tab_count': text.count('\t'),
+            'nonascii': nonascii,
+            'has_img': ('[' in lower or 'text' in lower) and bool(_RE_IMG.search(text)),
+            'bullets': bullets,
+            'has_cv_label': ('vitae' in lower or 'cv' in lower or '.v.' in lower)
+                            and bool(_RE_CVLABEL.search(text)),
+            'word_count': len(text.split()),
+            'has_email': '@' in text and bool(_RE_EMAIL.search(text)),
+            'lower': lower,
+        }
+
+    def _detect_black_flags(self, scan: Dict) -> List[str]:
         flags = []
-        if re.search(r'\|.{3,}\|', text): flags.append("markdown_tables")
-        if text.count('\t') > 5: flags.append("excessive_tabs")
-        if len(re.findall(r'[^\x00-\x7F]', text)) > 15: flags.append("unicode_characters")
-        if re.search(r'(?i)(header text|footer text|\[image\]|\[photo\])', text): flags.append("image_placeholders")
-        if len(re.findall(r'[●■▪►✓✗]', text)) > 8: flags.append("special_bullet_chars")
-        if re.search(r'(?i)curriculum vitae|c\.v\.|cv:', text): flags.append("redundant_cv_label")
-        word_count = len(text.split())
-        if word_count < 200: flags.append("too_short")
-        elif word_count > 1500: flags.append("too_long")
-        if not re.search(r'[\w.]+@[\w.]+', text): flags.append("no_email_detected")
+        if scan['has_table']: flags.append("markdown_tables")
+        if scan['tab_count'] > 5: flags.append("excessive_tabs")
+        if scan['nonascii'] > 15: flags.append("unicode_characters")
+        if scan['has_img']: flags.append("image_placeholders")
+        if scan['bullets'] > 8: flags.append("special_bullet_chars")
+        if scan['has_cv_label']: flags.append("redundant_cv_label")
+        if scan['word_count'] < 200: flags.append("too_short")
+        elif scan['word_count'] > 1500: flags.append("too_long")
+        if not scan['has_email']: flags.append("no_email_detected")
         return flags
 
-    def _analyze_keywords(self, cv: str, jd: str) -> Dict:
-        stop = {'and','the','for','with','that','are','will','you','have','this',
-                'from','they','been','has','was','our','your','their','but','not',
-                'all','can','its','who','may','also','any','use','one','two','new'}
-        jd_words = [w.lower() for w in re.findall(r'\b[a-zA-Z]{3,}\b', jd)
-                    if w.lower() not in stop]
-        unique_jd = list(set(jd_words))
-        cv_lower = cv.lower()
-        matched = [w for w in unique_jd if w in cv_lower]
-        missing = [w for w in unique_jd if w not in cv_lower]
+    def _analyze_keywords(self, cv: str, jd: str, scan: Dict) -> Dict:
+        # Tokenize each text once and match on whole words via set/Counter
+        # lookups instead of substring-scanning the CV per JD token. This
+        # also stops 'man' matching inside 'management'. The lowered text
+        # and word count come from the shared _scan pass.
+        cv_counter = Counter(_RE_WORD.findall(scan['lower']))
+        unique_jd = _jd_tokens(jd)
+        matched = [w for w in unique_jd if w in cv_counter]
+        missing = [w for w in unique_jd if w not in cv_counter]
         pct = (len(matched) / max(len(unique_jd), 1)) * 100
 
-        cv_total_words = max(len(cv.split()), 1)
-        keyword_count = sum(cv_lower.count(w) for w in matched)
+        cv_total_words = max(scan['word_count'], 1)
+        keyword_count = sum(cv_counter[w] for w in matched)
         density = (keyword_count / cv_total_words) * 100
 
         return {
@@ -121,59 +203,41 @@ Perform exhaustive ATS analysis. Be specific and actionable."""
             'missing': missing[:20],
         }
 
-    def _format_score(self, text: str) -> int:
+    def _format_score(self, scan: Dict) -> int:
         score = 100
-        if re.search(r'\|.{3,}\|', text): score -= 20
-        if text.count('\t') > 5: score -= 15
-        if len(re.findall(r'[^\x00-\x7F]', text)) > 15: score -= 10
-        wc = len(text.split())
-        if wc < 200: score -= 20
-        elif wc > 1500: score -= 10
-        if not re.search(r'[\w.]+@[\w.]+', text): score -= 15
+        if scan['has_table']: score -= 20
+        if scan['tab_count'] > 5: score -= 15
+        if scan['nonascii'] > 15: score -= 10
+        if scan['word_count'] < 200: score -= 20
+        elif scan['word_count'] > 1500: score -= 10
+        if not scan['has_email']: score -= 15
         return max(0, min(100, score))
 
-    def _score_sections(self, text: str) -> str:
-        t = text.lower()
-        def s(pattern): return 100 if re.search(pattern, t) else 0
-        contact = 100 if re.search(r'@|phone|\+\d', t) else 0
-        summary = 100 if re.search(r'summary|objective|profile|professional', t) else 0
-        exp = 100 if re.search(r'experience|employment|work history', t) else 0
-        edu = 100 if re.search(r'education|degree|qualification|university|college', t) else 0
-        skills = 100 if re.search(r'skills|competencies|technologies', t) else 0
+    def _score_sections(self, scan: Dict) -> str:
+        t = scan['lower']
+        contact = 100 if _RE_CONTACT.search(t) else 0
+        summary = 100 if _RE_SUMMARY.search(t) else 0
+        exp = 100 if _RE_EXPERIENCE.search(t) else 0
+        edu = 100 if _RE_EDUCATION.search(t) else 0
+        skills = 100 if _RE_SKILLS.search(t) else 0
         return f"Contact:{contact} Summary:{summary} Exp:{exp} Edu:{edu} Skills:{skills}"
 
     def _extract_score(self, response: str, kw: Dict) -> int:
-        m = re.search(r'ATS_SCORE:\s*(\d+)', response)
-        if m: return min(100, max(0, int(m.group(1))))
+        m = _RE_INT.search(self._parse_structured(response).get('ATS_SCORE', ''))
+        if m: return min(100, max(0, int(m.group())))
         return min(100, int(kw['match_pct'] * 0.7 + 15))
 
     def _extract_parser_rates(self, response: str) -> str:
-        m = re.search(r'PARSER_RATES:\s*(.+?)(?:\n|$)', response)
-        return m.group(1).strip() if m else "N/A"
+        rates = self._parse_structured(response).get('PARSER_RATES', '')
+        return rates.splitlines()[0].strip() if rates else "N/A"
 
     def _extract_fixes(self, response: str, flags: List, kw: Dict) -> List[str]:
-        fixes = []
-        m = re.search(r'FIXES:(.*?)(?:OPTIMIZED_SUMMARY:|$)', response, re.DOTALL)
-        if m:
-            fixes = [l.strip().lstrip('- ') for l in m.group(1).strip().split('\n')
-                     if l.strip() and l.strip() != '-'][:6]
-        flag_map = {
-            'markdown_tables': 'Remove all tables — replace with plain bullet-point lists.',
-            'excessive_tabs': 'Replace tab indentation with spaces throughout.',
-            'unicode_characters': 'Replace all special/unicode characters with ASCII equivalents.',
-            'special_bullet_chars': 'Replace fancy bullet symbols (●►✓) with standard hyphens or asterisks.',
-            'too_short': 'CV under 200 words — expand experience descriptions with metrics.',
-            'too_long': 'CV exceeds 1500 words — trim to 2 pages max for ATS.',
-            'no_email_detected': 'Ensure email address is in plain text format, not an image.',
-            'redundant_cv_label': 'Remove "Curriculum Vitae" header — wastes prime ATS real estate.',
-        }
-        for flag in flags:
-            if flag in flag_map:
-                fixes.insert(0, flag_map[flag])
+        fixes = self._extract_bullets(response, limit=6)
+        prepend = [_FLAG_FIXES[f] for f in flags if f in _FLAG_FIXES]
+        fixes = prepend + fixes
         if kw['missing']:
             fixes.append(f"Integrate missing keywords naturally: {', '.join(kw['missing'][:8])}")
         return fixes[:10]
 
     def _extract_section(self, response: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
-        return m.group(1).strip() if m else ""
+        return self._parse_structured(response).get(key, "")
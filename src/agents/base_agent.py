@@ -2,47 +2,192 @@
 Karoo v2.0 — Base Agent
 Enhanced with retry logic, structured output validation, and telemetry.
 """
+import asyncio
+import functools
+import hashlib
 import os
 import logging
+import re
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+_SECTION_HEADER = re.compile(r'^([A-Z_]+):', re.MULTILINE)
+_WS_RUN = re.compile(r'\s+')
+_FIRST_INT = re.compile(r'\d+')
+_YEARS_EXP = re.compile(r'(\d+)\+?\s*years?', re.IGNORECASE)
+_CANDIDATE_DELIM = re.compile(r'^---CANDIDATE_(\d+)---\s*$', re.MULTILINE)
+_TOKEN = re.compile(r'\b[a-z]{4,}\b')
 
-class AgentOutput(BaseModel):
+# CV heading lines ("WORK EXPERIENCE", "Skills & Competencies", …) used to
+# slice the document so agents can prompt with only the sections they
+# read instead of the first 4KB four times over.
+_CV_HEADING = re.compile(
+    r'^[ \t]*(?:professional\s+|work\s+|core\s+|key\s+)?'
+    r'(summary|objective|profile|about|experience|employment|career|'
+    r'education|qualifications?|skills|competencies|technologies|'
+    r'certifications?)\b[^\n]{0,25}$',
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADING2KEY = {
+    'summary': 'summary', 'objective': 'summary', 'profile': 'summary', 'about': 'summary',
+    'experience': 'experience', 'employment': 'experience', 'career': 'experience',
+    'education': 'education', 'qualification': 'education', 'qualifications': 'education',
+    'skills': 'skills', 'competencies': 'skills', 'technologies': 'skills',
+    'certification': 'certifications', 'certifications': 'certifications',
+}
+
+
+@dataclass(slots=True)
+class AgentOutput:
+    """Internal DTO produced by trusted agent code — a slotted dataclass
+    skips pydantic's per-construction validation and per-instance dict."""
     agent_name: str = ""
     score: int = 0
-    findings: List[str] = []
-    recommendations: List[str] = []
+    findings: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
     optimized_content: str = ""
     raw_analysis: str = ""
     weight: float = 1.0
     execution_ms: int = 0
     ai_powered: bool = False
 
+    def dict(self) -> Dict[str, Any]:
+        # dataclasses.asdict deep-copies every field value through
+        # copy.deepcopy; consumers only read, so a flat dict with
+        # shallow list copies is enough.
+        return {
+            'agent_name': self.agent_name, 'score': self.score,
+            'findings': list(self.findings),
+            'recommendations': list(self.recommendations),
+            'optimized_content': self.optimized_content,
+            'raw_analysis': self.raw_analysis, 'weight': self.weight,
+            'execution_ms': self.execution_ms, 'ai_powered': self.ai_powered,
+        }
+
 
 class BaseAgent(ABC):
     MAX_RETRIES = 2
 
+    # Which CV sections this agent's prompt actually reads; empty means
+    # the full text. 'header' is the contact block before the first
+    # recognised heading.
+    RELEVANT_SECTIONS: tuple = ()
+
+    # Exact-match completion cache shared by all agents. Re-clicking
+    # "Optimize" with unchanged CV+JD rebuilds identical prompts, so a
+    # prompt-hash lookup skips the full token cost of those calls.
+    _COMPLETION_CACHE: "OrderedDict[str, str]" = OrderedDict()
+    _COMPLETION_CACHE_MAX = 256
+    _COMPLETION_CACHE_LOCK = threading.Lock()  # gather() runs calls in worker threads
+    _CACHE_ENABLED = os.getenv("KAROO_LLM_CACHE", "1") != "0"
+    _cache_hits = 0
+    _cache_misses = 0
+
     def __init__(self, name: str, llm=None):
         self.name = name
         self.llm = llm
 
+    @staticmethod
+    def _now() -> int:
+        """Monotonic ns timestamp — pair with _ms_since for telemetry.
+
+        perf_counter_ns avoids time.time()'s wall-clock slew and float
+        round-trip; execution_ms is consumed inside return expressions,
+        which is why this is a helper pair rather than a context manager.
+        """
+        return time.perf_counter_ns()
+
+    @staticmethod
+    def _ms_since(t0: int) -> int:
+        return (time.perf_counter_ns() - t0) // 1_000_000
+
+    def _completion_cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        # The prompt embeds the raw CV/JD paste, so the same documents
+        # re-pasted with different line wrapping or trailing spaces would
+        # miss an exact hash. Collapsing whitespace runs before hashing
+        # makes those near-identical inputs share a cache entry.
+        model = getattr(self.llm, "model_name", "") or getattr(self.llm, "model", "")
+        return hashlib.sha256(
+            f"{model}\x00{system_prompt}\x00{_WS_RUN.sub(' ', user_prompt)}".encode()
+        ).hexdigest()
+
+    @classmethod
+    def cache_size(cls) -> int:
+        return len(cls._COMPLETION_CACHE)
+
+    @classmethod
+    def hit_rate(cls) -> float:
+        total = cls._cache_hits + cls._cache_misses
+        return cls._cache_hits / total if total else 0.0
+
+    def _system_message(self, system_prompt: str):
+        """Build each distinct SystemMessage once per agent instance.
+
+        Agents use constant system prompts (the rewriter has three), so
+        re-validating a langchain message object per call is waste. The
+        import stays lazy: rule-based mode must work without the LLM
+        stack installed.
+        """
+        msgs = getattr(self, "_system_msgs", None)
+        if msgs is None:
+            msgs = self._system_msgs = {}
+        msg = msgs.get(system_prompt)
+        if msg is None:
+            from langchain_core.messages import SystemMessage
+            if type(self.llm).__name__ == "ChatAnthropic":
+                # Anthropic prompt caching: the system prompts are large
+                # static strings reused on every call, so mark them as a
+                # cache breakpoint. Other providers reject the field.
+                content = [{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            else:
+                content = system_prompt
+            msg = msgs[system_prompt] = SystemMessage(content=content)
+        return msg
+
     def _get_llm_response(self, system_prompt: str, user_prompt: str) -> str:
+        # FusedAnalysisAgent pre-fetches all sections in one combined call
+        # and seeds each sub-agent with its slice; honour that before
+        # touching the network or cache.
+        seeded = getattr(self, "_seeded_response", None)
+        if seeded is not None:
+            return seeded
         if not self.llm:
             return self._rule_based_fallback(user_prompt)
 
+        key = self._completion_cache_key(system_prompt, user_prompt)
+        if self._CACHE_ENABLED:
+            with self._COMPLETION_CACHE_LOCK:
+                cached = self._COMPLETION_CACHE.get(key)
+                if cached is not None:
+                    self._COMPLETION_CACHE.move_to_end(key)
+                    BaseAgent._cache_hits += 1
+                    return cached
+                BaseAgent._cache_misses += 1
+
+        from langchain_core.messages import HumanMessage
+        messages = [
+            self._system_message(system_prompt),
+            HumanMessage(content=user_prompt)
+        ]
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                from langchain_core.messages import SystemMessage, HumanMessage
-                messages = [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=user_prompt)
-                ]
                 response = self.llm.invoke(messages)
+                if self._CACHE_ENABLED:
+                    with self._COMPLETION_CACHE_LOCK:
+                        self._COMPLETION_CACHE[key] = response.content
+                        if len(self._COMPLETION_CACHE) > self._COMPLETION_CACHE_MAX:
+                            self._COMPLETION_CACHE.popitem(last=False)
                 return response.content
             except Exception as e:
                 if attempt < self.MAX_RETRIES:
@@ -53,6 +198,173 @@ class BaseAgent(ABC):
                     logger.error(f"[{self.name}] All LLM retries exhausted: {e}")
                     return self._rule_based_fallback(user_prompt)
 
+    def _parse_structured(self, response: str) -> Dict[str, str]:
+        """Split a KEY:-formatted LLM response into {KEY: body} in one pass.
+
+        Agents prompt for `ATS_SCORE: …` / `FIXES: …` style sections and
+        then ran a fresh regex over the full response per field. Slicing
+        by header spans parses everything in a single linear scan; the
+        result is memoized per response object so repeated extracts are
+        dict lookups.
+        """
+        cached = getattr(self, "_last_parsed", None)
+        if cached is not None and cached[0] is response:
+            return cached[1]
+        headers = list(_SECTION_HEADER.finditer(response))
+        sections: Dict[str, str] = {}
+        for i, h in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(response)
+            sections.setdefault(h.group(1), response[h.end():end].strip())
+        self._last_parsed = (response, sections)
+        return sections
+
+    # Field readers shared by the structured agents — all lookups against
+    # the memoized _parse_structured dict, so each costs O(1) after the
+    # first. Agents with a non-standard response grammar (InterviewCoach)
+    # override these.
+    def _extract_int(self, text: str, key: str, default: int) -> int:
+        m = _FIRST_INT.search(self._parse_structured(text).get(key, ''))
+        return int(m.group()) if m else default
+
+    def _extract_line(self, text: str, key: str, limit: int = 100) -> str:
+        v = self._parse_structured(text).get(key, '')
+        return v.splitlines()[0].strip()[:limit] if v else "N/A"
+
+    def _extract_section(self, text: str, key: str) -> str:
+        return self._parse_structured(text).get(key, '')
+
+    def _extract_bullets(self, text: str, key: str = 'FIXES', limit: int = 5) -> List[str]:
+        """Cleaned bullet lines of a list-style block; [] when absent.
+
+        Agents layer their own prepends/fallbacks on top of this.
+        """
+        block = self._parse_structured(text).get(key, '')
+        return [l.strip().lstrip('- ') for l in block.split('\n')
+                if l.strip() and l.strip() != '-'][:limit]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _lower(text: str) -> str:
+        """Lowered copy of a document, cached by value.
+
+        Ten agents lowering the same 4-8KB CV each allocated their own
+        copy; with the cache the pipeline pays for one.
+        """
+        return text.lower()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _token_set(lowered: str) -> frozenset:
+        """Word tokens of a lowered document, cached by value.
+
+        The orchestrator hands the same CV and JD to every agent, so the
+        agents' keyword-overlap checks share one tokenization pass per
+        distinct document instead of re-scanning it each.
+        """
+        return frozenset(_TOKEN.findall(lowered))
+
+    def _check_seniority(self, cv: str, context: Dict) -> str:
+        level = context.get('experience_level', 'Mid')
+        m = _YEARS_EXP.search(cv)
+        if m:
+            years = int(m.group(1))
+            expected = {'entry': 2, 'mid': 5, 'senior': 10, 'executive': 18}
+            exp = expected.get(level.split()[0].lower(), 5)
+            if years < exp - 2:
+                return f"Under-experienced for {level} role ({years} years vs {exp} expected)"
+            if years > exp + 5:
+                return "May be overqualified — address potential concern proactively"
+        return "Seniority appears well-matched"
+
+    def _cv_sections(self, cv_text: str) -> Dict[str, str]:
+        """Split a CV into {header, summary, experience, …} by heading lines.
+
+        Memoized per text object like _parse_structured — the same CV
+        string flows through every helper in one analyze call.
+        """
+        cached = getattr(self, "_last_cv_split", None)
+        if cached is not None and cached[0] is cv_text:
+            return cached[1]
+        headings = list(_CV_HEADING.finditer(cv_text))
+        sections: Dict[str, str] = {}
+        if headings:
+            header = cv_text[:headings[0].start()].strip()
+            if header:
+                sections['header'] = header
+            for i, h in enumerate(headings):
+                end = headings[i + 1].start() if i + 1 < len(headings) else len(cv_text)
+                key = _HEADING2KEY[h.group(1).lower()]
+                body = cv_text[h.start():end].strip()
+                if key in sections:
+                    sections[key] += '\n' + body
+                else:
+                    sections[key] = body
+        self._last_cv_split = (cv_text, sections)
+        return sections
+
+    def _cv_slice(self, cv_text: str, limit: int = 4000) -> str:
+        """The CV text this agent should prompt with.
+
+        Joins the agent's RELEVANT_SECTIONS when the CV has recognisable
+        headings; falls back to the plain [:limit] prefix otherwise, so
+        unstructured CVs lose nothing.
+        """
+        if not self.RELEVANT_SECTIONS:
+            return cv_text[:limit]
+        sections = self._cv_sections(cv_text)
+        parts = [sections[k] for k in self.RELEVANT_SECTIONS if k in sections]
+        if not parts:
+            return cv_text[:limit]
+        return '\n\n'.join(parts)[:limit]
+
+    async def _get_llm_response_async(self, system_prompt: str, user_prompt: str) -> str:
+        """Awaitable wrapper so agents can fan out multiple LLM calls.
+
+        The underlying langchain invoke is blocking; running it in a worker
+        thread lets asyncio.gather overlap the network waits.
+        """
+        return await asyncio.to_thread(self._get_llm_response, system_prompt, user_prompt)
+
+    async def analyze_batch(self, cvs: List[str], job_description: str,
+                            context: Dict[str, Any]) -> List[AgentOutput]:
+        """Score a shortlist of candidates against one JD in one LLM call.
+
+        The combined prompt asks for a full response per candidate behind
+        ---CANDIDATE_<n>--- delimiters; each slice is seeded into the
+        normal analyze path, so extractors and rule-based pre-filters run
+        per candidate exactly as in the single-CV flow. A candidate whose
+        delimiter the model dropped falls back to its own call.
+        """
+        slices: Dict[int, str] = {}
+        if self.llm is not None and len(cvs) > 1:
+            # Agents keep SYSTEM_PROMPT as a module constant next to their
+            # response format, so look it up there for the combined call.
+            system_prompt = getattr(
+                sys.modules[type(self).__module__], 'SYSTEM_PROMPT', '')
+            user_prompt = (
+                "Analyse EACH candidate below independently against the job "
+                "description. For every candidate, emit its delimiter line "
+                "exactly as given, followed by a complete response in your "
+                "usual format.\n\n"
+                f"JOB DESCRIPTION:\n{job_description[:2500]}\n\n"
+                + "\n\n".join(
+                    f"---CANDIDATE_{i}---\n{cv[:3000]}" for i, cv in enumerate(cvs, 1))
+            )
+            response = await self._get_llm_response_async(system_prompt, user_prompt)
+            delims = list(_CANDIDATE_DELIM.finditer(response))
+            for i, d in enumerate(delims):
+                end = delims[i + 1].start() if i + 1 < len(delims) else len(response)
+                slices[int(d.group(1))] = response[d.end():end].strip()
+
+        outputs: List[AgentOutput] = []
+        for i, cv in enumerate(cvs, 1):
+            self._seeded_response = slices.get(i)
+            try:
+                outputs.append(await self.analyze(cv, job_description, context))
+            finally:
+                self._seeded_response = None
+        return outputs
+
     def _rule_based_fallback(self, prompt: str) -> str:
         return (
             f"[Rule-based mode — add GROQ_API_KEY for AI analysis]\n"
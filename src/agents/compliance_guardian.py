@@ -1,5 +1,5 @@
 """Agent 7: Compliance Guardian v2"""
-import re, time
+import re
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -20,25 +20,60 @@ FIXES:
 - [fix 3]
 SANITIZED_SUMMARY: [Rewrite professional summary removing any legally risky content]"""
 
+# Compiled at import — each pattern runs against the full CV on every
+# analyze call, so the I flag is baked in rather than re-passed per search.
 SENSITIVE_PATTERNS = {
-    'SA ID number': r'\b\d{13}\b',
-    'date of birth': r'\bDOB\b|\bdate of birth\b|\bborn:\s*\d',
-    'marital status': r'\b(married|single|divorced|widowed|separated)\b',
-    'religion': r'\b(christian|muslim|jewish|hindu|buddhist|catholic|protestant|atheist)\b',
-    'home address': r'\b\d{1,5}\s+\w+\s+(street|road|avenue|drive|lane|close|crescent)\b',
-    'photo reference': r'\[photo\]|\[image\]|photograph enclosed',
-    'salary history': r'previous salary|salary history|current salary:\s*R',
-    'id/passport explicit': r'\bID\s*number\s*:\s*\d|\bpassport\s*:\s*[A-Z]\d',
-    'race/ethnicity explicit': r'\brace:\s*\w+|\bethnicity:\s*\w+',
-    'disability explicit': r'\bdisability:\s*\w+',
+    'SA ID number': re.compile(r'\b\d{13}\b', re.IGNORECASE),
+    'date of birth': re.compile(r'\bDOB\b|\bdate of birth\b|\bborn:\s*\d', re.IGNORECASE),
+    'marital status': re.compile(r'\b(married|single|divorced|widowed|separated)\b', re.IGNORECASE),
+    'religion': re.compile(r'\b(christian|muslim|jewish|hindu|buddhist|catholic|protestant|atheist)\b', re.IGNORECASE),
+    'home address': re.compile(r'\b\d{1,5}\s+\w+\s+(street|road|avenue|drive|lane|close|crescent)\b', re.IGNORECASE),
+    'photo reference': re.compile(r'\[photo\]|\[image\]|photograph enclosed', re.IGNORECASE),
+    'salary history': re.compile(r'previous salary|salary history|current salary:\s*R', re.IGNORECASE),
+    'id/passport explicit': re.compile(r'\bID\s*number\s*:\s*\d|\bpassport\s*:\s*[A-Z]\d', re.IGNORECASE),
+    'race/ethnicity explicit': re.compile(r'\brace:\s*\w+|\bethnicity:\s*\w+', re.IGNORECASE),
+    'disability explicit': re.compile(r'\bdisability:\s*\w+', re.IGNORECASE),
 }
 EXAGGERATION_FLAGS = [
-    (r'\b(guru|ninja|rockstar|wizard|unicorn|guru)\b', 'Unprofessional buzzword'),
-    (r'\b100%\s+(success rate|client satisfaction|accuracy)\b', 'Unverifiable 100% claim'),
-    (r'saved\s+\$\s*\d{8,}', 'Implausibly large savings — verify'),
-    (r'increased\s+revenue\s+by\s+\d{3,}%', 'Very high % — ensure verifiable'),
-    (r'managed\s+budget\s+of\s+[R\$]\s*\d{10,}', 'Unusually large budget claim'),
+    (re.compile(r'\b(guru|ninja|rockstar|wizard|unicorn|guru)\b', re.IGNORECASE), 'Unprofessional buzzword'),
+    (re.compile(r'\b100%\s+(success rate|client satisfaction|accuracy)\b', re.IGNORECASE), 'Unverifiable 100% claim'),
+    (re.compile(r'saved\s+\$\s*\d{8,}', re.IGNORECASE), 'Implausibly large savings — verify'),
+    (re.compile(r'increased\s+revenue\s+by\s+\d{3,}%', re.IGNORECASE), 'Very high % — ensure verifiable'),
+    (re.compile(r'managed\s+budget\s+of\s+[R\$]\s*\d{10,}', re.IGNORECASE), 'Unusually large budget claim'),
 ]
+# Literal-only categories are matched in one combined pass: a single
+# alternation of plain words finds every category simultaneously instead
+# of one full-text scan per category. True regexes run as a second,
+# smaller pass.
+_LITERAL_CATEGORIES = {
+    'marital status': ('married', 'single', 'divorced', 'widowed', 'separated'),
+    'religion': ('christian', 'muslim', 'jewish', 'hindu', 'buddhist',
+                 'catholic', 'protestant', 'atheist'),
+}
+_WORD2CATEGORY = {w: cat for cat, words in _LITERAL_CATEGORIES.items() for w in words}
+_RE_LITERALS = re.compile(r'\b(' + '|'.join(sorted(_WORD2CATEGORY)) + r')\b')
+_REGEX_SENSITIVE = {l: p for l, p in SENSITIVE_PATTERNS.items()
+                    if l not in _LITERAL_CATEGORIES}
+
+# The pattern-style categories are fused into one named-group regex so a
+# single finditer pass classifies every hit, instead of one full-text
+# search per category. Labels are sanitized into valid group names and
+# mapped back on match. The alternation sits inside a lookahead so
+# matches are zero-width (the repo's fused scans all do this): a
+# labelled ID number must trip both 'id/passport explicit' and the
+# 13-digit 'SA ID number', and a consuming match would eat the first
+# digit and hide the second category.
+_GROUP2LABEL = {re.sub(r'\W+', '_', l): l for l in _REGEX_SENSITIVE}
+_RE_SENSITIVE_FUSED = re.compile(
+    '(?=' + '|'.join(f'(?P<{g}>{_REGEX_SENSITIVE[l].pattern})' for g, l in _GROUP2LABEL.items()) + ')',
+    re.IGNORECASE,
+)
+
+_BUZZWORDS = ('guru', 'ninja', 'rockstar', 'wizard', 'unicorn')
+_RE_BUZZWORDS = re.compile(r'\b(' + '|'.join(_BUZZWORDS) + r')\b')
+_REGEX_EXAGGERATION = EXAGGERATION_FLAGS[1:]
+
+_RE_INT = re.compile(r'\d+')
 
 
 class ComplianceGuardian(BaseAgent):
@@ -46,15 +81,19 @@ class ComplianceGuardian(BaseAgent):
         super().__init__("The Compliance Guardian", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0=time.time()
-        sensitive=self._find_sensitive(cv_text)
-        truth_flags=self._flag_exaggerations(cv_text)
+        t0=self._now()
+        lower=self._lower(cv_text)
+        sensitive=self._find_sensitive(cv_text,lower)
+        truth_flags=self._flag_exaggerations(cv_text,lower)
         gdpr=self._gdpr_status(sensitive)
         popia=self._popia_status(sensitive)
 
-        user_prompt=f"""CV:\n{cv_text[:4000]}\n\nContext:\n- Market: {context.get('target_market','South Africa')}\n\nPre-analysis:\n- Sensitive data: {', '.join(sensitive) if sensitive else 'None'}\n- Truth flags: {', '.join(truth_flags) if truth_flags else 'None'}\n- GDPR: {gdpr}\n- POPIA: {popia}\n\nFull compliance audit."""
-
-        llm_response=self._get_llm_response(SYSTEM_PROMPT,user_prompt)
+        if self.llm is None:
+            llm_response=self._rule_based_fallback("")
+        else:
+            cv_snip=cv_text[:4000]
+            user_prompt=f"""CV:\n{cv_snip}\n\nContext:\n- Market: {context.get('target_market','South Africa')}\n\nPre-analysis:\n- Sensitive data: {', '.join(sensitive) if sensitive else 'None'}\n- Truth flags: {', '.join(truth_flags) if truth_flags else 'None'}\n- GDPR: {gdpr}\n- POPIA: {popia}\n\nFull compliance audit."""
+            llm_response=self._get_llm_response(SYSTEM_PROMPT,user_prompt)
         score=self._calc_score(sensitive,truth_flags,llm_response)
 
         return AgentOutput(
@@ -69,13 +108,20 @@ class ComplianceGuardian(BaseAgent):
             recommendations=self._extract_fixes(llm_response,sensitive,truth_flags),
             optimized_content=self._extract_section(llm_response,'SANITIZED_SUMMARY'),
             raw_analysis=llm_response, weight=1.0,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
-    def _find_sensitive(self, t):
-        return {l:p for l,p in SENSITIVE_PATTERNS.items() if re.search(p,t,re.IGNORECASE)}
-    def _flag_exaggerations(self, t):
-        return [l for p,l in EXAGGERATION_FLAGS if re.search(p,t,re.IGNORECASE)]
+    def _find_sensitive(self, t, lower):
+        found = {_WORD2CATEGORY[m.group(1)] for m in _RE_LITERALS.finditer(lower)}
+        for m in _RE_SENSITIVE_FUSED.finditer(t):
+            found.add(_GROUP2LABEL[m.lastgroup])
+            if len(found) == len(SENSITIVE_PATTERNS):
+                break
+        return {l: p for l, p in SENSITIVE_PATTERNS.items() if l in found}
+    def _flag_exaggerations(self, t, lower):
+        flags = ['Unprofessional buzzword'] if _RE_BUZZWORDS.search(lower) else []
+        flags.extend(l for p, l in _REGEX_EXAGGERATION if p.search(t))
+        return flags
     def _gdpr_status(self, s):
         risks=[k for k in s if k in ['marital status','religion','date of birth','photo reference','race/ethnicity explicit']]
         if risks: return f"NON-COMPLIANT — {', '.join(risks)}"
@@ -86,14 +132,13 @@ class ComplianceGuardian(BaseAgent):
         if risks: return f"NON-COMPLIANT — {', '.join(risks)}"
         return "COMPLIANT ✓"
     def _calc_score(self, s, flags, r):
-        m=re.search(r'COMPLIANCE_SCORE:\s*(\d+)',r)
-        if m: return int(m.group(1))
+        m=_RE_INT.search(self._parse_structured(r).get('COMPLIANCE_SCORE',''))
+        if m: return int(m.group())
         return max(20,min(100,100-(len(s)*10)-(len(flags)*5)))
     def _extract_fixes(self, r, s, flags):
-        fixes=[]
-        m=re.search(r'FIXES:(.*?)(?:SANITIZED_SUMMARY:|$)',r,re.DOTALL)
-        if m: fixes=[l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:4]
-        for label in list(s.keys())[:3]: fixes.insert(0,f"REMOVE immediately: {label} — never required on a CV")
-        for flag in flags[:2]: fixes.append(f"Review accuracy: {flag}")
+        fixes=self._extract_bullets(r, limit=4)
+        prepend=[f"REMOVE immediately: {label} — never required on a CV" for label in list(s.keys())[:3]]
+        fixes=prepend+fixes
+        fixes.extend(f"Review accuracy: {flag}" for flag in flags[:2])
         return fixes[:8]
-    def _extract_section(self, r, k): m=re.search(rf'{k}:\s*(.+?)(?:\n[A-Z_]+:|$)',r,re.DOTALL); return m.group(1).strip() if m else ""
+    def _extract_section(self, r, k): return self._parse_structured(r).get(k, "")
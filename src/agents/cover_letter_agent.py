@@ -1,5 +1,5 @@
 """Agent 9: Cover Letter Composer v2"""
-import re, time
+import functools, re
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -28,18 +28,35 @@ TIPS:
 - [improvement tip]"""
 
 
+# Compiled once — batch runs re-test the same JD per CV, so the extractors
+# below are also memoized on the JD text.
+_COMPANY_PATTERNS = (
+    re.compile(r'(?:at|join|company|organisation|organization):\s*([A-Z][A-Za-z\s&]{2,30})', re.MULTILINE),
+    re.compile(r'^([A-Z][A-Za-z\s&]{2,30})\s+(?:is|are)\s+(?:looking|seeking|hiring)', re.MULTILINE),
+)
+_ROLE_PATTERNS = (
+    re.compile(r'(?:position|role|job title|vacancy):\s*(.+?)(?:\n|$)', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^([\w\s/]{5,40})\n', re.IGNORECASE | re.MULTILINE),
+)
+_RE_INT = re.compile(r'\d+')
+
+
 class CoverLetterAgent(BaseAgent):
     def __init__(self, llm=None):
         super().__init__("The Cover Letter Composer", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0=time.time()
+        t0=self._now()
         company=self._extract_company(job_description)
         role=self._extract_role(job_description)
 
-        user_prompt=f"""CV (extract 3 strongest achievements with metrics):\n{cv_text[:3500]}\n\nJD:\n{job_description[:2500]}\n\nContext:\n- Market: {context.get('target_market','South Africa')}\n- Level: {context.get('experience_level','Mid')}\n- Industry: {context.get('industry','N/A')}\n- Company: {company}\n- Role: {role}\n\nWrite a compelling, personalized cover letter that earns an interview.\nNEVER start with "I am writing to apply". Reference specific JD elements."""
-
-        llm_response=self._get_llm_response(SYSTEM_PROMPT,user_prompt)
+        if self.llm is None:
+            llm_response=self._rule_based_fallback("")
+        else:
+            cv_snip=cv_text[:3500]
+            jd_snip=job_description[:2500]
+            user_prompt=f"""CV (extract 3 strongest achievements with metrics):\n{cv_snip}\n\nJD:\n{jd_snip}\n\nContext:\n- Market: {context.get('target_market','South Africa')}\n- Level: {context.get('experience_level','Mid')}\n- Industry: {context.get('industry','N/A')}\n- Company: {company}\n- Role: {role}\n\nWrite a compelling, personalized cover letter that earns an interview.\nNEVER start with "I am writing to apply". Reference specific JD elements."""
+            llm_response=self._get_llm_response(SYSTEM_PROMPT,user_prompt)
         letter=self._extract_letter(llm_response)
         score=self._extract_int(llm_response,'QUALITY_SCORE',70)
 
@@ -56,29 +73,40 @@ class CoverLetterAgent(BaseAgent):
             recommendations=self._extract_tips(llm_response),
             optimized_content=letter,
             raw_analysis=llm_response, weight=0.8,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
-    def _extract_company(self, jd):
-        patterns=[r'(?:at|join|company|organisation|organization):\s*([A-Z][A-Za-z\s&]{2,30})',r'^([A-Z][A-Za-z\s&]{2,30})\s+(?:is|are)\s+(?:looking|seeking|hiring)']
-        for p in patterns:
-            m=re.search(p,jd,re.MULTILINE)
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _extract_company(jd):
+        for p in _COMPANY_PATTERNS:
+            m=p.search(jd)
             if m: return m.group(1).strip()[:40]
         return "[Company Name]"
-    def _extract_role(self, jd):
-        patterns=[r'(?:position|role|job title|vacancy):\s*(.+?)(?:\n|$)',r'^([\w\s/]{5,40})\n']
-        for p in patterns:
-            m=re.search(p,jd,re.IGNORECASE|re.MULTILINE)
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _extract_role(jd):
+        for p in _ROLE_PATTERNS:
+            m=p.search(jd)
             if m: return m.group(1).strip()[:60]
         return "[Role]"
     def _extract_letter(self, r):
-        m=re.search(r'COVER_LETTER_START\s*\n(.*?)\nCOVER_LETTER_END',r,re.DOTALL)
-        if m: return m.group(1).strip()
-        m2=re.search(r'COVER_LETTER_START\s*\n(.+)',r,re.DOTALL)
-        return m2.group(1).strip()[:2000] if m2 else r[:1500]
-    def _extract_int(self, t, k, d): m=re.search(rf'{k}:\s*(\d+)',t); return int(m.group(1)) if m else d
-    def _extract_line(self, t, k): m=re.search(rf'{k}:\s*(.+?)(?:\n|$)',t); return m.group(1).strip()[:60] if m else "N/A"
+        # Marker slicing via str.find — the old DOTALL regexes backtracked
+        # over the whole response when the end marker was missing.
+        start=r.find('COVER_LETTER_START')
+        if start==-1: return r[:1500]
+        start=r.find('\n',start)
+        body=r[start+1:] if start!=-1 else ""
+        end=body.find('COVER_LETTER_END')
+        if end!=-1: return body[:end].strip()
+        return body.strip()[:2000]
+    def _extract_int(self, t, k, d):
+        m=_RE_INT.search(self._parse_structured(t).get(k,''))
+        return int(m.group()) if m else d
+    def _extract_line(self, t, k):
+        v=self._parse_structured(t).get(k,'')
+        return v.splitlines()[0].strip()[:60] if v else "N/A"
     def _extract_tips(self, r):
-        m=re.search(r'TIPS:(.*?)(?:$)',r,re.DOTALL)
-        if m: return [l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:3]
+        tips=self._extract_bullets(r, key='TIPS', limit=3)
+        if tips: return tips
         return ["Add hiring manager's name if you can find it","Reference a recent company news item"]
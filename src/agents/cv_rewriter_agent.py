@@ -2,8 +2,7 @@
 Agent 12 (NEW): The CV Rewriter
 Full AI-powered CV rewrite — not just suggestions, actual complete rewritten CVs.
 """
-import re
-import time
+import asyncio
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -56,10 +55,16 @@ class CVRewriterAgent(BaseAgent):
         super().__init__("The CV Rewriter", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
+        t0 = self._now()
         missing_kw = context.get('_missing_keywords', [])
         agent_insights = context.get('_agent_insights', {})
 
+        if self.llm is None:
+            # No point assembling three ~8KB contexts the fallback ignores —
+            # common path in CI and keyless dev runs.
+            ats_cv = balanced_cv = creative_cv = self._rule_based_fallback("")
+            return self._build_output(t0, missing_kw, ats_cv, balanced_cv, creative_cv)
+
         base_context = f"""CANDIDATE CV:
 {cv_text[:5000]}
 
@@ -75,10 +80,16 @@ OPTIMIZATION CONTEXT:
 
 Rewrite the complete CV now:"""
 
-        ats_cv = self._get_llm_response(ATS_MAX_PROMPT, base_context)
-        balanced_cv = self._get_llm_response(BALANCED_PROMPT, base_context)
-        creative_cv = self._get_llm_response(CREATIVE_PROMPT, base_context)
+        # The three rewrites are independent network calls — run them
+        # concurrently instead of paying three sequential round-trips.
+        ats_cv, balanced_cv, creative_cv = await asyncio.gather(
+            self._get_llm_response_async(ATS_MAX_PROMPT, base_context),
+            self._get_llm_response_async(BALANCED_PROMPT, base_context),
+            self._get_llm_response_async(CREATIVE_PROMPT, base_context),
+        )
+        return self._build_output(t0, missing_kw, ats_cv, balanced_cv, creative_cv)
 
+    def _build_output(self, t0, missing_kw, ats_cv, balanced_cv, creative_cv) -> AgentOutput:
         return AgentOutput(
             agent_name=self.name,
             score=85 if self.llm else 0,
@@ -97,7 +108,7 @@ Rewrite the complete CV now:"""
             optimized_content=f"ATS_MAX_CV_START\n{ats_cv}\nATS_MAX_CV_END\n\nBALANCED_CV_START\n{balanced_cv}\nBALANCED_CV_END\n\nCREATIVE_CV_START\n{creative_cv}\nCREATIVE_CV_END",
             raw_analysis=f"ats_max={ats_cv}\nbalanced={balanced_cv}\ncreative={creative_cv}",
             weight=2.0,
-            execution_ms=int((time.time() - t0) * 1000),
+            execution_ms=self._ms_since(t0),
             ai_powered=self.llm is not None,
         )
 
@@ -108,5 +119,12 @@ Rewrite the complete CV now:"""
             'creative': ('CREATIVE_CV_START', 'CREATIVE_CV_END'),
         }
         start, end = markers.get(variant, ('', ''))
-        m = re.search(rf'{start}\n(.*?)\n{end}', raw, re.DOTALL)
-        return m.group(1).strip() if m else ""
+        if not start:
+            return ""
+        i = raw.find(start)
+        if i == -1:
+            return ""
+        j = raw.find(end, i)
+        if j == -1:
+            return ""
+        return raw[i + len(start):j].strip()
@@ -0,0 +1,101 @@
+"""
+Fused Analysis — four agents, one LLM call.
+GlobalSetter, HiringManagerWhisperer, FutureArchitect and InterviewCoach
+all read the same CV+JD; fusing their prompts into a single completion
+pays the CV/JD token cost once instead of four times and collapses four
+network round-trips into one.
+"""
+import asyncio
+import re
+from typing import Dict, Any
+
+from .base_agent import BaseAgent, AgentOutput
+from . import global_setter, hiring_manager_whisperer, future_architect, interview_coach
+
+_DELIM = re.compile(r'^---AGENT:([A-Z_]+)---\s*$', re.MULTILINE)
+
+_SUB_AGENTS = (
+    ('GLOBAL_SETTER', global_setter.GlobalSetter, global_setter.SYSTEM_PROMPT),
+    ('HIRING_MANAGER', hiring_manager_whisperer.HiringManagerWhisperer,
+     hiring_manager_whisperer.SYSTEM_PROMPT),
+    ('FUTURE_ARCHITECT', future_architect.FutureArchitect, future_architect.SYSTEM_PROMPT),
+    ('INTERVIEW_COACH', interview_coach.InterviewCoach, interview_coach.SYSTEM_PROMPT),
+)
+
+SYSTEM_PROMPT = (
+    "You are four CV-analysis experts in one. Analyse the CV and job "
+    "description ONCE, then answer as each expert in turn. Precede each "
+    "expert's answer with its delimiter line, exactly as shown, and follow "
+    "that expert's response format exactly.\n\n"
+    + "\n\n".join(
+        f"---AGENT:{key}---\n{prompt}" for key, _cls, prompt in _SUB_AGENTS
+    )
+)
+
+
+class FusedAnalysisAgent(BaseAgent):
+    """Runs the four analysis agents off a single combined completion.
+
+    The sub-agents' rule-based pre-filters, extractors and AgentOutput
+    assembly are reused unchanged: the fused response is split on the
+    delimiter lines and each slice is seeded into its sub-agent before
+    calling its normal analyze.
+    """
+
+    def __init__(self, llm=None):
+        super().__init__("Fused Analysis", llm)
+        self.sub_agents = {key: cls(llm) for key, cls, _prompt in _SUB_AGENTS}
+
+    async def analyze_all(self, cv_text: str, job_description: str,
+                          context: Dict) -> Dict[str, AgentOutput]:
+        """One LLM call, four AgentOutputs keyed by sub-agent key."""
+        slices: Dict[str, str] = {}
+        if self.llm is not None:
+            user_prompt = (
+                f"CV TEXT:\n{cv_text[:4000]}\n\n"
+                f"JOB DESCRIPTION:\n{job_description[:2500]}\n\n"
+                f"CONTEXT:\n"
+                f"- Target Market: {context.get('target_market', 'South Africa')}\n"
+                f"- Experience Level: {context.get('experience_level', 'Mid')}\n"
+                f"- Industry: {context.get('industry', 'Not specified')}\n"
+                f"- Target Role: {context.get('target_role', 'Not specified')}\n\n"
+                f"Answer as all four experts, each after its delimiter line."
+            )
+            response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
+            slices = self._split(response)
+
+        results: Dict[str, AgentOutput] = {}
+        for key, agent in self.sub_agents.items():
+            # A missing slice (rule-based mode, or the model dropped a
+            # delimiter) leaves the sub-agent unseeded so it falls back
+            # to its own LLM call / rule-based path.
+            agent._seeded_response = slices.get(key)
+            try:
+                results[key] = await agent.analyze(cv_text, job_description, context)
+            finally:
+                agent._seeded_response = None
+        return results
+
+    async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
+        t0 = self._now()
+        results = await self.analyze_all(cv_text, job_description, context)
+        outputs = list(results.values())
+        total_weight = sum(o.weight for o in outputs) or 1.0
+        return AgentOutput(
+            agent_name=self.name,
+            score=round(sum(o.score * o.weight for o in outputs) / total_weight),
+            findings=[f for o in outputs for f in o.findings],
+            recommendations=[r for o in outputs for r in o.recommendations],
+            raw_analysis="\n\n".join(o.raw_analysis for o in outputs),
+            execution_ms=self._ms_since(t0),
+            ai_powered=self.llm is not None,
+        )
+
+    @staticmethod
+    def _split(response: str) -> Dict[str, str]:
+        delims = list(_DELIM.finditer(response))
+        return {
+            d.group(1): response[d.end():delims[i + 1].start() if i + 1 < len(delims)
+                                 else len(response)].strip()
+            for i, d in enumerate(delims)
+        }
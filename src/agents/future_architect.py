@@ -1,5 +1,6 @@
 """Agent 8: Future Architect v2"""
-import re, time
+import functools
+import re
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -24,22 +25,40 @@ FIXES:
 CAREER_NARRATIVE: [2-3 sentences showing compelling upward trajectory for their next role]"""
 
 EMERGING_2025 = ["generative ai","llm","prompt engineering","ai tools","github copilot","power bi","tableau","looker","esg","sustainability","okr","okrs","remote leadership","async","python","automation","api integration","no-code","low-code","data-driven","cloud native","kubernetes","terraform","devsecops","platform engineering","mlops","rag","vector database"]
+AI_TOOLS = ['chatgpt','copilot','claude','gemini','midjourney','stable diffusion','dall-e','llm','gpt','ai ','machine learning','automation']
+
+# All tracked terms fused into one escaped alternation (longest first) so a
+# single findall pass over the lowered CV replaces ~39 separate substring
+# scans. An automaton library would do the same walk; the stdlib engine's
+# literal alternation is close enough without a new dependency.
+_TERMS_RE = re.compile('|'.join(
+    re.escape(t) for t in sorted(set(EMERGING_2025 + AI_TOOLS), key=len, reverse=True)))
+
+
+@functools.lru_cache(maxsize=128)
+def _term_hits(cvl):
+    # Pure function of the lowered CV — cached across JD-only re-runs and
+    # shared with the score_batch pool pre-scorer.
+    return frozenset(_TERMS_RE.findall(cvl))
 
 
 class FutureArchitect(BaseAgent):
+    RELEVANT_SECTIONS = ('summary', 'experience', 'skills')
+
     def __init__(self, llm=None):
         super().__init__("The Future-Proof Architect", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0=time.time()
-        cvl=cv_text.lower()
-        present=[s for s in EMERGING_2025 if s in cvl]
-        progression=self._assess_progression(cv_text)
-        ai_readiness=self._assess_ai_readiness(cv_text)
+        t0=self._now()
+        cvl=self._lower(cv_text)
+        hits=_term_hits(cvl)
+        present=[s for s in EMERGING_2025 if s in hits]
+        progression=self._assess_progression(cvl)
+        ai_readiness=self._assess_ai_readiness(hits)
 
-        user_prompt=f"""CV:\n{cv_text[:4000]}\n\nJD:\n{job_description[:1500]}\n\nContext:\n- Level: {context.get('experience_level','Mid')}\n- Target: {context.get('target_role','Similar to current')}\n- Industry: {context.get('industry','N/A')}\n\nPre-analysis:\n- Emerging skills present: {', '.join(present) if present else 'None'}\n- Coverage: {len(present)}/{len(EMERGING_2025)} tracked skills\n- Progression: {progression}\n- AI Readiness: {ai_readiness}\n\nDesign future-proof positioning."""
+        user_prompt=f"""CV:\n{self._cv_slice(cv_text)}\n\nJD:\n{job_description[:1500]}\n\nContext:\n- Level: {context.get('experience_level','Mid')}\n- Target: {context.get('target_role','Similar to current')}\n- Industry: {context.get('industry','N/A')}\n\nPre-analysis:\n- Emerging skills present: {', '.join(present) if present else 'None'}\n- Coverage: {len(present)}/{len(EMERGING_2025)} tracked skills\n- Progression: {progression}\n- AI Readiness: {ai_readiness}\n\nDesign future-proof positioning."""
 
-        llm_response=self._get_llm_response(SYSTEM_PROMPT,user_prompt)
+        llm_response=await self._get_llm_response_async(SYSTEM_PROMPT,user_prompt)
         score=self._extract_int(llm_response,'FUTURE_SCORE',60)
 
         return AgentOutput(
@@ -55,27 +74,41 @@ class FutureArchitect(BaseAgent):
             recommendations=self._extract_fixes(llm_response,present),
             optimized_content=self._extract_section(llm_response,'CAREER_NARRATIVE'),
             raw_analysis=llm_response, weight=0.9,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
-    def _assess_progression(self, t):
+    def score_batch(self, cvs: List[str]) -> List[Dict[str, Any]]:
+        """Rule-based pre-score for a candidate pool — no LLM calls.
+
+        One fused-pattern scan per CV against the tracked 2025 skills,
+        for bulk re-ranking of many candidates against one JD before
+        spending tokens on the full analyze path.
+        """
+        results = []
+        for cv in cvs:
+            cvl = self._lower(cv)
+            hits = _term_hits(cvl)
+            present = [s for s in EMERGING_2025 if s in hits]
+            results.append({
+                'emerging_count': len(present),
+                'emerging_present': present,
+                'ai_readiness': self._assess_ai_readiness(hits),
+                'progression': self._assess_progression(cvl),
+            })
+        return results
+
+    def _assess_progression(self, cvl):
         words=['promoted','advanced','progressed','grew','scaled','elevated','appointed']
-        count=sum(1 for w in words if w in t.lower())
+        count=sum(1 for w in words if w in cvl)
         if count>=3: return "Strong upward progression ✓"
         if count>=1: return "Some progression signals"
         return "Progression unclear — strengthen career arc"
-    def _assess_ai_readiness(self, t):
-        ai_tools=['chatgpt','copilot','claude','gemini','midjourney','stable diffusion','dall-e','llm','gpt','ai ','machine learning','automation']
-        count=sum(1 for tool in ai_tools if tool in t.lower())
+    def _assess_ai_readiness(self, hits):
+        count=sum(1 for tool in AI_TOOLS if tool in hits)
         if count>=4: return "HIGH — AI-native candidate"
         if count>=2: return "MEDIUM — AI-aware"
         return "LOW — no AI tools mentioned (critical gap for 2025)"
-    def _extract_int(self, t, k, d): m=re.search(rf'{k}:\s*(\d+)',t); return int(m.group(1)) if m else d
-    def _extract_line(self, t, k): m=re.search(rf'{k}:\s*(.+?)(?:\n|$)',t); return m.group(1).strip()[:100] if m else "N/A"
     def _extract_fixes(self, r, present):
-        fixes=[]
-        m=re.search(r'FIXES:(.*?)(?:CAREER_NARRATIVE:|$)',r,re.DOTALL)
-        if m: fixes=[l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:5]
+        fixes=self._extract_bullets(r)
         if len(present)<3: fixes.append("Add 2-3 emerging skills: GenAI tools, data-driven decision making, automation")
         return fixes[:8]
-    def _extract_section(self, r, k): m=re.search(rf'{k}:\s*(.+?)(?:\n[A-Z_]+:|$)',r,re.DOTALL); return m.group(1).strip() if m else ""
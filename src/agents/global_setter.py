@@ -1,5 +1,5 @@
 """Agent 3: Global Standard Setter v2"""
-import re, time
+import re
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -26,7 +26,9 @@ FIXES:
 - [fix 4]
 GLOBAL_SUMMARY: [2-3 sentence international summary — GDPR compliant, ATS-optimized for Workday/Greenhouse]"""
 
-GDPR_PATTERNS = {
+# Compiled once at import — both tables run against the full CV every
+# analyze call, so the IGNORECASE flag is baked into each pattern.
+GDPR_PATTERNS = {k: re.compile(v, re.IGNORECASE) for k, v in {
     'marital_status': r'\b(married|single|divorced|widowed|separated)\b',
     'religion': r'\b(christian|muslim|jewish|hindu|buddhist|catholic|protestant|atheist)\b',
     'date_of_birth': r'\bDOB\b|date of birth|born:|\bD\.O\.B\b',
@@ -35,29 +37,36 @@ GDPR_PATTERNS = {
     'nationality_explicit': r'\bnationality:\s*\w+',
     'gender_explicit': r'\bgender:\s*(male|female|other)\b',
     'race_explicit': r'\brace:\s*\w+|\bethnicity:\s*\w+',
-}
+}.items()}
+# These were regexes whose only metacharacter was '|' — plain substring
+# membership on the lowered CV skips the regex engine entirely. The one
+# non-literal branch (an international phone prefix, +<digit>) keeps its
+# own compiled pattern below.
 REQUIRED_SECTIONS = {
-    'contact_info': r'@|email|phone|tel|\+\d',
-    'linkedin': r'linkedin\.com',
-    'summary_profile': r'summary|objective|profile|about',
-    'work_experience': r'experience|employment|work history|career',
-    'education': r'education|qualification|degree|university',
-    'skills': r'skills|competencies|expertise|technologies',
+    'contact_info': ('@', 'email', 'phone', 'tel'),
+    'linkedin': ('linkedin.com',),
+    'summary_profile': ('summary', 'objective', 'profile', 'about'),
+    'work_experience': ('experience', 'employment', 'work history', 'career'),
+    'education': ('education', 'qualification', 'degree', 'university'),
+    'skills': ('skills', 'competencies', 'expertise', 'technologies'),
 }
+_RE_PHONE_INTL = re.compile(r'\+\d')
 
 
 class GlobalSetter(BaseAgent):
+    RELEVANT_SECTIONS = ('header', 'summary', 'education', 'certifications')
+
     def __init__(self, llm=None):
         super().__init__("The Global Standard Setter", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
+        t0 = self._now()
         gdpr_risks = self._check_gdpr(cv_text)
         missing = self._check_sections(cv_text)
 
-        user_prompt = f"""CV TEXT:\n{cv_text[:4000]}\n\nJOB DESCRIPTION:\n{job_description[:2000]}\n\nTARGET MARKET: {context.get('target_market', 'International')}\n\nPre-analysis:\n- GDPR risks: {', '.join(gdpr_risks) if gdpr_risks else 'None'}\n- Missing sections: {', '.join(missing) if missing else 'None'}\n\nFull international analysis."""
+        user_prompt = f"""CV TEXT:\n{self._cv_slice(cv_text)}\n\nJOB DESCRIPTION:\n{job_description[:2000]}\n\nTARGET MARKET: {context.get('target_market', 'International')}\n\nPre-analysis:\n- GDPR risks: {', '.join(gdpr_risks) if gdpr_risks else 'None'}\n- Missing sections: {', '.join(missing) if missing else 'None'}\n\nFull international analysis."""
 
-        llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+        llm_response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
         score = self._extract_int(llm_response, 'GLOBAL_SCORE', 70)
 
         return AgentOutput(
@@ -75,21 +84,18 @@ class GlobalSetter(BaseAgent):
             recommendations=self._extract_fixes(llm_response, gdpr_risks, missing),
             optimized_content=self._extract_section(llm_response, 'GLOBAL_SUMMARY'),
             raw_analysis=llm_response, weight=1.2,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
-    def _check_gdpr(self, t): return [n for n,p in GDPR_PATTERNS.items() if re.search(p,t,re.IGNORECASE)]
-    def _check_sections(self, t): return [s for s,p in REQUIRED_SECTIONS.items() if not re.search(p,t,re.IGNORECASE)]
-    def _extract_int(self, t, k, d):
-        m=re.search(rf'{k}:\s*(\d+)',t); return int(m.group(1)) if m else d
-    def _extract_line(self, t, k):
-        m=re.search(rf'{k}:\s*(.+?)(?:\n|$)',t); return m.group(1).strip()[:80] if m else "N/A"
+    def _check_gdpr(self, t): return [n for n,p in GDPR_PATTERNS.items() if p.search(t)]
+    def _check_sections(self, t):
+        tl = self._lower(t)
+        return [s for s, lits in REQUIRED_SECTIONS.items()
+                if not (any(l in tl for l in lits)
+                        or (s == 'contact_info' and _RE_PHONE_INTL.search(t)))]
     def _extract_fixes(self, r, gdpr, miss):
-        fixes=[]
-        m=re.search(r'FIXES:(.*?)(?:GLOBAL_SUMMARY:|$)',r,re.DOTALL)
-        if m: fixes=[l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:5]
-        for risk in gdpr: fixes.insert(0,f"REMOVE: {risk.replace('_',' ')} — illegal to include in UK/EU/US CVs")
+        fixes=self._extract_bullets(r)
+        prepend=[f"REMOVE: {risk.replace('_',' ')} — illegal to include in UK/EU/US CVs" for risk in gdpr]
+        fixes=prepend+fixes
         for sec in miss: fixes.append(f"ADD: {sec.replace('_',' ')} section — required for international ATS")
         return fixes[:10]
-    def _extract_section(self, r, k):
-        m=re.search(rf'{k}:\s*(.+?)(?:\n[A-Z_]+:|$)',r,re.DOTALL); return m.group(1).strip() if m else ""
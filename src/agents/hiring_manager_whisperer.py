@@ -1,5 +1,5 @@
 """Agent 5: Hiring Manager Whisperer v2"""
-import re, time
+import re
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -24,23 +24,40 @@ FIXES:
 - [fix 3]
 EVIDENCE_REWRITE: [Rewrite their weakest technical claim with full context: what built, what tools, what scale, what outcome]"""
 
-VAGUE_PATTERNS = [r'experienced? in ([A-Za-z\s\.\/\+]{3,25})',r'knowledge of ([A-Za-z\s\.\/\+]{3,25})',r'familiar with ([A-Za-z\s\.\/\+]{3,25})',r'proficient in ([A-Za-z\s\.\/\+]{3,25})',r'understanding of ([A-Za-z\s\.\/\+]{3,25})',r'exposure to ([A-Za-z\s\.\/\+]{3,25})',r'worked with ([A-Za-z\s\.\/\+]{3,25})']
+# One alternation instead of seven separate patterns — _find_vague
+# extracts every hedge phrase in a single pass over the CV. The prefix
+# alternation is pure literals and the capture class has a bounded
+# repeat, so there is no nested quantifier for the backtracking engine
+# to blow up on with untrusted CV text.
+_VAGUE_RE = re.compile(
+    r'(?:experienced? in|knowledge of|familiar with|proficient in|'
+    r'understanding of|exposure to|worked with)\s+([A-Za-z\s./+]{3,25})',
+    re.IGNORECASE,
+)
+# Portfolio detection is literal-only — membership on the lowered CV
+# beats a regex alternation. The metrics check keeps a (precompiled)
+# regex for its \d+% / $\d+ branches.
+_PORTFOLIO_SITES = ('github', 'gitlab', 'portfolio', 'bitbucket', 'behance', 'dribbble')
+_RE_METRICS = re.compile(r'\d+%|\$\d+|R\s?\d+|saved|reduced|increased|achieved', re.IGNORECASE)
 
 
 class HiringManagerWhisperer(BaseAgent):
+    RELEVANT_SECTIONS = ('summary', 'experience', 'skills')
+
     def __init__(self, llm=None):
         super().__init__("The Hiring Manager Whisperer", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0=time.time()
+        t0=self._now()
         vague=self._find_vague(cv_text)
-        has_portfolio=bool(re.search(r'github|gitlab|portfolio|bitbucket|behance|dribbble',cv_text,re.IGNORECASE))
-        has_metrics=bool(re.search(r'\d+%|\$\d+|R\s?\d+|saved|reduced|increased|achieved',cv_text,re.IGNORECASE))
+        cvl=self._lower(cv_text)
+        has_portfolio=any(site in cvl for site in _PORTFOLIO_SITES)
+        has_metrics=bool(_RE_METRICS.search(cv_text))
         seniority=self._check_seniority(cv_text,context)
 
-        user_prompt=f"""CV:\n{cv_text[:4000]}\n\nJD:\n{job_description[:2000]}\n\nContext:\n- Level: {context.get('experience_level','Mid')}\n- Industry: {context.get('industry','N/A')}\n\nPre-analysis:\n- Vague: {', '.join(vague) if vague else 'None'}\n- Portfolio: {has_portfolio}\n- Metrics: {has_metrics}\n- Seniority match: {seniority}"""
+        user_prompt=f"""CV:\n{self._cv_slice(cv_text)}\n\nJD:\n{job_description[:2000]}\n\nContext:\n- Level: {context.get('experience_level','Mid')}\n- Industry: {context.get('industry','N/A')}\n\nPre-analysis:\n- Vague: {', '.join(vague) if vague else 'None'}\n- Portfolio: {has_portfolio}\n- Metrics: {has_metrics}\n- Seniority match: {seniority}"""
 
-        llm_response=self._get_llm_response(SYSTEM_PROMPT,user_prompt)
+        llm_response=await self._get_llm_response_async(SYSTEM_PROMPT,user_prompt)
         score=self._extract_int(llm_response,'HM_SCORE',60)
 
         return AgentOutput(
@@ -57,29 +74,14 @@ class HiringManagerWhisperer(BaseAgent):
             recommendations=self._extract_fixes(llm_response,vague,has_portfolio),
             optimized_content=self._extract_section(llm_response,'EVIDENCE_REWRITE'),
             raw_analysis=llm_response, weight=1.2,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
     def _find_vague(self, t):
-        found=[]
-        for p in VAGUE_PATTERNS:
-            found.extend([m.strip() for m in re.findall(p,t,re.IGNORECASE) if len(m.strip())>2])
-        return list(set(found))[:8]
-    def _check_seniority(self, cv, ctx):
-        level=ctx.get('experience_level','Mid').lower()
-        m=re.search(r'(\d+)\+?\s*years?',cv,re.IGNORECASE)
-        if m:
-            yrs=int(m.group(1)); exp={'entry':2,'mid':5,'senior':10,'executive':18}.get(level.split()[0],5)
-            if yrs<exp-2: return f"Under-experienced ({yrs}yr vs {exp}yr expected for {level})"
-            if yrs>exp+6: return f"Potentially overqualified ({yrs}yr) — address proactively"
-        return "Seniority appears well-matched"
-    def _extract_int(self, t, k, d): m=re.search(rf'{k}:\s*(\d+)',t); return int(m.group(1)) if m else d
-    def _extract_line(self, t, k): m=re.search(rf'{k}:\s*(.+?)(?:\n|$)',t); return m.group(1).strip()[:80] if m else "N/A"
+        found=dict.fromkeys(m.strip() for m in _VAGUE_RE.findall(t) if len(m.strip())>2)
+        return list(found)[:8]
     def _extract_fixes(self, r, vague, portfolio):
-        fixes=[]
-        m=re.search(r'FIXES:(.*?)(?:EVIDENCE_REWRITE:|$)',r,re.DOTALL)
-        if m: fixes=[l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:5]
+        fixes=self._extract_bullets(r)
         if not portfolio: fixes.insert(0,"Add GitHub/portfolio URL — hiring managers verify technical claims immediately")
         for skill in vague[:2]: fixes.append(f'Expand "{skill.strip()}" — add project context, scale, outcome')
         return fixes[:8]
-    def _extract_section(self, r, k): m=re.search(rf'{k}:\s*(.+?)(?:\n[A-Z_]+:|$)',r,re.DOTALL); return m.group(1).strip() if m else ""
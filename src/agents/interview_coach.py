@@ -3,7 +3,6 @@ Agent 10 (NEW): The Interview Coach
 Generates likely interview questions, STAR answer frameworks, curveball prep.
 """
 import re
-import time
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -40,18 +39,31 @@ CLOSING_QUESTIONS: [3 smart questions to ask the interviewer, comma-separated]
 PREP_SUMMARY: [2-3 sentences on top interview prep priorities for this specific role]"""
 
 
+# Q1:/Q2: numbered blocks plus the uppercase section headers — one
+# finditer walk replaces the separate scans for questions, STAR lines,
+# SALARY_TALK and CLOSING_QUESTIONS.
+_QA_HEADER = re.compile(r'^(Q\d+|[A-Z_]+):', re.MULTILINE)
+_ROLE_LEVEL_RE = re.compile(
+    r'(?:senior|lead|manager|director|head|principal|junior|graduate)\s+\w+',
+    re.IGNORECASE)
+_TENURE_RE = re.compile(r'(20\d\d)\s*[-–]\s*(20\d\d)')
+_STOP_WORDS = frozenset({'and','the','for','with','you','are','this','that','have','will'})
+
+
 class InterviewCoach(BaseAgent):
+    RELEVANT_SECTIONS = ('summary', 'experience', 'skills', 'education')
+
     def __init__(self, llm=None):
         super().__init__("The Interview Coach", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
+        t0 = self._now()
         gaps = self._identify_gaps(cv_text, job_description)
         transitions = self._detect_transitions(cv_text)
         seniority_mismatch = self._check_seniority(cv_text, context)
 
         user_prompt = f"""CV TEXT:
-{cv_text[:4000]}
+{self._cv_slice(cv_text)}
 
 JOB DESCRIPTION:
 {job_description[:2500]}
@@ -70,7 +82,7 @@ Pre-analysis:
 Generate interview questions that WILL be asked. Be specific to this exact role and CV combination.
 Focus on the gaps, transitions, and areas the interviewer will probe hardest."""
 
-        llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+        llm_response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
         score = self._extract_int(llm_response, 'INTERVIEW_SCORE', 60)
         questions = self._extract_questions(llm_response)
 
@@ -89,72 +101,86 @@ Focus on the gaps, transitions, and areas the interviewer will probe hardest."""
             optimized_content=self._format_qa_output(llm_response),
             raw_analysis=llm_response,
             weight=1.0,
-            execution_ms=int((time.time() - t0) * 1000),
+            execution_ms=self._ms_since(t0),
             ai_powered=self.llm is not None,
         )
 
     def _identify_gaps(self, cv: str, jd: str) -> str:
-        stop = {'and','the','for','with','you','are','this','that','have','will'}
-        jd_terms = [w.lower() for w in re.findall(r'\b[a-zA-Z]{4,}\b', jd)
-                    if w.lower() not in stop]
-        cv_lower = cv.lower()
-        missing = list(set([w for w in jd_terms if w not in cv_lower]))[:8]
+        # Set difference on the shared cached tokenization instead of a
+        # substring scan of the whole CV per distinct JD term.
+        cv_words = self._token_set(self._lower(cv))
+        jd_words = self._token_set(self._lower(jd)) - _STOP_WORDS
+        missing = sorted(jd_words - cv_words)[:8]
         return ', '.join(missing) if missing else 'Minimal gaps detected'
 
     def _detect_transitions(self, cv: str) -> str:
-        roles = re.findall(r'(?:senior|lead|manager|director|head|principal|junior|graduate)\s+\w+',
-                           cv, re.IGNORECASE)
+        roles = _ROLE_LEVEL_RE.findall(cv)
         if len(roles) > 1:
             return f"Multiple role levels: {', '.join(list(set(roles))[:3])}"
-        gaps = re.findall(r'(20\d\d)\s*[-–]\s*(20\d\d)', cv)
+        gaps = _TENURE_RE.findall(cv)
         if gaps:
             for start, end in gaps:
                 if int(end) - int(start) > 2:
                     return f"Extended tenure periods — progression narrative needed"
         return "Stable career progression"
 
-    def _check_seniority(self, cv: str, context: Dict) -> str:
-        level = context.get('experience_level', 'Mid')
-        years_match = re.search(r'(\d+)\+?\s*years?', cv, re.IGNORECASE)
-        if years_match:
-            years = int(years_match.group(1))
-            expected = {'Entry': 2, 'Mid': 5, 'Senior': 10, 'Executive': 18}
-            exp = expected.get(level, 5)
-            if years < exp - 2:
-                return f"Under-experienced for {level} role ({years} years vs {exp} expected)"
-            elif years > exp + 5:
-                return f"May be overqualified — address potential concern proactively"
-        return "Seniority appears well-matched"
+    def _parse_response(self, response: str):
+        """Walk the response once, splitting Q-blocks from named sections.
+
+        The coach's format interleaves numbered Q/STAR pairs with
+        uppercase sections, so the shared _parse_structured would stop at
+        the first STAR: header. One finditer over _QA_HEADER yields both
+        the [question, star] pairs in order and the {SECTION: body} dict;
+        memoized per response object like the base parser.
+        """
+        cached = getattr(self, '_qa_parsed', None)
+        if cached is not None and cached[0] is response:
+            return cached[1], cached[2]
+        sections: Dict[str, str] = {}
+        qa: List[List[str]] = []
+        headers = list(_QA_HEADER.finditer(response))
+        for i, h in enumerate(headers):
+            key = h.group(1)
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(response)
+            body = response[h.end():end].strip()
+            if key[0] == 'Q' and key[1:].isdigit():
+                qa.append([body, ''])
+            elif key == 'STAR' and qa and not qa[-1][1]:
+                qa[-1][1] = body
+            else:
+                sections.setdefault(key, body)
+        self._qa_parsed = (response, sections, qa)
+        return sections, qa
 
     def _extract_int(self, text: str, key: str, default: int) -> int:
-        m = re.search(rf'{key}:\s*(\d+)', text)
-        return int(m.group(1)) if m else default
+        m = re.search(r'\d+', self._parse_response(text)[0].get(key, ''))
+        return int(m.group()) if m else default
 
     def _extract_line(self, text: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n|$)', text)
-        return m.group(1).strip()[:150] if m else "See full analysis"
+        v = self._parse_response(text)[0].get(key, '')
+        return v.splitlines()[0].strip()[:150] if v else "See full analysis"
 
     def _extract_questions(self, response: str) -> List[str]:
-        questions = re.findall(r'Q\d+:\s*(.+?)(?:\nSTAR:|$)', response, re.DOTALL)
-        return [f"Prep: {q.strip()[:120]}" for q in questions[:6]]
+        _, qa = self._parse_response(response)
+        return [f"Prep: {q[:120]}" for q, _star in qa[:6]]
 
     def _extract_closing(self, response: str) -> List[str]:
-        m = re.search(r'CLOSING_QUESTIONS:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
-        if m:
-            questions = [q.strip() for q in m.group(1).split(',') if q.strip()]
+        closing = self._parse_response(response)[0].get('CLOSING_QUESTIONS', '')
+        if closing:
+            questions = [q.strip() for q in closing.split(',') if q.strip()]
             return [f"Ask interviewer: {q}" for q in questions[:3]]
         return ["Ask interviewer: What does success look like in the first 90 days?"]
 
     def _format_qa_output(self, response: str) -> str:
-        sections = []
-        questions = re.findall(r'(Q\d+:\s*.+?STAR:\s*.+?)(?=Q\d+:|SALARY_TALK:|$)',
-                               response, re.DOTALL)
-        for q in questions[:6]:
-            sections.append(q.strip())
-        salary = re.search(r'SALARY_TALK:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
+        named, qa = self._parse_response(response)
+        sections = [
+            f"Q{i}: {q}\nSTAR: {star}" if star else f"Q{i}: {q}"
+            for i, (q, star) in enumerate(qa[:6], 1)
+        ]
+        salary = named.get('SALARY_TALK')
         if salary:
-            sections.append(f"\n💰 SALARY DISCUSSION:\n{salary.group(1).strip()}")
-        closing = re.search(r'CLOSING_QUESTIONS:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
+            sections.append(f"\n💰 SALARY DISCUSSION:\n{salary}")
+        closing = named.get('CLOSING_QUESTIONS')
         if closing:
-            sections.append(f"\n❓ SMART QUESTIONS TO ASK:\n{closing.group(1).strip()}")
+            sections.append(f"\n❓ SMART QUESTIONS TO ASK:\n{closing}")
         return '\n\n'.join(sections) if sections else response[:2000]
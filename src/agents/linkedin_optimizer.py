@@ -3,7 +3,6 @@ Agent 9: The LinkedIn Optimizer (NEW in v2)
 LinkedIn profile, SSI score, headline, recruiter search visibility.
 """
 import re
-import time
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -45,13 +44,41 @@ OPTIMIZED_HEADLINE: [Write the perfect LinkedIn headline: Title | Skill | Value
 OPTIMIZED_ABOUT: [First 300 chars of LinkedIn About section — this is what shows before "See more" — make it compelling, keyword-rich, first-person]"""
 
 
+# Compiled once at import — the profile-element table and URL check run
+# against the full CV every analyze call.
+_RE_LINKEDIN_URL = re.compile(r'linkedin\.com/in/', re.IGNORECASE)
+# Each element pairs a literal probe with an optional confirming regex.
+# Substring membership on the lowered CV rejects absent elements without
+# entering the regex engine; \b-bounded or formatted patterns only run
+# once their literal core is present. Elements whose pattern's only
+# metacharacter was '|' need no regex at all.
+_PROFILE_ELEMENTS = {
+    'photo': (('[photo]', 'photo available', 'professional photo'), None),
+    'location': (('cape town', 'johannesburg', 'durban', 'pretoria',
+                  'south africa', 'remote'), None),
+    'email': (('@',),
+              re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')),
+    'phone': (('+27', '+1', '+44'),
+              re.compile(r'(\+27|\+1|\+44)[\s\d\-\(\)]{8,}')),
+    'linkedin_url': (('linkedin.com/in/',), None),
+    'summary': (('summary', 'about', 'profile', 'objective'),
+                re.compile(r'\b(summary|about|profile|objective)\b', re.IGNORECASE)),
+    'skills_section': (('skills', 'competencies', 'expertise', 'technologies'),
+                       re.compile(r'\b(skills|competencies|expertise|technologies)\b', re.IGNORECASE)),
+    'education': (('education', 'degree', 'diploma', 'qualification'),
+                  re.compile(r'\b(education|degree|diploma|qualification)\b', re.IGNORECASE)),
+    'experience': (('experience', 'employment', 'career', 'work history'),
+                   re.compile(r'\b(experience|employment|career|work history)\b', re.IGNORECASE)),
+}
+
+
 class LinkedInOptimizer(BaseAgent):
     def __init__(self, llm=None):
         super().__init__("The LinkedIn Optimizer", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
-        has_linkedin = bool(re.search(r'linkedin\.com/in/', cv_text, re.IGNORECASE))
+        t0 = self._now()
+        has_linkedin = bool(_RE_LINKEDIN_URL.search(cv_text))
         headline = self._extract_headline(cv_text)
         profile_elements = self._check_profile_elements(cv_text)
         keyword_density = self._keyword_density(cv_text, job_description)
@@ -77,9 +104,8 @@ Pre-analysis:
 
 Optimise this CV content for LinkedIn visibility and recruiter discovery."""
 
-        llm_response, tokens = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+        llm_response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
         score = self._extract_int(llm_response, 'LINKEDIN_SCORE', 60)
-        elapsed = int((time.time() - t0) * 1000)
 
         # Extract both headline and about as combined optimized content
         opt_headline = self._extract_line(llm_response, 'OPTIMIZED_HEADLINE')
@@ -89,7 +115,6 @@ Optimise this CV content for LinkedIn visibility and recruiter discovery."""
         return AgentOutput(
             agent_name=self.name,
             score=score,
-            confidence=0.85 if self.llm else 0.65,
             findings=[
                 f"LinkedIn Optimisation Score: {score}/100",
                 f"Profile Completeness: {self._extract_line(llm_response, 'PROFILE_COMPLETENESS')}",
@@ -104,9 +129,8 @@ Optimise this CV content for LinkedIn visibility and recruiter discovery."""
             optimized_content=combined,
             raw_analysis=llm_response,
             weight=1.0,
-            tokens_used=tokens,
-            execution_ms=elapsed,
-            mode=self.mode,
+            execution_ms=self._ms_since(t0),
+            ai_powered=self.llm is not None,
         )
 
     def _extract_headline(self, text: str) -> str:
@@ -118,46 +142,20 @@ Optimise this CV content for LinkedIn visibility and recruiter discovery."""
         return ""
 
     def _check_profile_elements(self, text: str) -> Dict:
-        elements = {
-            'photo': r'\[photo\]|photo available|professional photo',
-            'location': r'cape town|johannesburg|durban|pretoria|south africa|remote',
-            'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-            'phone': r'(\+27|\+1|\+44)[\s\d\-\(\)]{8,}',
-            'linkedin_url': r'linkedin\.com/in/',
-            'summary': r'\b(summary|about|profile|objective)\b',
-            'skills_section': r'\b(skills|competencies|expertise|technologies)\b',
-            'education': r'\b(education|degree|diploma|qualification)\b',
-            'experience': r'\b(experience|employment|career|work history)\b',
-        }
-        present = [k for k, p in elements.items() if re.search(p, text, re.IGNORECASE)]
-        missing = [k for k in elements if k not in present]
+        tl = self._lower(text)
+        present = [k for k, (lits, p) in _PROFILE_ELEMENTS.items()
+                   if any(l in tl for l in lits) and (p is None or p.search(text))]
+        missing = [k for k in _PROFILE_ELEMENTS if k not in present]
         return {'present': present, 'missing': missing}
 
     def _keyword_density(self, cv: str, jd: str) -> int:
-        jd_words = set(re.findall(r'\b[A-Za-z]{4,}\b', jd.lower()))
-        cv_words = set(re.findall(r'\b[A-Za-z]{4,}\b', cv.lower()))
+        jd_words = self._token_set(self._lower(jd))
         if not jd_words: return 50
-        overlap = len(jd_words & cv_words)
+        overlap = len(jd_words & self._token_set(self._lower(cv)))
         return min(100, int(overlap / len(jd_words) * 100))
 
-    def _extract_int(self, text: str, key: str, default: int) -> int:
-        m = re.search(rf'{key}:\s*(\d+)', text)
-        return int(m.group(1)) if m else default
-
-    def _extract_line(self, text: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n|$)', text)
-        return m.group(1).strip()[:150] if m else "Not assessed"
-
-    def _extract_section(self, response: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
-        return m.group(1).strip() if m else ""
-
     def _extract_fixes(self, response: str, has_linkedin: bool, elements: Dict) -> List[str]:
-        fixes = []
-        m = re.search(r'FIXES:(.*?)(?:OPTIMIZED_HEADLINE:|$)', response, re.DOTALL)
-        if m:
-            fixes = [l.strip().lstrip('- ') for l in m.group(1).strip().split('\n')
-                     if l.strip() and l.strip() != '-'][:5]
+        fixes = self._extract_bullets(response)
         if not has_linkedin:
             fixes.insert(0, "Add LinkedIn URL to CV header — linkedin.com/in/yourname")
         for elem in elements['missing'][:3]:
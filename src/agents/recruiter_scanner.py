@@ -1,5 +1,6 @@
 """Agent 4: The 6-Second Scanner v2"""
-import re, time
+import functools
+import re
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -30,22 +31,62 @@ POWER_VERBS = ["spearheaded","delivered","transformed","exceeded","optimized","e
                "achieved","increased","decreased","saved","negotiated","established",
                "implemented","pioneered","accelerated","overhauled","revolutionized","secured"]
 
+# All killer phrases and power verbs fused into one lookahead alternation
+# so a single scan of the lowered CV replaces ~41 separate substring
+# sweeps. The zero-width lookahead keeps overlapping hits (e.g. "was
+# responsible" inside "was responsible for") that separate `in` checks
+# would each have found.
+_TERMS_RE = re.compile('(?=(' + '|'.join(
+    re.escape(t) for t in sorted(CV_KILLERS + POWER_VERBS, key=len, reverse=True)) + '))')
+
+
+@functools.lru_cache(maxsize=128)
+def _term_hits(cvl):
+    # Pure function of the lowered CV — cached so a re-run with a tweaked
+    # JD but unchanged CV skips the scan entirely.
+    return frozenset(_TERMS_RE.findall(cvl))
+
+# Compiled once at import — _count_metrics runs all seven against the
+# full CV on every analyze call.
+_METRIC_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\d+%', r'\$[\d,]+', r'£[\d,]+', r'R\s?[\d,]+', r'\d+x\b',
+    r'\d+\s*(million|billion|thousand|k)\b',
+    r'\d+\s*(people|staff|team|clients|users)'))
+_RE_DIGIT = re.compile(r'\d+')
+_RE_RECRUITER_SCORE = re.compile(r'RECRUITER_SCORE:\s*(\d+)')
+
+# Reading ease is a nice-to-have: resolve textstat once at import instead
+# of re-importing inside every analyze, and memoize the score — the
+# Flesch pass re-tokenizes the whole CV and the same document flows
+# through repeat runs unchanged.
+try:
+    import textstat as _textstat
+except ImportError:
+    _textstat = None
+
+
+@functools.lru_cache(maxsize=128)
+def _flesch_score(text):
+    return _textstat.flesch_reading_ease(text)
+
 
 class RecruiterScanner(BaseAgent):
     def __init__(self, llm=None):
         super().__init__("The 6-Second Scanner", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
-        killers = self._find_killers(cv_text)
-        verbs = self._count_power_verbs(cv_text)
+        t0 = self._now()
+        cvl = self._lower(cv_text)
+        hits = _term_hits(cvl)
+        killers = self._find_killers(hits)
+        verbs = self._count_power_verbs(hits)
         metrics = self._count_metrics(cv_text)
         reading_ease = self._reading_ease(cv_text)
-        opening = self._score_opening(cv_text)
+        opening = self._score_opening(cvl)
 
         user_prompt = f"""CV (first 2500 chars = what recruiter sees first):\n{cv_text[:2500]}\n\nRest:\n{cv_text[2500:5000]}\n\nJD:\n{job_description[:1500]}\n\nPre-analysis:\n- CV killers: {', '.join(killers) if killers else 'None'}\n- Power verbs: {verbs}\n- Metrics: {metrics}\n- Reading ease: {reading_ease}\n- Opening impact: {opening}"""
 
-        llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+        llm_response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
         score = self._calc_score(llm_response, killers, metrics, verbs)
 
         return AgentOutput(
@@ -63,42 +104,38 @@ class RecruiterScanner(BaseAgent):
             recommendations=self._extract_fixes(llm_response, killers),
             optimized_content=self._extract_section(llm_response, 'IMPROVED_BULLET'),
             raw_analysis=llm_response, weight=1.3,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
-    def _find_killers(self, t):
-        tl=t.lower(); return [k for k in CV_KILLERS if k in tl]
-    def _count_power_verbs(self, t):
-        tl=t.lower(); return sum(1 for v in POWER_VERBS if v in tl)
+    def _find_killers(self, hits):
+        return [k for k in CV_KILLERS if k in hits]
+    def _count_power_verbs(self, hits):
+        return sum(1 for v in POWER_VERBS if v in hits)
     def _count_metrics(self, t):
-        patterns=[r'\d+%',r'\$[\d,]+',r'£[\d,]+',r'R\s?[\d,]+',r'\d+x\b',r'\d+\s*(million|billion|thousand|k)\b',r'\d+\s*(people|staff|team|clients|users)']
-        return sum(len(re.findall(p,t,re.IGNORECASE)) for p in patterns)
-    def _score_opening(self, t):
-        first=t[:500].lower()
+        # Every metric pattern starts with a digit — one digit probe
+        # skips all seven findall passes on number-free text.
+        if not _RE_DIGIT.search(t): return 0
+        return sum(len(p.findall(t)) for p in _METRIC_RES)
+    def _score_opening(self, cvl):
+        first=cvl[:500]
         if any(v in first for v in POWER_VERBS[:10]): return "STRONG — power verb in opening"
-        if re.search(r'\d+', first): return "MODERATE — numbers visible early"
+        if _RE_DIGIT.search(first): return "MODERATE — numbers visible early"
         return "WEAK — no hooks in first 500 chars"
     def _reading_ease(self, t):
+        if _textstat is None: return "Not calculated"
         try:
-            import textstat; s=textstat.flesch_reading_ease(t)
+            s=_flesch_score(t)
             if s>70: return f"{s:.0f} — Easy ✓"
             if s>50: return f"{s:.0f} — Moderate"
             return f"{s:.0f} — Complex (simplify)"
-        except: return "Not calculated"
+        except Exception: return "Not calculated"
     def _calc_score(self, r, killers, metrics, verbs):
-        m=re.search(r'RECRUITER_SCORE:\s*(\d+)',r)
+        m=_RE_RECRUITER_SCORE.search(r)
         if m: return int(m.group(1))
         s=55; s-=len(killers)*8; s+=min(25,metrics*3); s+=min(15,verbs*2)
         return max(10,min(100,s))
-    def _extract_int(self, t, k, d):
-        m=re.search(rf'{k}:\s*(\d+)',t); return int(m.group(1)) if m else d
-    def _extract_line(self, t, k):
-        m=re.search(rf'{k}:\s*(.+?)(?:\n|$)',t); return m.group(1).strip()[:100] if m else "N/A"
     def _extract_fixes(self, r, killers):
-        fixes=[]
-        m=re.search(r'FIXES:(.*?)(?:IMPROVED_BULLET:|$)',r,re.DOTALL)
-        if m: fixes=[l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:5]
-        for k in killers[:3]: fixes.insert(0,f'Replace "{k}" with power verb + quantified result')
+        fixes=self._extract_bullets(r)
+        prepend=[f'Replace "{k}" with power verb + quantified result' for k in killers[:3]]
+        fixes=prepend+fixes
         return fixes[:8] if fixes else ["Add metrics to every role (%, ZAR, time, team size)"]
-    def _extract_section(self, r, k):
-        m=re.search(rf'{k}:\s*(.+?)(?:\n[A-Z_]+:|$)',r,re.DOTALL); return m.group(1).strip() if m else ""
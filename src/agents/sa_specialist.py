@@ -2,8 +2,8 @@
 Agent 2: The South African Specialist v2
 Enhanced: B-BBEE scorecard, EE Act compliance, SETA alignment, PNet/Careers24 optimization.
 """
+import functools
 import re
-import time
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -65,11 +65,13 @@ class SASpecialist(BaseAgent):
         super().__init__("The South African Specialist", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
-        nqf = self._detect_nqf(cv_text)
-        sa_coverage = self._sa_keyword_coverage(cv_text)
-        bbee = self._detect_bbee(cv_text)
-        critical = self._detect_critical_skills(cv_text)
+        t0 = self._now()
+        cvl = self._lower(cv_text)
+        hits = _sa_term_hits(cvl)
+        nqf = self._detect_nqf(cvl)
+        sa_coverage = self._sa_keyword_coverage(hits)
+        bbee = self._detect_bbee(hits)
+        critical = self._detect_critical_skills(hits)
 
         user_prompt = f"""CV TEXT:
 {cv_text[:4000]}
@@ -91,7 +93,7 @@ Pre-analysis:
 
 Provide full SA market optimization with specific PNet/Careers24 strategy."""
 
-        llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+        llm_response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
         score = self._extract_int(llm_response, 'SA_SCORE', 60)
 
         return AgentOutput(
@@ -110,56 +112,62 @@ Provide full SA market optimization with specific PNet/Careers24 strategy."""
             optimized_content=self._extract_section(llm_response, 'SA_SUMMARY'),
             raw_analysis=llm_response,
             weight=1.4,
-            execution_ms=int((time.time() - t0) * 1000),
+            execution_ms=self._ms_since(t0),
             ai_powered=self.llm is not None,
         )
 
     def _detect_nqf(self, text: str) -> Dict:
-        t = text.lower()
-        for level, keywords, desc in self.NQF_MAP:
-            if any(k in t for k in keywords):
+        for level, desc, pattern in _NQF_RES:
+            if pattern.search(text):
                 return {"level": level, "description": f"{desc} — NQF Level {level}"}
         return {"level": "Unknown", "description": "Qualification not clearly stated"}
 
-    def _sa_keyword_coverage(self, text: str) -> int:
-        t = text.upper()
-        found = sum(1 for kw in self.SA_KEYWORDS if kw.upper() in t)
+    def _sa_keyword_coverage(self, hits) -> int:
+        found = sum(1 for kw in self.SA_KEYWORDS if kw.lower() in hits)
         return int((found / len(self.SA_KEYWORDS)) * 100)
 
-    def _detect_bbee(self, text: str) -> str:
-        t = text.lower()
-        found = [k for k in self.BBEE_INDICATORS if k in t]
+    def _detect_bbee(self, hits) -> str:
+        found = [k for k in self.BBEE_INDICATORS if k in hits]
         if found:
             return f"Potential EE candidate indicators: {', '.join(found[:3])}"
         return "No explicit B-BBEE indicators — consider strategic disclosure"
 
-    def _detect_critical_skills(self, text: str) -> str:
-        t = text.lower()
-        matches = [s for s in self.CRITICAL_SKILLS if s in t]
+    def _detect_critical_skills(self, hits) -> str:
+        matches = [s for s in self.CRITICAL_SKILLS if s in hits]
         if matches:
             return f"QUALIFIES — {', '.join(matches[:2])}"
         return "Does not appear to match Critical Skills Visa list"
 
-    def _extract_int(self, text: str, key: str, default: int) -> int:
-        m = re.search(rf'{key}:\s*(\d+)', text)
-        return int(m.group(1)) if m else default
-
-    def _extract_line(self, text: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n[A-Z_]+:|$)', text, re.DOTALL)
-        return m.group(1).strip()[:120] if m else "See full analysis"
-
     def _extract_fixes(self, response: str) -> List[str]:
-        m = re.search(r'FIXES:(.*?)(?:SA_SUMMARY:|$)', response, re.DOTALL)
-        if m:
-            return [l.strip().lstrip('- ') for l in m.group(1).strip().split('\n')
-                    if l.strip() and l.strip() != '-'][:6]
-        return [
+        fixes = self._extract_bullets(response, limit=6)
+        return fixes or [
             "Add NQF level explicitly after each qualification",
             "Include B-BBEE status if applicable — major differentiator",
             "Add SETA registration if relevant to your field",
             "Optimise for PNet keyword search by including SA industry terms",
         ]
 
-    def _extract_section(self, response: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
-        return m.group(1).strip() if m else ""
+
+# One lookahead alternation over every tracked SA term — coverage, B-BBEE
+# and Critical Skills detection all read from a single scan of the
+# lowered CV instead of ~60 separate substring sweeps. Built after the
+# class body because the term lists live on the class.
+# NQF detection keeps one alternation per level rather than a single
+# global pattern: the map is ordered highest-qualification-first and a
+# combined regex would return the first hit by text position, not the
+# highest level. Seven searches still beat ~40 substring sweeps.
+# IGNORECASE so _detect_nqf takes text as-is, not pre-lowered.
+_NQF_RES = [(lvl, desc, re.compile('|'.join(map(re.escape, kws)), re.IGNORECASE))
+            for lvl, kws, desc in SASpecialist.NQF_MAP]
+_SA_TERMS_RE = re.compile('(?=(' + '|'.join(
+    re.escape(t) for t in sorted(
+        {k.lower() for k in SASpecialist.SA_KEYWORDS}
+        | set(SASpecialist.BBEE_INDICATORS)
+        | set(SASpecialist.CRITICAL_SKILLS),
+        key=len, reverse=True)) + '))')
+
+
+@functools.lru_cache(maxsize=128)
+def _sa_term_hits(cvl):
+    # Pure function of the lowered CV — cached across JD-only re-runs.
+    return frozenset(_SA_TERMS_RE.findall(cvl))
@@ -2,8 +2,8 @@
 Agent 11 (NEW): The Salary Intelligence Agent
 Market rate analysis, negotiation strategy, SA + international benchmarks.
 """
+import functools
 import re
-import time
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -51,11 +51,27 @@ SA_SALARY_BENCHMARKS = {
     'senior': {'min': 700000, 'mid': 1100000, 'max': 1600000},
     'executive': {'min': 1500000, 'mid': 2500000, 'max': 5000000},
 }
+# Compiled once at import — scanned over the full CV per analyze call.
+_RE_METRICS = re.compile(r'\d+%|\$[\d,]+|R\s?[\d,]+|saved|reduced|increased|grew', re.IGNORECASE)
+
 INDUSTRY_PREMIUMS = {
     'fintech': 35, 'finance': 25, 'banking': 25, 'tech': 30,
     'mining': 20, 'engineering': 15, 'healthcare': 10,
     'retail': -10, 'ngo': -20, 'government': -15,
 }
+TECH_TERMS = ['python', 'aws', 'kubernetes', 'ml', 'ai ', 'data science', 'cloud']
+SCARCE_SKILLS = ['actuari', 'blockchain', 'quantum', 'llm', 'genai', 'kubernetes',
+                 'devsecops', 'ml engineer', 'data science', 'cybersecur']
+# Premium and scarcity detection share one lookahead-alternation scan of
+# the lowered CV instead of 17 separate substring sweeps.
+_CV_TERMS_RE = re.compile('(?=(' + '|'.join(
+    re.escape(t) for t in sorted(set(TECH_TERMS + SCARCE_SKILLS), key=len, reverse=True)) + '))')
+
+
+@functools.lru_cache(maxsize=128)
+def _cv_term_hits(cvl):
+    # Pure function of the lowered CV — cached across JD-only re-runs.
+    return frozenset(_CV_TERMS_RE.findall(cvl))
 
 
 class SalaryIntelligence(BaseAgent):
@@ -63,11 +79,12 @@ class SalaryIntelligence(BaseAgent):
         super().__init__("The Salary Intelligence Agent", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0 = time.time()
+        t0 = self._now()
         base = self._calc_base_salary(context)
-        premium = self._calc_premium(cv_text, context)
+        hits = _cv_term_hits(self._lower(cv_text))
+        premium = self._calc_premium(hits, context)
         has_metrics = self._has_strong_metrics(cv_text)
-        scarcity = self._skill_scarcity(cv_text, job_description)
+        scarcity = self._skill_scarcity(hits)
 
         user_prompt = f"""CV TEXT:
 {cv_text[:4000]}
@@ -90,20 +107,19 @@ Pre-analysis:
 Generate precise salary intelligence and negotiation strategy for this specific CV and role.
 Provide realistic, market-accurate figures for the South African context."""
 
-        llm_response = self._get_llm_response(SYSTEM_PROMPT, user_prompt)
+        llm_response = await self._get_llm_response_async(SYSTEM_PROMPT, user_prompt)
         score = self._extract_int(llm_response, 'SALARY_SCORE', 65)
 
-        adjusted_min = int(base['min'] * (1 + premium / 100))
-        adjusted_mid = int(base['mid'] * (1 + premium / 100))
-        adjusted_max = int(base['max'] * (1 + premium / 100))
+        # Pure integer math — no float round-trip per band figure.
+        adjusted = {k: (v * (100 + premium)) // 100 for k, v in base.items()}
 
         return AgentOutput(
             agent_name=self.name,
             score=score,
             findings=[
                 f"Salary Negotiation Power: {score}/100",
-                f"SA Market Rate (estimated): R{adjusted_min:,} – R{adjusted_max:,} CTC",
-                f"Market Mid-Point: R{adjusted_mid:,} CTC per annum",
+                f"SA Market Rate (estimated): R{adjusted['min']:,} – R{adjusted['max']:,} CTC",
+                f"Market Mid-Point: R{adjusted['mid']:,} CTC per annum",
                 f"Industry Premium: +{premium}% ({context.get('industry', 'General')})",
                 f"Metrics Strength: {has_metrics}",
                 f"Skill Scarcity: {scarcity}",
@@ -113,7 +129,7 @@ Provide realistic, market-accurate figures for the South African context."""
             optimized_content=self._extract_section(llm_response, 'NEGOTIATION_SCRIPT'),
             raw_analysis=llm_response,
             weight=0.8,
-            execution_ms=int((time.time() - t0) * 1000),
+            execution_ms=self._ms_since(t0),
             ai_powered=self.llm is not None,
         )
 
@@ -124,50 +140,32 @@ Provide realistic, market-accurate figures for the South African context."""
         if 'exec' in level: return SA_SALARY_BENCHMARKS['executive']
         return SA_SALARY_BENCHMARKS['mid']
 
-    def _calc_premium(self, cv: str, context: Dict) -> int:
+    def _calc_premium(self, hits, context: Dict) -> int:
         industry = context.get('industry', '').lower()
         for key, pct in INDUSTRY_PREMIUMS.items():
             if key in industry:
                 return pct
-        tech_terms = ['python', 'aws', 'kubernetes', 'ml', 'ai ', 'data science', 'cloud']
-        if sum(1 for t in tech_terms if t in cv.lower()) >= 3:
+        if sum(1 for t in TECH_TERMS if t in hits) >= 3:
             return 25
         return 0
 
     def _has_strong_metrics(self, cv: str) -> str:
-        count = len(re.findall(r'\d+%|\$[\d,]+|R\s?[\d,]+|saved|reduced|increased|grew', cv, re.IGNORECASE))
+        count = len(_RE_METRICS.findall(cv))
         if count >= 8: return f"Excellent ({count} quantified achievements)"
         if count >= 4: return f"Good ({count} quantified achievements)"
         if count >= 1: return f"Weak ({count} — add more metrics)"
         return "None — major negotiation weakness"
 
-    def _skill_scarcity(self, cv: str, jd: str) -> str:
-        scarce = ['actuari', 'blockchain', 'quantum', 'llm', 'genai', 'kubernetes',
-                  'devsecops', 'ml engineer', 'data science', 'cybersecur']
-        matches = [s for s in scarce if s in cv.lower()]
+    def _skill_scarcity(self, hits) -> str:
+        matches = [s for s in SCARCE_SKILLS if s in hits]
         if matches:
             return f"High demand skills: {', '.join(matches[:3])} — strong leverage"
         return "Standard skill profile — differentiate on achievements"
 
-    def _extract_int(self, text: str, key: str, default: int) -> int:
-        m = re.search(rf'{key}:\s*(\d+)', text)
-        return int(m.group(1)) if m else default
-
-    def _extract_line(self, text: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n[A-Z_]+:|$)', text, re.DOTALL)
-        return m.group(1).strip()[:150] if m else "See analysis"
-
     def _extract_fixes(self, response: str) -> List[str]:
-        m = re.search(r'FIXES:(.*?)(?:SALARY_SUMMARY:|$)', response, re.DOTALL)
-        if m:
-            return [l.strip().lstrip('- ') for l in m.group(1).strip().split('\n')
-                    if l.strip() and l.strip() != '-'][:5]
-        return [
+        fixes = self._extract_bullets(response)
+        return fixes or [
             "Add more quantified achievements — each metric = +5-10% negotiating power",
             "Include LinkedIn profile with recommendations — validates market value",
             "Research the company's remuneration strategy (annual report, Glassdoor SA)",
         ]
-
-    def _extract_section(self, response: str, key: str) -> str:
-        m = re.search(rf'{key}:\s*(.+?)(?:\n[A-Z_]+:|$)', response, re.DOTALL)
-        return m.group(1).strip() if m else ""
@@ -1,5 +1,8 @@
 """Agent 6: Semantic Matcher v2"""
-import re, time
+import functools
+import math
+import re
+from collections import Counter
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentOutput
 
@@ -32,12 +35,66 @@ SKILL_ONTOLOGY = {
 }
 
 
+# Cosine similarity computed directly over L2-normalized unigram+bigram
+# counts. The old path fitted a fresh sklearn TfidfVectorizer on just the
+# two documents per call — the vocabulary build dominated the runtime and
+# IDF over a 2-document corpus is close to constant, so the TF cosine
+# carries the same signal. Vectors cache per document slice, so a JD-only
+# re-run reuses the CV's.
+_TOKEN_RE = re.compile(r'\b\w\w+\b')
+_STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the '
+    'this to was were will with you your'.split())
+
+_TONE_WORDS = {
+    'Startup': ['disrupt','scale','startup','agile','iterate','pivot','lean','mvp'],
+    'Corporate': ['stakeholder','governance','compliance','enterprise','policy','strategy','c-suite'],
+    'Government': ['public sector','government','municipality','department','regulation','audit','tender'],
+}
+# Ontology synonyms, concepts and tone words fused into one lookahead
+# alternation — hidden-match and tone detection share a single scan per
+# document instead of ~75 substring sweeps. Hits cache per lowered text
+# like the other agents' term scans.
+_SEM_TERMS_RE = re.compile('(?=(' + '|'.join(
+    re.escape(t) for t in sorted(
+        {s for syns in SKILL_ONTOLOGY.values() for s in syns}
+        | set(SKILL_ONTOLOGY)
+        | {w for ws in _TONE_WORDS.values() for w in ws},
+        key=len, reverse=True)) + '))')
+
+
+@functools.lru_cache(maxsize=128)
+def _sem_hits(lowered):
+    return frozenset(_SEM_TERMS_RE.findall(lowered))
+
+
+@functools.lru_cache(maxsize=128)
+def _tf_vector(text):
+    toks = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS]
+    counts = Counter(toks)
+    counts.update(zip(toks, toks[1:]))
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return counts, norm
+
+
+@functools.lru_cache(maxsize=256)
+def _cosine(a_text, b_text):
+    # The scalar is memoized on top of the per-document vectors so a
+    # repeat of the same CV/JD pair skips even the dot product.
+    a, na = _tf_vector(a_text)
+    b, nb = _tf_vector(b_text)
+    if len(b) < len(a):
+        a, b = b, a
+    dot = sum(c * b[t] for t, c in a.items() if t in b)
+    return dot / (na * nb)
+
+
 class SemanticMatcher(BaseAgent):
     def __init__(self, llm=None):
         super().__init__("The Semantic Matcher", llm)
 
     async def analyze(self, cv_text: str, job_description: str, context: Dict) -> AgentOutput:
-        t0=time.time()
+        t0=self._now()
         cosine=self._cosine_similarity(cv_text,job_description)
         hidden=self._find_hidden_matches(cv_text,job_description)
         tone=self._tone_analysis(cv_text,job_description)
@@ -60,40 +117,26 @@ class SemanticMatcher(BaseAgent):
             recommendations=self._extract_fixes(llm_response),
             optimized_content=self._extract_section(llm_response,'SEMANTIC_BRIDGE'),
             raw_analysis=llm_response, weight=1.1,
-            execution_ms=int((time.time()-t0)*1000), ai_powered=self.llm is not None,
+            execution_ms=self._ms_since(t0), ai_powered=self.llm is not None,
         )
 
     def _cosine_similarity(self, cv, jd):
-        try:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
-            vec=TfidfVectorizer(stop_words='english',max_features=600,ngram_range=(1,2))
-            mat=vec.fit_transform([cv[:6000],jd[:6000]])
-            return float(cosine_similarity(mat[0:1],mat[1:2])[0][0])
-        except: return 0.5
+        return _cosine(cv[:6000], jd[:6000])
     def _find_hidden_matches(self, cv, jd):
-        cvl,jdl=cv.lower(),jd.lower()
+        cv_hits,jd_hits=_sem_hits(self._lower(cv)),_sem_hits(self._lower(jd))
         matches=[]
         for concept,syns in SKILL_ONTOLOGY.items():
-            jd_needs=any(s in jdl for s in syns+[concept])
-            cv_has=any(s in cvl for s in syns)
-            if jd_needs and cv_has and concept not in cvl:
-                syn=next((s for s in syns if s in cvl),None)
+            jd_needs=concept in jd_hits or any(s in jd_hits for s in syns)
+            if jd_needs and concept not in cv_hits:
+                syn=next((s for s in syns if s in cv_hits),None)
                 if syn: matches.append(f"{syn}→{concept}")
         return ', '.join(matches[:5]) if matches else 'None'
     def _tone_analysis(self, cv, jd):
-        startup=['disrupt','scale','startup','agile','iterate','pivot','lean','mvp']
-        corp=['stakeholder','governance','compliance','enterprise','policy','strategy','C-suite']
-        govt=['public sector','government','municipality','department','regulation','audit','tender']
-        jdl,cvl=jd.lower(),cv.lower()
-        sc={(t,(sum(1 for w in ws if w in jdl),sum(1 for w in ws if w in cvl))) for t,ws in [('Startup',startup),('Corporate',corp),('Government',govt)]}
+        jd_hits,cv_hits=_sem_hits(self._lower(jd)),_sem_hits(self._lower(cv))
+        sc={(t,(sum(1 for w in ws if w in jd_hits),sum(1 for w in ws if w in cv_hits))) for t,ws in _TONE_WORDS.items()}
         dom=max(sc,key=lambda x:x[1][0])
         jdn,cvn=dom[1]; pct=min(100,int((cvn/max(jdn,1))*100))
         return f"{dom[0]} — {pct}% aligned"
-    def _extract_int(self, t, k, d): m=re.search(rf'{k}:\s*(\d+)',t); return int(m.group(1)) if m else d
-    def _extract_line(self, t, k): m=re.search(rf'{k}:\s*(.+?)(?:\n|$)',t); return m.group(1).strip()[:100] if m else "N/A"
     def _extract_fixes(self, r):
-        m=re.search(r'FIXES:(.*?)(?:SEMANTIC_BRIDGE:|$)',r,re.DOTALL)
-        if m: return [l.strip().lstrip('- ') for l in m.group(1).strip().split('\n') if l.strip() and l.strip()!='-'][:6]
-        return ["Mirror JD language more closely in your experience descriptions"]
-    def _extract_section(self, r, k): m=re.search(rf'{k}:\s*(.+?)(?:\n[A-Z_]+:|$)',r,re.DOTALL); return m.group(1).strip() if m else ""
+        fixes=self._extract_bullets(r, limit=6)
+        return fixes or ["Mirror JD language more closely in your experience descriptions"]
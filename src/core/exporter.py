@@ -1,75 +1,127 @@
 """
-ATS-GOD v2.0 Exporter
+Karoo v2.0 Exporter
 Generates TXT, DOCX, and PDF reports. Enhanced formatting.
 """
+import functools
 import io
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+_SEP = "=" * 68
+_THIN = "-" * 68
+# Only eleven possible score bars and four ratings — build them once
+# instead of re-concatenating per agent row.
+_BARS = ["█" * i + "░" * (10 - i) for i in range(11)]
+_RATINGS = ((85, "EXCELLENT ✓✓"), (75, "STRONG ✓"), (60, "ADEQUATE ~"), (0, "NEEDS WORK !"))
+
+_ICONS = {
+    "algorithm_breaker": "🎯", "sa_specialist": "🇿🇦", "global_setter": "🌍",
+    "recruiter_scanner": "👁️ ", "hiring_manager": "💼", "semantic_matcher": "📊",
+    "compliance_guardian": "⚖️ ", "future_architect": "🚀",
+    "interview_coach": "🎤", "salary_intelligence": "💰",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _title(name: str) -> str:
+    return name.replace("_", " ").title()
+
+
+def _rating(score: int) -> str:
+    for threshold, label in _RATINGS:
+        if score >= threshold:
+            return label
+    return _RATINGS[-1][1]
+
 
 def export_to_txt(results: Dict[str, Any]) -> str:
     summary = results.get("summary", {})
     score = summary.get("overall_score", 0)
-    sep = "=" * 68
-    thin = "-" * 68
-
-    icons = {
-        "algorithm_breaker": "🎯", "sa_specialist": "🇿🇦", "global_setter": "🌍",
-        "recruiter_scanner": "👁️ ", "hiring_manager": "💼", "semantic_matcher": "📊",
-        "compliance_guardian": "⚖️ ", "future_architect": "🚀",
-        "interview_coach": "🎤", "salary_intelligence": "💰",
-    }
-
-    lines = [
-        sep,
-        "  ATS-GOD v2.0 — OPTIMIZATION REPORT",
-        f"  Generated: {datetime.now().strftime('%d %B %Y, %H:%M')}",
-        f"  AI Provider: {results.get('llm_provider','Rule-Based')} — {results.get('llm_model','N/A')}",
-        f"  AI-Powered Agents: {summary.get('ai_powered_count', 0)}/10",
-        sep, "",
-        f"  OVERALL SCORE:           {score}/100",
-        f"  INTERVIEW PROBABILITY:   {summary.get('interview_probability',0)}%",
-        f"  RECOMMENDED VARIANT:     {summary.get('recommended_variant','BALANCED')}",
-        f"  VERDICT:                 {summary.get('verdict','')}",
-        f"  STRONGEST AREA:          {summary.get('strongest_area','').replace('_',' ').title()}",
-        f"  WEAKEST AREA:            {summary.get('weakest_area','').replace('_',' ').title()}",
-        "", sep, "  AGENT SCORES", sep,
-    ]
+
+    # One growing buffer instead of a list of ~200 fragments plus a
+    # final join pass.
+    out = io.StringIO()
+    write = out.write
+
+    write(f"""{_SEP}
+  Karoo v2.0 — OPTIMIZATION REPORT
+  Generated: {datetime.now().strftime('%d %B %Y, %H:%M')}
+  AI Provider: {results.get('llm_provider','Rule-Based')} — {results.get('llm_model','N/A')}
+  AI-Powered Agents: {summary.get('ai_powered_count', 0)}/10
+{_SEP}
+
+  OVERALL SCORE:           {score}/100
+  INTERVIEW PROBABILITY:   {summary.get('interview_probability',0)}%
+  RECOMMENDED VARIANT:     {summary.get('recommended_variant','BALANCED')}
+  VERDICT:                 {summary.get('verdict','')}
+  STRONGEST AREA:          {_title(summary.get('strongest_area',''))}
+  WEAKEST AREA:            {_title(summary.get('weakest_area',''))}
+
+{_SEP}
+  AGENT SCORES
+{_SEP}
+""")
 
     for name, s in summary.get('agent_scores', {}).items():
-        rating = "EXCELLENT ✓✓" if s>=85 else "STRONG ✓" if s>=75 else "ADEQUATE ~" if s>=60 else "NEEDS WORK !"
-        bar = "█"*(s//10) + "░"*(10-s//10)
-        icon = icons.get(name, "• ")
-        lines.append(f"  {icon} {name.replace('_',' ').title():<32} {s:>3}/100  [{bar}]  {rating}")
+        icon = _ICONS.get(name, "• ")
+        write(f"  {icon} {_title(name):<32} {s:>3}/100  [{_BARS[s//10]}]  {_rating(s)}\n")
 
-    lines += ["", sep, "  PRIORITY ACTION ITEMS", sep, ""]
+    write(f"\n{_SEP}\n  PRIORITY ACTION ITEMS\n{_SEP}\n\n")
     for i, item in enumerate(results.get('action_items', [])[:18], 1):
         priority = "🔴 CRITICAL" if i<=4 else "🟡 IMPORTANT" if i<=9 else "🟢 HELPFUL"
-        lines.append(f"  {i:>2}. [{priority}] {item}")
+        write(f"  {i:>2}. [{priority}] {item}\n")
 
     for vk, vl in [("balanced","BALANCED ⭐"),("ats_max","ATS-MAX"),("creative","CREATIVE")]:
         content = results.get('cv_variants', {}).get(vk, '')
         if content:
-            lines += ["", sep, f"  CV VARIANT: {vl}", sep, "", content]
+            write(f"\n{_SEP}\n  CV VARIANT: {vl}\n{_SEP}\n\n{content}\n")
 
     cl = results.get('cover_letter', '')
     if cl:
-        lines += ["", sep, "  COVER LETTER", sep, "", cl]
+        write(f"\n{_SEP}\n  COVER LETTER\n{_SEP}\n\n{cl}\n")
 
-    lines += ["", sep, "  DETAILED AGENT REPORTS", sep]
+    write(f"\n{_SEP}\n  DETAILED AGENT REPORTS\n{_SEP}\n")
     for name, data in results.get('agent_results', {}).items():
-        lines += ["", f"  {thin}", f"  {name.replace('_',' ').upper()} — {data.get('score',0)}/100", f"  {thin}"]
-        lines.append("  Findings:")
-        for f in data.get('findings', []): lines.append(f"    • {f}")
-        lines.append("  Recommendations:")
-        for r in data.get('recommendations', []): lines.append(f"    → {r}")
+        write(f"\n  {_THIN}\n  {name.replace('_',' ').upper()} — {data.get('score',0)}/100\n  {_THIN}\n")
+        write("  Findings:\n")
+        for f in data.get('findings', []): write(f"    • {f}\n")
+        write("  Recommendations:\n")
+        for r in data.get('recommendations', []): write(f"    → {r}\n")
         if data.get('optimized_content'):
-            lines += ["  AI-Generated Improvement:", f"  {data['optimized_content'][:500]}"]
+            write(f"  AI-Generated Improvement:\n  {data['optimized_content'][:500]}\n")
+
+    return out.getvalue()
 
-    return '\n'.join(lines)
 
+def _plain_writer(doc):
+    """Per-line appender for unstyled body paragraphs.
 
-def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Optional[bytes]:
+    doc.add_paragraph routes every line through the style machinery and
+    builds proxy objects per call; the CV variant and detailed reports
+    emit hundreds of plain lines, so build the <w:p><w:r><w:t> elements
+    directly and splice them in ahead of the section properties.
+    """
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    body = doc.element.body
+    sect = body.find(qn('w:sectPr'))
+    insert = body.append if sect is None else sect.addprevious
+    xml_space = qn('xml:space')
+
+    def write(text: str) -> None:
+        p = OxmlElement('w:p')
+        r = OxmlElement('w:r')
+        t = OxmlElement('w:t')
+        t.set(xml_space, 'preserve')
+        t.text = text
+        r.append(t)
+        p.append(r)
+        insert(p)
+
+    return write
+
+
+def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Optional[io.BytesIO]:
     try:
         from docx import Document
         from docx.shared import Pt, RGBColor, Inches, Cm
@@ -78,6 +130,7 @@ def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Option
         from docx.oxml import OxmlElement
 
         doc = Document()
+        plain = _plain_writer(doc)
 
         # Page margins
         for section in doc.sections:
@@ -119,7 +172,7 @@ def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Option
         doc.add_heading('Agent Scores', level=1)
         for agent, s in summary.get('agent_scores', {}).items():
             p = doc.add_paragraph()
-            label = agent.replace('_', ' ').title()
+            label = _title(agent)
             bar = "█" * (s // 10) + "░" * (10 - s // 10)
             r = p.add_run(f"{label:<35} {s:>3}/100  [{bar}]")
             if s >= 80: r.font.color.rgb = RGBColor(0x2E, 0x7D, 0x32)
@@ -140,11 +193,14 @@ def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Option
             doc.add_page_break()
             doc.add_heading(f'CV Variant: {variant.upper().replace("_","-")}', level=1)
             for line in cv_content.split('\n'):
-                if line.strip():
+                if not line.strip():
+                    continue
+                if line.startswith(('═', '╔', '║')):
                     p = doc.add_paragraph(line)
-                    if line.startswith('═') or line.startswith('╔') or line.startswith('║'):
-                        p.runs[0].bold = True
-                        p.runs[0].font.color.rgb = RGBColor(0x15, 0x65, 0xC0)
+                    p.runs[0].bold = True
+                    p.runs[0].font.color.rgb = RGBColor(0x15, 0x65, 0xC0)
+                else:
+                    plain(line)
 
         # Cover letter
         cl = results.get('cover_letter', '')
@@ -153,7 +209,7 @@ def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Option
             doc.add_heading('Cover Letter', level=1)
             for para in cl.split('\n\n'):
                 if para.strip():
-                    doc.add_paragraph(para.strip())
+                    plain(para.strip())
 
         # Interview Q&A
         interview = results.get('agent_results', {}).get('interview_coach', {})
@@ -167,29 +223,31 @@ def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Option
         if salary.get('findings'):
             doc.add_heading('Salary Intelligence', level=1)
             for f in salary.get('findings', []):
-                doc.add_paragraph(f"• {f}")
+                plain(f"• {f}")
             if salary.get('optimized_content'):
-                doc.add_paragraph("Negotiation Script:")
-                doc.add_paragraph(salary['optimized_content'])
+                plain("Negotiation Script:")
+                plain(salary['optimized_content'])
 
         # Full agent reports
         doc.add_page_break()
         doc.add_heading('Detailed Agent Reports', level=1)
         for name, data in results.get('agent_results', {}).items():
-            doc.add_heading(f"{name.replace('_',' ').title()} — {data.get('score',0)}/100", level=2)
+            doc.add_heading(f"{_title(name)} — {data.get('score',0)}/100", level=2)
             for f in data.get('findings', []):
-                doc.add_paragraph(f"• {f}")
-            doc.add_paragraph("Recommendations:")
+                plain(f"• {f}")
+            plain("Recommendations:")
             for r_item in data.get('recommendations', []):
-                doc.add_paragraph(f"→ {r_item}")
+                plain(f"→ {r_item}")
             if data.get('optimized_content'):
-                doc.add_paragraph("AI Improvement:")
-                doc.add_paragraph(data['optimized_content'][:500])
+                plain("AI Improvement:")
+                plain(data['optimized_content'][:500])
 
         buf = io.BytesIO()
         doc.save(buf)
         buf.seek(0)
-        return buf.getvalue()
+        # Hand the buffer itself to the caller — getvalue() would copy
+        # the whole serialized document a second time.
+        return buf
 
     except ImportError:
         return None
@@ -198,27 +256,38 @@ def export_to_docx(results: Dict[str, Any], variant: str = "balanced") -> Option
         return None
 
 
-def export_to_pdf(results: Dict[str, Any]) -> Optional[bytes]:
+@functools.lru_cache(maxsize=1)
+def _pdf_styles():
+    """Stateless ParagraphStyle objects shared by every export.
+
+    getSampleStyleSheet rebuilds the whole stylesheet tree per call;
+    one cached tuple covers all reports. Lazy because reportlab stays
+    an optional import.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('Title', parent=styles['Title'],
+                                 textColor=colors.HexColor('#1565C0'), fontSize=20)
+    h1_style = ParagraphStyle('H1', parent=styles['Heading1'],
+                              textColor=colors.HexColor('#1565C0'), fontSize=14)
+    return title_style, h1_style, styles['BodyText']
+
+
+def export_to_pdf(results: Dict[str, Any]) -> Optional[io.BytesIO]:
     """Export as PDF using reportlab."""
     try:
         from reportlab.lib.pagesizes import A4
         from reportlab.lib import colors
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
         from reportlab.lib.units import cm
 
         buf = io.BytesIO()
         doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=2*cm, rightMargin=2*cm,
                                 topMargin=2*cm, bottomMargin=2*cm)
-        styles = getSampleStyleSheet()
         story = []
 
-        # Custom styles
-        title_style = ParagraphStyle('Title', parent=styles['Title'],
-                                     textColor=colors.HexColor('#1565C0'), fontSize=20)
-        h1_style = ParagraphStyle('H1', parent=styles['Heading1'],
-                                  textColor=colors.HexColor('#1565C0'), fontSize=14)
-        body = styles['BodyText']
+        title_style, h1_style, body = _pdf_styles()
 
         summary = results.get("summary", {})
         score = summary.get("overall_score", 0)
@@ -286,7 +355,7 @@ def export_to_pdf(results: Dict[str, Any]) -> Optional[bytes]:
 
         doc.build(story)
         buf.seek(0)
-        return buf.getvalue()
+        return buf
 
     except ImportError:
         return None
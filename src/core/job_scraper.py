@@ -4,7 +4,9 @@ Extracts job descriptions from URLs: LinkedIn, Indeed, PNet, Careers24, Glassdoo
 """
 import re
 import logging
+import time
 from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
@@ -53,75 +55,172 @@ GENERIC_SELECTORS = [
     '[class*="jobDesc"]', '[id*="jobDesc"]', '[class*="vacancy"]',
 ]
 
+# Scrape results cached per normalized URL for a day — A/B testing CV
+# variants against the same posting hits the network and parser once.
+_CACHE_TTL = 86400
+_CACHE_MAX = 64
+_scrape_cache: dict = {}
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref')
+
+# The selector tables above use a small CSS subset (tag, .class, #id,
+# [attr="v"], [attr*="v"]) — translated to XPath by hand so extraction
+# runs on lxml directly without the cssselect dependency. Compiled
+# lazily on first use because lxml itself is an optional import here.
+_RE_SEL_ATTR = re.compile(r'\[([\w-]+)(\*?)="?([^"\]]+)"?\]')
+_RE_SEL_TAG = re.compile(r'^(\w+)?(?:\.([\w-]+))?$')
+_NOISE_TAGS = ('script', 'style', 'nav', 'header', 'footer', 'iframe', 'noscript')
+_compiled_selectors: dict = {}
+
+# One pooled session per process — repeat scrapes against the same host
+# reuse the TCP+TLS connection instead of handshaking every call. Built
+# lazily because requests stays an optional import.
+_session = None
+
+
+def _http_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+        _session.headers.update(HEADERS)
+    return _session
+
+
+def _css_to_xpath(selector: str) -> Optional[str]:
+    if selector.startswith('#'):
+        return f'//*[@id="{selector[1:]}"]'
+    m = _RE_SEL_ATTR.fullmatch(selector)
+    if m:
+        attr, contains, value = m.groups()
+        if contains:
+            return f'//*[contains(@{attr}, "{value}")]'
+        return f'//*[@{attr}="{value}"]'
+    m = _RE_SEL_TAG.match(selector)
+    if not m or not (m.group(1) or m.group(2)):
+        return None
+    tag = m.group(1) or '*'
+    if m.group(2):
+        return (f'//{tag}[contains(concat(" ", normalize-space(@class), " "), '
+                f'" {m.group(2)} ")]')
+    return f'//{tag}'
+
+
+def _compiled(selector: str):
+    xp = _compiled_selectors.get(selector)
+    if xp is None:
+        from lxml import etree
+        path = _css_to_xpath(selector)
+        xp = etree.XPath(path) if path else False
+        _compiled_selectors[selector] = xp
+    return xp
+
+
+def _element_text(el) -> str:
+    return '\n'.join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query)
+             if not k.lower().startswith(_TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
 
 def scrape_job_url(url: str) -> Tuple[str, str]:
     """
     Scrape a job posting URL and return (extracted_text, source_platform).
     Returns ("", "") on failure.
     """
+    key = _normalize_url(url)
+    hit = _scrape_cache.get(key)
+    if hit is not None and hit[0] > time.time():
+        return hit[1]
     try:
-        import requests
-        from bs4 import BeautifulSoup
+        from lxml import html as lxml_html
 
         logger.info(f"Scraping: {url}")
-        resp = requests.get(url, headers=HEADERS, timeout=15)
+        resp = _http_session().get(url, timeout=15)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, 'lxml')
+        tree = lxml_html.fromstring(resp.content)
 
-        # Remove noise
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer',
-                         'iframe', 'noscript', '.cookie-banner']):
-            tag.decompose()
+        # Noise tags go in one C-level tree walk; cookie banners are a
+        # class, not a tag, so they get the compiled-selector treatment.
+        from lxml.etree import strip_elements
+        strip_elements(tree, *_NOISE_TAGS, with_tail=False)
+        for el in _compiled('.cookie-banner')(tree):
+            el.getparent().remove(el)
 
         platform = _detect_platform(url)
         selectors = PLATFORM_SELECTORS.get(platform, []) + GENERIC_SELECTORS
 
         # Try platform-specific selectors first
         for selector in selectors:
-            try:
-                el = soup.select_one(selector)
-                if el:
-                    text = el.get_text(separator='\n', strip=True)
-                    if len(text) > 200:
-                        logger.info(f"Extracted {len(text)} chars from {platform or 'generic'}")
-                        return _clean_text(text), platform or 'website'
-            except Exception:
+            xp = _compiled(selector)
+            if not xp:
                 continue
+            found = xp(tree)
+            if found:
+                text = _element_text(found[0])
+                if len(text) > 200:
+                    logger.info(f"Extracted {len(text)} chars from {platform or 'generic'}")
+                    return _cache_result(key, (_clean_text(text), platform or 'website'))
 
         # Fallback: largest text block
-        all_text = soup.get_text(separator='\n', strip=True)
-        cleaned = _clean_text(all_text)
+        cleaned = _clean_text(_element_text(tree))
         if len(cleaned) > 300:
-            return cleaned[:8000], 'website (fallback)'
+            return _cache_result(key, (cleaned[:8000], 'website (fallback)'))
 
         return "", "failed"
 
     except ImportError:
-        return "", "requests/beautifulsoup4 not installed — pip install requests beautifulsoup4 lxml"
+        return "", "requests/lxml not installed — pip install requests lxml"
     except Exception as e:
         logger.error(f"Scrape failed: {e}")
         return "", f"failed: {str(e)[:80]}"
 
 
+def _cache_result(key: str, result: Tuple[str, str]) -> Tuple[str, str]:
+    # Failures are never cached — only calls that produced text get here.
+    if len(_scrape_cache) >= _CACHE_MAX:
+        _scrape_cache.pop(next(iter(_scrape_cache)))
+    _scrape_cache[key] = (time.time() + _CACHE_TTL, result)
+    return result
+
+
+# One alternation over the six known hosts instead of a Python-level
+# substring loop per scrape.
+_PLATFORM_RE = re.compile('|'.join(re.escape(p) for p in PLATFORM_SELECTORS))
+
+
 def _detect_platform(url: str) -> str:
-    platforms = list(PLATFORM_SELECTORS.keys())
-    for p in platforms:
-        if p in url:
-            return p
-    return ""
+    m = _PLATFORM_RE.search(url)
+    return m.group(0) if m else ""
+
+
+# Compiled once — _clean_text runs on every scrape, and the five
+# boilerplate phrases fuse into one alternation so removal is a single
+# pass instead of five.
+_RE_NEWLINE_RUN = re.compile(r'\n{3,}')
+_RE_SPACE_RUN = re.compile(r' {2,}')
+_RE_BOILERPLATE = re.compile(
+    r'cookie[s]?\s+policy|privacy policy|terms of use|©\s*\d{4}|all rights reserved',
+    re.IGNORECASE)
+# Literal probes gating the boilerplate regex — most postings contain
+# none of these, and substring membership is far cheaper than the
+# five-branch alternation over the whole text.
+_BOIL_KEYS = ('cookie', 'privacy', 'terms of use', '©', 'rights reserved')
+_RE_HTTP_URL = re.compile(r'https?://')
 
 
 def _clean_text(text: str) -> str:
-    # Collapse whitespace runs
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    # Remove cookie/legal boilerplate
-    for pattern in [r'cookie[s]?\s+policy', r'privacy policy', r'terms of use',
-                    r'©\s*\d{4}', r'all rights reserved']:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = _RE_NEWLINE_RUN.sub('\n\n', text)
+    text = _RE_SPACE_RUN.sub(' ', text)
+    tl = text.lower()
+    if any(k in tl for k in _BOIL_KEYS):
+        text = _RE_BOILERPLATE.sub('', text)
     return text.strip()[:8000]
 
 
 def is_valid_url(url: str) -> bool:
-    return bool(re.match(r'https?://', url.strip()))
+    return bool(_RE_HTTP_URL.match(url.strip()))
@@ -0,0 +1,71 @@
+"""
+Karoo v2.0 — Agent Result Cache
+Exact-match LRU over completed agent analyses, keyed by
+(agent, model, CV, JD, context). Sits above BaseAgent's completion
+cache: a hit here skips prompt construction and the pre-analysis
+regex work as well as the LLM round trip.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def result_key(agent_name: str, model: str, cv: str, jd: str, context: dict) -> str:
+    """Stable digest of everything that can change an agent's output."""
+    ctx = repr(sorted((k, str(v)) for k, v in context.items()))
+    return hashlib.sha256(
+        f"{agent_name}\x00{model}\x00{ctx}\x00{cv}\x00{jd}".encode()
+    ).hexdigest()
+
+
+class ResultCache:
+    """In-process LRU with TTL for full AgentOutput objects.
+
+    Re-submitting the same CV/JD pair (the common "tweak one slider and
+    re-run" loop) replays each agent's result instead of re-running its
+    analysis. At temperature 0.3 the responses are deterministic enough
+    to treat a day-old result as current; _TTL bounds staleness anyway.
+    Results are never cached across models — the model name is part of
+    the key — and failures never reach the cache because _safe_run only
+    stores successful returns.
+    """
+
+    _TTL = 86400
+    _MAX = 128
+
+    def __init__(self):
+        self._store: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.enabled = os.getenv("KAROO_RESULT_CACHE", "1") != "0"
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            hit = self._store.get(key)
+            if hit is None:
+                return None
+            expires, value = hit
+            if expires < time.time():
+                del self._store[key]
+                return None
+            self._store.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store[key] = (time.time() + self._TTL, value)
+            if len(self._store) > self._MAX:
+                self._store.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
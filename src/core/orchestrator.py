@@ -4,39 +4,102 @@ Karoo v2.0 Master Orchestrator
 Supports Groq (free) + OpenAI + Anthropic. Auto-detects API key.
 """
 import asyncio
+import inspect
 import logging
 import os
+import threading
+import time
+from collections import namedtuple
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime 
 
-from src.agents.algorithm_breaker import AlgorithmBreaker
-from src.agents.sa_specialist import SASpecialist
-from src.agents.global_setter import GlobalSetter
-from src.agents.recruiter_scanner import RecruiterScanner
-from src.agents.hiring_manager_whisperer import HiringManagerWhisperer
-from src.agents.semantic_matcher import SemanticMatcher
-from src.agents.compliance_guardian import ComplianceGuardian
-from src.agents.future_architect import FutureArchitect
-from src.agents.cover_letter_agent import CoverLetterAgent
-from src.agents.interview_coach import InterviewCoach
-from src.agents.salary_intelligence import SalaryIntelligence
-from src.agents.cv_rewriter_agent import CVRewriterAgent
 from src.agents.base_agent import AgentOutput
+from src.core.ratelimit import RateLimiter
+from src.core.llm_cache import ResultCache, result_key
+from src.core.timeouts import TIMEOUTS
 
 logger = logging.getLogger(__name__)
 
+# Per-agent UI and scoring metadata — attribute access on a namedtuple
+# beats the former nested dict.get chains in the progress loop.
+AgentMeta = namedtuple("AgentMeta", "icon label weight_sa weight_intl")
+
+# The fused agent's delimiter keys, lowercased, are exactly these
+# orchestrator names.
+FUSED_AGENT_NAMES = ('global_setter', 'hiring_manager', 'future_architect', 'interview_coach')
+
+# Agent classes resolve lazily in __init__ so importing this module —
+# which app.py does before any UI renders — does not pull the whole
+# agent tree (and its regex compilation) onto the cold-start path.
+_AGENT_REGISTRY = (
+    ("algorithm_breaker",   "src.agents.algorithm_breaker",        "AlgorithmBreaker"),
+    ("sa_specialist",       "src.agents.sa_specialist",            "SASpecialist"),
+    ("global_setter",       "src.agents.global_setter",            "GlobalSetter"),
+    ("recruiter_scanner",   "src.agents.recruiter_scanner",        "RecruiterScanner"),
+    ("hiring_manager",      "src.agents.hiring_manager_whisperer", "HiringManagerWhisperer"),
+    ("semantic_matcher",    "src.agents.semantic_matcher",         "SemanticMatcher"),
+    ("compliance_guardian", "src.agents.compliance_guardian",      "ComplianceGuardian"),
+    ("future_architect",    "src.agents.future_architect",         "FutureArchitect"),
+    ("interview_coach",     "src.agents.interview_coach",          "InterviewCoach"),
+    ("salary_intelligence", "src.agents.salary_intelligence",      "SalaryIntelligence"),
+)
+
+
+class RoundRobinLLM:
+    """Rotates invoke across same-model clients built from several API keys.
+
+    Free-tier Groq limits are per key, so N keys sustain roughly N× the
+    request rate. A key that rate-limits cools down for 60s while the
+    others keep serving; only when every key is cooling does the error
+    surface, where BaseAgent's retry/backoff takes over.
+    """
+
+    COOLDOWN = 60
+
+    def __init__(self, llms, model_name: str):
+        self._llms = llms
+        self.model_name = model_name
+        self._lock = threading.Lock()  # invoked from gather()'s worker threads
+        self._next = 0
+        self._cooling = [0.0] * len(llms)
+
+    def invoke(self, messages):
+        last_exc = None
+        for _ in range(len(self._llms)):
+            with self._lock:
+                i = self._next
+                self._next = (self._next + 1) % len(self._llms)
+                cooling = self._cooling[i] > time.monotonic()
+            if cooling:
+                continue
+            try:
+                return self._llms[i].invoke(messages)
+            except Exception as e:
+                if '429' not in str(e) and 'rate' not in str(e).lower():
+                    raise
+                last_exc = e
+                logger.warning(f"Groq key {i+1}/{len(self._llms)} rate-limited — cooling 60s")
+                with self._lock:
+                    self._cooling[i] = time.monotonic() + self.COOLDOWN
+        raise last_exc if last_exc else RuntimeError("all API keys cooling down")
+
 
 def create_llm():
     """
     Auto-detect and create LLM. Priority: Groq → OpenAI → Anthropic → Rule-Based
     """
+    groq_keys = [k.strip() for k in os.getenv("GROQ_API_KEYS", "").split(",") if k.strip()]
     groq_key = os.getenv("GROQ_API_KEY", "")
-    if groq_key and not groq_key.startswith("gsk_your"):
+    if not groq_keys and groq_key and not groq_key.startswith("gsk_your"):
+        groq_keys = [groq_key]
+    if groq_keys:
         try:
             from langchain_groq import ChatGroq
             model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-            llm = ChatGroq(api_key=groq_key, model=model, temperature=0.3, max_tokens=2000)
-            logger.info(f"✓ Groq LLM: {model}")
+            llms = [ChatGroq(api_key=k, model=model, temperature=0.3, max_tokens=2000)
+                    for k in groq_keys]
+            llm = llms[0] if len(llms) == 1 else RoundRobinLLM(llms, model)
+            logger.info(f"✓ Groq LLM: {model} ({len(llms)} key{'s' if len(llms) > 1 else ''})")
             return llm, "Groq", model
         except Exception as e:
             logger.warning(f"Groq init failed: {e}")
@@ -71,36 +134,39 @@ class KarooOrchestrator:
     """v2 Master Coordinator — 11 agents, full AI CV rewrite, interview prep, salary intel."""
 
     AGENT_META = {
-        "algorithm_breaker": {"icon": "🎯", "label": "Algorithm Breaker", "weight_sa": 1.8, "weight_intl": 1.8},
-        "sa_specialist":     {"icon": "🇿🇦", "label": "SA Specialist",      "weight_sa": 2.0, "weight_intl": 0.8},
-        "global_setter":     {"icon": "🌍", "label": "Global Setter",      "weight_sa": 0.8, "weight_intl": 2.0},
-        "recruiter_scanner": {"icon": "👁️", "label": "6-Second Scanner",   "weight_sa": 1.3, "weight_intl": 1.3},
-        "hiring_manager":    {"icon": "💼", "label": "Hiring Manager",     "weight_sa": 1.2, "weight_intl": 1.2},
-        "semantic_matcher":  {"icon": "📊", "label": "Semantic Matcher",   "weight_sa": 1.1, "weight_intl": 1.3},
-        "compliance_guardian": {"icon": "⚖️", "label": "Compliance Guardian", "weight_sa": 1.2, "weight_intl": 1.0},
-        "future_architect":  {"icon": "🚀", "label": "Future Architect",   "weight_sa": 0.9, "weight_intl": 1.0},
-        "interview_coach":   {"icon": "🎤", "label": "Interview Coach",    "weight_sa": 1.0, "weight_intl": 1.0},
-        "salary_intelligence": {"icon": "💰", "label": "Salary Intelligence", "weight_sa": 0.8, "weight_intl": 0.7},
+        "algorithm_breaker":   AgentMeta("🎯", "Algorithm Breaker",   1.8, 1.8),
+        "sa_specialist":       AgentMeta("🇿🇦", "SA Specialist",       2.0, 0.8),
+        "global_setter":       AgentMeta("🌍", "Global Setter",       0.8, 2.0),
+        "recruiter_scanner":   AgentMeta("👁️", "6-Second Scanner",    1.3, 1.3),
+        "hiring_manager":      AgentMeta("💼", "Hiring Manager",      1.2, 1.2),
+        "semantic_matcher":    AgentMeta("📊", "Semantic Matcher",    1.1, 1.3),
+        "compliance_guardian": AgentMeta("⚖️", "Compliance Guardian", 1.2, 1.0),
+        "future_architect":    AgentMeta("🚀", "Future Architect",    0.9, 1.0),
+        "interview_coach":     AgentMeta("🎤", "Interview Coach",     1.0, 1.0),
+        "salary_intelligence": AgentMeta("💰", "Salary Intelligence", 0.8, 0.7),
     }
 
     def __init__(self):
         self.llm, self.llm_provider, self.llm_model = create_llm()
         self.ai_mode = self.llm is not None
+        self.rate_limiter = RateLimiter.for_provider(self.llm_provider) if self.ai_mode else None
+        self.result_cache = ResultCache()
 
+        import importlib
         self.agents = {
-            "algorithm_breaker":  AlgorithmBreaker(self.llm),
-            "sa_specialist":      SASpecialist(self.llm),
-            "global_setter":      GlobalSetter(self.llm),
-            "recruiter_scanner":  RecruiterScanner(self.llm),
-            "hiring_manager":     HiringManagerWhisperer(self.llm),
-            "semantic_matcher":   SemanticMatcher(self.llm),
-            "compliance_guardian": ComplianceGuardian(self.llm),
-            "future_architect":   FutureArchitect(self.llm),
-            "interview_coach":    InterviewCoach(self.llm),
-            "salary_intelligence": SalaryIntelligence(self.llm),
+            name: getattr(importlib.import_module(module), cls)(self.llm)
+            for name, module, cls in _AGENT_REGISTRY
         }
+        from src.agents.cover_letter_agent import CoverLetterAgent
+        from src.agents.cv_rewriter_agent import CVRewriterAgent
+        from src.agents.fused_analysis import FusedAnalysisAgent
         self.cover_agent = CoverLetterAgent(self.llm)
         self.rewriter = CVRewriterAgent(self.llm)
+        # Batched mode: four prompt-compatible agents share one LLM
+        # completion. AI mode only — fusing buys nothing rule-based.
+        self.fused = (FusedAnalysisAgent(self.llm)
+                      if self.ai_mode and os.getenv("KAROO_FUSED_ANALYSIS", "1") != "0"
+                      else None)
 
         mode = f"🧠 {self.llm_provider} ({self.llm_model})" if self.ai_mode else "📐 Rule-Based"
         logger.info(f"Karoo v2 Orchestrator — {mode}")
@@ -112,61 +178,98 @@ class KarooOrchestrator:
         context: Dict[str, Any],
         generate_cover_letter: bool = True,
         rewrite_cv: bool = True,
+        enabled_agents: Optional[set] = None,
         progress_callback: Optional[Callable] = None,
     ) -> Dict[str, Any]:
-        """Full v2 pipeline: 10 agents + cover letter + AI CV rewrite."""
+        """Full v2 pipeline: 10 agents + cover letter + AI CV rewrite.
+
+        enabled_agents filters the agent set per run without mutating
+        self.agents — safe to share one orchestrator across sessions.
+        """
         start = datetime.now()
 
-        def _p(pct: float, msg: str):
+        # Callbacks that declare a third parameter get a structured
+        # payload with each completed agent's result, so callers can
+        # render scores incrementally instead of waiting ~3 minutes for
+        # the full dict. Two-argument callbacks keep working unchanged.
+        if progress_callback is not None:
+            try:
+                _streaming = len(inspect.signature(progress_callback).parameters) >= 3
+            except (TypeError, ValueError):
+                _streaming = False
+
+        def _p(pct: float, msg: str, payload: Optional[Dict] = None):
             if progress_callback:
-                progress_callback(pct, msg)
+                if _streaming:
+                    progress_callback(pct, msg, payload)
+                else:
+                    progress_callback(pct, msg)
+
+        direct = self._direct_response(cv_text, job_description)
+        if direct is not None:
+            _p(1.0, f"⚠️ {direct['summary']['verdict']}")
+            return direct
+
+        to_run = {name: agent for name, agent in self.agents.items()
+                  if enabled_agents is None or name in enabled_agents}
+
+        _p(0.03, f"🚀 Launching {len(to_run)} specialist agents ({self.llm_provider} mode)...")
+
+        # When the fused agent is active and its whole group is
+        # selected, those four run off one completion; a dropped
+        # delimiter falls back to the per-agent path inside analyze_all.
+        fused_group = ()
+        if self.fused is not None and all(n in to_run for n in FUSED_AGENT_NAMES):
+            fused_group = FUSED_AGENT_NAMES
+            to_run = {n: a for n, a in to_run.items() if n not in fused_group}
+
+        # The three phases were serial, but the cover letter needs only
+        # the raw CV/JD and the rewriter only the Algorithm Breaker and
+        # 6-Second Scanner outputs — so both start as tasks while the
+        # rest of the fan-out is still running, and total wall time is
+        # max(slowest agent, cover letter, rewrite) instead of the sum.
+        deadline = time.monotonic() + TIMEOUTS.global_deadline
+        tasks = self._launch(to_run, cv_text, job_description, context, deadline)
+        if fused_group:
+            tasks['fused_analysis'] = asyncio.create_task(asyncio.wait_for(
+                self._safe_run_fused(cv_text, job_description, context),
+                timeout=self._budget(TIMEOUTS.agent, deadline)))
+
+        cover_task = None
+        if generate_cover_letter:
+            cover_task = asyncio.create_task(asyncio.wait_for(
+                self._safe_run(self.cover_agent, cv_text, job_description, context),
+                timeout=self._budget(TIMEOUTS.cover_letter, deadline)))
 
-        _p(0.03, f"🚀 Launching 10 specialist agents ({self.llm_provider} mode)...")
+        rewrite_task = None
+        if rewrite_cv and self.ai_mode:
+            rewrite_task = asyncio.create_task(
+                self._rewrite_when_ready(tasks, cv_text, job_description, context, deadline))
 
-        # Phase 1: Run 10 analysis agents in parallel
-        agent_results = await self._run_parallel(cv_text, job_description, context, _p)
+        fanout_start = time.monotonic()
+        agent_results = await self._harvest(tasks, _p)
+        agents_parallel_ms = int((time.monotonic() - fanout_start) * 1000)
 
         _p(0.82, "📊 Synthesizing results...")
         summary = self._build_summary(agent_results, context)
 
-        # Pass insights to rewriter
-        algo = agent_results.get('algorithm_breaker', AgentOutput())
-        missing_kw = []
-        for f in algo.findings:
-            if 'Missing' in f:
-                missing_kw = [k.strip() for k in f.split(':')[-1].split(',') if k.strip()]
-
-        rewriter_ctx = {**context, '_missing_keywords': missing_kw, '_agent_insights': {
-            'ats_score': summary.get('overall_score', 0),
-            'top_fixes': summary.get('top_action_items', [])[:5],
-        }}
-
-        # Phase 2: Cover letter
         cover_letter = ""
-        if generate_cover_letter:
+        if cover_task is not None:
             _p(0.86, "📝 Writing cover letter...")
             try:
-                cl_result = await asyncio.wait_for(
-                    self.cover_agent.analyze(cv_text, job_description, context), timeout=75
-                )
-                cover_letter = cl_result.optimized_content
+                cover_letter = (await cover_task).optimized_content
             except Exception as e:
                 logger.error(f"Cover letter failed: {e}")
                 cover_letter = "[Cover letter generation failed — ensure API key is set]"
 
-        # Phase 3: AI CV Rewrite
         cv_variants = {"ats_max": "", "balanced": "", "creative": ""}
-        if rewrite_cv and self.ai_mode:
+        if rewrite_task is not None:
             _p(0.90, "✍️ AI rewriting 3 CV variants...")
             try:
-                rw_result = await asyncio.wait_for(
-                    self.rewriter.analyze(cv_text, job_description, rewriter_ctx), timeout=180
-                )
+                rw_result = await rewrite_task
                 raw = rw_result.optimized_content
-                from src.agents.cv_rewriter_agent import CVRewriterAgent as CRA
-                cra = CRA(self.llm)
-                for variant in ['ats_max', 'balanced', 'creative']:
-                    cv_variants[variant] = cra.get_variant(raw, variant)
+                for variant in ('ats_max', 'balanced', 'creative'):
+                    cv_variants[variant] = self.rewriter.get_variant(raw, variant)
             except Exception as e:
                 logger.error(f"CV rewrite failed: {e}")
                 cv_variants = self._fallback_variants(cv_text, agent_results, summary)
@@ -193,52 +296,177 @@ class KarooOrchestrator:
                 "timestamp": datetime.now().isoformat(),
                 "version": "2.0.0",
                 "agents_run": len(agent_results),
+                "agents_parallel_ms": agents_parallel_ms,
                 "ai_rewrite": rewrite_cv and self.ai_mode,
                 "cover_letter_generated": generate_cover_letter,
             }
         }
 
-    async def _run_parallel(self, cv, jd, ctx, progress_cb):
-        tasks = {
-            name: asyncio.create_task(self._safe_run(agent, cv, jd, ctx))
-            for name, agent in self.agents.items()
+    def _direct_response(self, cv_text: str, job_description: str) -> Optional[Dict[str, Any]]:
+        """Answer degenerate inputs without spending the 10-agent fan-out.
+
+        Ten agents produce nothing useful from a truncated paste or a
+        CV field holding the job advert, so those calls return a
+        result-shaped refusal in microseconds instead.
+        """
+        cv = cv_text.strip()
+        if len(cv) < 200:
+            verdict = "CV too short to analyse — paste the full document."
+        elif len(cv) > 100_000:
+            verdict = "CV too large to analyse — paste the CV text itself, not a full export."
+        elif cv == job_description.strip():
+            verdict = "CV and job description are identical — check what was pasted where."
+        else:
+            return None
+        return {
+            "summary": {
+                "overall_score": 0, "recommended_variant": "BALANCED", "verdict": verdict,
+                "interview_probability": 0, "agent_scores": {}, "weakest_area": "",
+                "strongest_area": "", "target_market": "", "top_action_items": [verdict],
+                "ai_powered_count": 0,
+            },
+            "agent_results": {},
+            "cv_variants": {"ats_max": "", "balanced": "", "creative": ""},
+            "cover_letter": "",
+            "action_items": [verdict],
+            "ai_mode": self.ai_mode,
+            "llm_provider": self.llm_provider,
+            "llm_model": self.llm_model,
+            "metadata": {
+                "execution_seconds": 0.0,
+                "timestamp": datetime.now().isoformat(),
+                "version": "2.0.0",
+                "agents_run": 0,
+                "agents_parallel_ms": 0,
+                "ai_rewrite": False,
+                "cover_letter_generated": False,
+                "direct_response": True,
+            },
         }
+
+    @staticmethod
+    def _budget(limit: int, deadline: float) -> float:
+        """Task timeout: its own limit, clipped to the pipeline deadline."""
+        return max(1.0, min(limit, deadline - time.monotonic()))
+
+    def _launch(self, agents, cv, jd, ctx, deadline) -> Dict[str, asyncio.Task]:
+        # wait_for at creation starts every agent's clock together.
+        # Rule-based agents do no I/O, so they get a short budget
+        # instead of the 90s network allowance.
+        limit = TIMEOUTS.agent if self.ai_mode else TIMEOUTS.agent_rule_based
+        timeout = self._budget(limit, deadline)
+        return {
+            name: asyncio.create_task(
+                asyncio.wait_for(self._safe_run(agent, cv, jd, ctx), timeout=timeout))
+            for name, agent in agents.items()
+        }
+
+    async def _rewrite_when_ready(self, tasks, cv, jd, context, deadline):
+        """Start the CV rewrite as soon as its two inputs exist.
+
+        The rewrite prompt is seeded with the Algorithm Breaker's
+        missing keywords and score plus the scanner's top fixes — not
+        the full summary — so it only has to wait for those two tasks,
+        overlapping the 180s rewrite with the slower tail of the fan-out.
+        """
+        early = {}
+        for name in ('algorithm_breaker', 'recruiter_scanner'):
+            task = tasks.get(name)
+            if task is None:
+                continue
+            try:
+                early[name] = await task
+            except Exception:
+                pass
+        algo = early.get('algorithm_breaker', AgentOutput())
+        missing_kw = []
+        for f in algo.findings:
+            if 'Missing' in f:
+                missing_kw = [k.strip() for k in f.split(':')[-1].split(',') if k.strip()]
+        rewriter_ctx = {**context, '_missing_keywords': missing_kw, '_agent_insights': {
+            'ats_score': algo.score,
+            'top_fixes': self._compile_actions(early)[:5],
+        }}
+        return await asyncio.wait_for(
+            self._safe_run(self.rewriter, cv, jd, rewriter_ctx),
+            timeout=self._budget(TIMEOUTS.rewriter, deadline))
+
+    async def _harvest(self, tasks, progress_cb):
+        # Harvest in completion order, not insertion order: awaiting the
+        # task dict sequentially meant a slow first agent held up the
+        # progress updates for nine finished ones.
+        names = {task: name for name, task in tasks.items()}
+        total = sum(len(FUSED_AGENT_NAMES) if n == 'fused_analysis' else 1 for n in tasks)
         results = {}
         completed = 0
-        for name, task in tasks.items():
-            try:
-                result = await asyncio.wait_for(asyncio.shield(task), timeout=90)
-                results[name] = result
-                logger.info(f"✓ [{name}]: {result.score}/100 ({result.execution_ms}ms)")
-            except asyncio.TimeoutError:
-                logger.error(f"✗ [{name}] timed out")
-                results[name] = AgentOutput(agent_name=name, score=50,
-                    findings=["⚠️ Agent timed out"], recommendations=["Re-run for complete analysis"])
-            except Exception as e:
-                logger.error(f"✗ [{name}] error: {e}")
-                results[name] = AgentOutput(agent_name=name, score=50,
-                    findings=[f"⚠️ Error: {str(e)[:80]}"], recommendations=["Check API key"])
-            completed += 1
-            meta = self.AGENT_META.get(name, {})
-            icon = meta.get("icon", "🤖")
-            label = meta.get("label", name)
-            pct = 0.03 + (completed / len(tasks)) * 0.77
-            progress_cb(pct, f"{icon} {label} complete ({completed}/{len(tasks)})")
+        pending = set(names)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = names[task]
+                members = FUSED_AGENT_NAMES if name == 'fused_analysis' else (name,)
+                try:
+                    result = task.result()
+                    bundle = result if isinstance(result, dict) else {name: result}
+                except asyncio.TimeoutError:
+                    logger.error(f"✗ [{name}] timed out")
+                    bundle = {n: AgentOutput(agent_name=n, score=50,
+                        findings=["⚠️ Agent timed out"], recommendations=["Re-run for complete analysis"])
+                        for n in members}
+                except Exception as e:
+                    logger.error(f"✗ [{name}] error: {e}")
+                    bundle = {n: AgentOutput(agent_name=n, score=50,
+                        findings=[f"⚠️ Error: {str(e)[:80]}"], recommendations=["Check API key"])
+                        for n in members}
+                for n, out in bundle.items():
+                    results[n] = out
+                    logger.info(f"✓ [{n}]: {out.score}/100 ({out.execution_ms}ms)")
+                    completed += 1
+                    meta = self.AGENT_META[n]
+                    pct = 0.03 + (completed / total) * 0.77
+                    progress_cb(pct, f"{meta.icon} {meta.label} complete ({completed}/{total})",
+                                {"agent": n, "result": out.dict()})
         return results
 
+    async def _safe_run_fused(self, cv, jd, ctx):
+        key = result_key(self.fused.name, self.llm_model, cv, jd, ctx)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            logger.info("✓ [fused_analysis] result cache hit")
+            return cached
+        if self.rate_limiter is None:
+            bundle = await self.fused.analyze_all(cv, jd, ctx)
+        else:
+            async with self.rate_limiter.acquire():
+                bundle = await self.fused.analyze_all(cv, jd, ctx)
+        bundle = {k.lower(): v for k, v in bundle.items()}
+        self.result_cache.set(key, bundle)
+        return bundle
+
     async def _safe_run(self, agent, cv, jd, ctx):
-        return await agent.analyze(cv, jd, ctx)
+        key = result_key(agent.name, self.llm_model, cv, jd, ctx)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            logger.info(f"✓ [{agent.name}] result cache hit")
+            return cached
+        if self.rate_limiter is None:
+            result = await agent.analyze(cv, jd, ctx)
+        else:
+            async with self.rate_limiter.acquire():
+                result = await agent.analyze(cv, jd, ctx)
+        self.result_cache.set(key, result)
+        return result
 
     def _build_summary(self, results: Dict, context: Dict) -> Dict:
         market = context.get('target_market', 'Both')
         weight_key = 'weight_sa' if market == 'South Africa' else 'weight_intl' if market == 'International' else None
+        weights = self._WEIGHTS[weight_key] if weight_key else {}
 
         total_w, weighted_sum = 0.0, 0.0
         scores = {}
 
         for name, result in results.items():
-            meta = self.AGENT_META.get(name, {})
-            w = meta.get(weight_key, result.weight) if weight_key else result.weight
+            w = weights.get(name, result.weight)
             weighted_sum += result.score * w
             total_w += w
             scores[name] = result.score
@@ -276,6 +504,8 @@ class KarooOrchestrator:
             for rec in result.recommendations[:5]:
                 if rec and len(rec) > 12:
                     weighted.append((urgency, rec))
+        # Sort on urgency alone — the old tuple sort fell through to
+        # comparing recommendation strings on ties. Dedupe stops at 18.
         weighted.sort(key=lambda x: x[0], reverse=True)
         seen, unique = set(), []
         for _, rec in weighted:
@@ -283,7 +513,9 @@ class KarooOrchestrator:
             if norm not in seen:
                 seen.add(norm)
                 unique.append(rec)
-        return unique[:18]
+                if len(unique) == 18:
+                    break
+        return unique
 
     def _fallback_variants(self, original_cv, results, summary) -> Dict:
         score = summary.get('overall_score', 0)
@@ -296,10 +528,75 @@ class KarooOrchestrator:
         improved_bullet = results.get('recruiter_scanner', AgentOutput()).optimized_content
         sa_summary = results.get('sa_specialist', AgentOutput()).optimized_content
 
-        header = f"╔══════════════════════════════════════════════════════╗\n║  Karoo v2 OPTIMIZED — {ts}  ║\n║             Overall Score: {score}/100                   ║\n╚══════════════════════════════════════════════════════╝\n\n"
+        header = _VARIANT_HEADER.format(ts=ts, score=score)
+        return {
+            "ats_max": _ATS_TEMPLATE.format(
+                header=header,
+                summary=algo.optimized_content or clean_summary
+                    or '[Apply the ATS-optimized summary from the Algorithm Breaker agent above]',
+                missing_kw=missing_kw,
+                semantic=semantic_bridge or '[Add JD language throughout your experience section]',
+                cv=original_cv),
+            "balanced": _BALANCED_TEMPLATE.format(
+                header=header,
+                summary=career_narrative or clean_summary
+                    or '[Apply the career narrative from the Future Architect agent]',
+                bullet=improved_bullet or '[Apply the rewritten bullet from the 6-Second Scanner agent]',
+                cv=original_cv),
+            "creative": _CREATIVE_TEMPLATE.format(
+                header=header,
+                narrative=career_narrative or '[Build your story around progression and impact]',
+                sa_angle=sa_summary or '[Add market-specific positioning]',
+                cv=original_cv),
+        }
+
+
+# Rule-based CV variant layouts, hoisted out of _fallback_variants so
+# the method is just data flow into format().
+_VARIANT_HEADER = (
+    "╔══════════════════════════════════════════════════════╗\n"
+    "║  Karoo v2 OPTIMIZED — {ts}  ║\n"
+    "║             Overall Score: {score}/100                   ║\n"
+    "╚══════════════════════════════════════════════════════╝\n\n"
+)
+_ATS_TEMPLATE = """{header}═══ ATS-MAX VARIANT (Maximum Parse Rate) ═══
+
+OPTIMIZED SUMMARY:
+{summary}
+
+MISSING KEYWORDS TO ADD:
+{missing_kw}
+
+SEMANTIC CONTEXT:
+{semantic}
+
+══════════════ YOUR ORIGINAL CV ══════════════
+{cv}"""
+_BALANCED_TEMPLATE = """{header}═══ BALANCED VARIANT ⭐ RECOMMENDED ═══
+
+COMPELLING SUMMARY:
+{summary}
+
+STRONGEST ACHIEVEMENT EXAMPLE:
+{bullet}
+
+══════════════ YOUR ORIGINAL CV ══════════════
+{cv}"""
+_CREATIVE_TEMPLATE = """{header}═══ CREATIVE VARIANT (Human-First) ═══
+
+CAREER NARRATIVE:
+{narrative}
+
+SA MARKET ANGLE:
+{sa_angle}
 
-        ats = f"{header}═══ ATS-MAX VARIANT (Maximum Parse Rate) ═══\n\nOPTIMIZED SUMMARY:\n{algo.optimized_content or clean_summary or '[Apply the ATS-optimized summary from the Algorithm Breaker agent above]'}\n\nMISSING KEYWORDS TO ADD:\n{missing_kw}\n\nSEMANTIC CONTEXT:\n{semantic_bridge or '[Add JD language throughout your experience section]'}\n\n══════════════ YOUR ORIGINAL CV ══════════════\n{original_cv}"
-        bal = f"{header}═══ BALANCED VARIANT ⭐ RECOMMENDED ═══\n\nCOMPELLING SUMMARY:\n{career_narrative or clean_summary or '[Apply the career narrative from the Future Architect agent]'}\n\nSTRONGEST ACHIEVEMENT EXAMPLE:\n{improved_bullet or '[Apply the rewritten bullet from the 6-Second Scanner agent]'}\n\n══════════════ YOUR ORIGINAL CV ══════════════\n{original_cv}"
-        cre = f"{header}═══ CREATIVE VARIANT (Human-First) ═══\n\nCAREER NARRATIVE:\n{career_narrative or '[Build your story around progression and impact]'}\n\nSA MARKET ANGLE:\n{sa_summary or '[Add market-specific positioning]'}\n\n══════════════ YOUR ORIGINAL CV ══════════════\n{original_cv}"
+══════════════ YOUR ORIGINAL CV ══════════════
+{cv}"""
 
-        return {"ats_max": ats, "balanced": bal, "creative": cre}
+# Flat per-market weight tables so _build_summary does one dict lookup
+# per agent instead of walking AGENT_META per call. Built here because
+# class-body comprehensions cannot see class attributes.
+KarooOrchestrator._WEIGHTS = {
+    key: {name: getattr(meta, key) for name, meta in KarooOrchestrator.AGENT_META.items()}
+    for key in ('weight_sa', 'weight_intl')
+}
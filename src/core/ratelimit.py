@@ -0,0 +1,71 @@
+"""
+Karoo v2.0 — Provider Rate Limiter
+Caps concurrent LLM calls and smooths request rate so the parallel agent
+fan-out stays inside each provider's RPM limit instead of tripping 429 retries.
+"""
+import asyncio
+import os
+import time
+from typing import Dict
+
+# Free/default tier profiles. Conservative on purpose — a 429 retry cycle
+# costs more than waiting a few hundred ms for a token.
+PROVIDER_PROFILES: Dict[str, Dict[str, int]] = {
+    "Groq": {"rpm": 30, "max_concurrency": 4},
+    "OpenAI": {"rpm": 60, "max_concurrency": 8},
+    "Anthropic": {"rpm": 50, "max_concurrency": 6},
+}
+DEFAULT_PROFILE = {"rpm": 60, "max_concurrency": 8}
+
+
+class RateLimiter:
+    """asyncio.Semaphore concurrency cap + token bucket for request rate.
+
+    Usage:
+        async with limiter.acquire():
+            response = llm_call(...)
+    """
+
+    def __init__(self, rpm: int = 60, max_concurrency: int = 8):
+        self.rate = rpm / 60.0  # tokens per second
+        self.capacity = float(max(1, max_concurrency))  # allowed burst
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.sem = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "RateLimiter":
+        profile = dict(PROVIDER_PROFILES.get(provider, DEFAULT_PROFILE))
+        override = os.getenv("KAROO_MAX_CONCURRENCY")
+        if override and override.isdigit():
+            profile["max_concurrency"] = max(1, int(override))
+        return cls(**profile)
+
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def acquire(self) -> "_Acquisition":
+        return _Acquisition(self)
+
+
+class _Acquisition:
+    def __init__(self, limiter: RateLimiter):
+        self._limiter = limiter
+
+    async def __aenter__(self):
+        await self._limiter.sem.acquire()
+        await self._limiter._take_token()
+        return self._limiter
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._limiter.sem.release()
+        return False
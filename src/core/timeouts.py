@@ -0,0 +1,31 @@
+"""
+Karoo v2.0 — Pipeline Timeout Budgets
+Centralises the per-task timeouts that were hard-coded through the
+orchestrator, adds a whole-pipeline deadline, and lets deployments
+tune each budget by env var.
+"""
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "")
+    return int(value) if value.isdigit() else default
+
+
+@dataclass(frozen=True)
+class TimeoutConfig:
+    agent: int           # per analysis agent, AI mode
+    agent_rule_based: int  # rule-based agents do no I/O
+    cover_letter: int
+    rewriter: int
+    global_deadline: int  # whole-pipeline cap; late tasks get the remainder
+
+
+TIMEOUTS = TimeoutConfig(
+    agent=_env_int("KAROO_TIMEOUT_AGENT", 90),
+    agent_rule_based=_env_int("KAROO_TIMEOUT_AGENT_RULE", 10),
+    cover_letter=_env_int("KAROO_TIMEOUT_COVER", 75),
+    rewriter=_env_int("KAROO_TIMEOUT_REWRITE", 180),
+    global_deadline=_env_int("KAROO_TIMEOUT_TOTAL", 300),
+)
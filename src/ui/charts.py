@@ -2,16 +2,27 @@
 Karoo v2.0 — Visualisation Components
 Radar chart, score bars, timeline, agent grid.
 """
+import functools
 from typing import Dict, Optional
 
+# Streamlit re-runs the whole script on every widget interaction, and
+# each go.Figure rebuild pays plotly's dict validation again for data
+# that has not changed. The public functions keep their dict/int
+# signatures; construction is memoized on hashable score tuples.
+
+
 def radar_chart(agent_scores: Dict[str, int]):
     """Radar chart of all agent scores."""
+    return _radar_chart(tuple(agent_scores.items()))
+
+
+@functools.lru_cache(maxsize=32)
+def _radar_chart(scores):
     try:
         import plotly.graph_objects as go
-        import plotly.express as px
 
-        labels = [k.replace('_', ' ').title() for k in agent_scores.keys()]
-        values = list(agent_scores.values())
+        labels = [k.replace('_', ' ').title() for k, _ in scores]
+        values = [v for _, v in scores]
         values_closed = values + [values[0]]
         labels_closed = labels + [labels[0]]
 
@@ -47,6 +58,7 @@ def radar_chart(agent_scores: Dict[str, int]):
         return None
 
 
+@functools.lru_cache(maxsize=32)
 def score_gauge(score: int):
     """Gauge chart for overall score."""
     try:
@@ -85,11 +97,16 @@ def score_gauge(score: int):
 
 def agent_bar_chart(agent_scores: Dict[str, int]):
     """Horizontal bar chart for agent scores."""
+    return _agent_bar_chart(tuple(agent_scores.items()))
+
+
+@functools.lru_cache(maxsize=32)
+def _agent_bar_chart(scores):
     try:
         import plotly.graph_objects as go
 
-        names = [k.replace('_', ' ').title() for k in agent_scores.keys()]
-        values = list(agent_scores.values())
+        names = [k.replace('_', ' ').title() for k, _ in scores]
+        values = [v for _, v in scores]
         colors = ['#2E7D32' if v>=80 else '#E65C00' if v>=60 else '#C62828' for v in values]
 
         fig = go.Figure(go.Bar(
@@ -113,11 +130,16 @@ def agent_bar_chart(agent_scores: Dict[str, int]):
 
 def improvement_chart(before_score: int, after_scores: Dict[str, int]):
     """Before/after improvement chart."""
+    return _improvement_chart(before_score, tuple(after_scores.items()))
+
+
+@functools.lru_cache(maxsize=32)
+def _improvement_chart(before_score, after_scores):
     try:
         import plotly.graph_objects as go
         fig = go.Figure()
-        labels = ['Before'] + [k.replace('_', ' ').title() for k in after_scores.keys()]
-        values = [before_score] + list(after_scores.values())
+        labels = ['Before'] + [k.replace('_', ' ').title() for k, _ in after_scores]
+        values = [before_score] + [v for _, v in after_scores]
         fig.add_trace(go.Scatter(
             x=labels, y=values, mode='lines+markers',
             marker=dict(size=10, color='#1565C0'),
@@ -2,6 +2,13 @@
 Karoo v2.0 — Reusable UI Components
 """
 
+# These run once per agent row on every Streamlit rerun, and there are
+# only 101 possible scores — so the width-10 bars are prebuilt and the
+# colour/emoji ladders stay as they are (two comparisons beat a
+# 101-entry table for readability at the same cost).
+_BARS_W10 = ["█" * (s // 10) + "░" * (10 - s // 10) for s in range(101)]
+
+
 def score_color(score: int) -> str:
     if score >= 80: return "#2E7D32"
     if score >= 60: return "#E65C00"
@@ -14,5 +21,7 @@ def score_emoji(score: int) -> str:
     return "🔴"
 
 def format_bar(score: int, width: int = 10) -> str:
+    if width == 10:
+        return _BARS_W10[min(max(score, 0), 100)]
     filled = score // (100 // width)
     return "█" * filled + "░" * (width - filled)
@@ -0,0 +1,94 @@
+"""
+Shared fixtures: one orchestrator and one full pipeline run per session.
+
+Four orchestrator tests previously each built a KarooOrchestrator and
+ran the whole 10-agent pipeline on identical inputs — four runs for
+one result. The session-scoped full_results fixture runs it once.
+"""
+import asyncio
+import sys
+
+import pytest
+
+from src.core.orchestrator import KarooOrchestrator
+
+# libuv-backed event loops when available — every new_event_loop() in
+# the suite picks the faster policy up for free. Optional on purpose:
+# CI without uvloop (and Windows, which it does not support) runs the
+# default loop.
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+CV = """
+Jane Smith
+jane.smith@email.com | +27 82 123 4567 | linkedin.com/in/janesmith | github.com/janesmith
+
+PROFESSIONAL SUMMARY
+Senior Software Engineer with 9 years in fintech. Led teams of 8-12. Delivered 4 platform migrations.
+Reduced system downtime by 45% through proactive monitoring and automated alerting.
+
+EXPERIENCE
+
+Senior Software Engineer | ABC Bank | Cape Town | 2020 – Present
+- Spearheaded migration to microservices, reducing deployment time by 60%
+- Led team of 10 engineers, improving sprint velocity by 35%
+- Implemented CI/CD pipeline (GitHub Actions, Docker, Kubernetes) saving 25h/sprint
+- Architected fraud detection processing R2.3B daily transactions
+
+Software Engineer | XYZ FinTech | Johannesburg | 2016 – 2020
+- Built Python FastAPI backend for 80,000 daily active users
+- Reduced API response time from 1.8s to 180ms (90% improvement)
+- Delivered 3 major releases, increasing user retention by 22%
+
+Junior Developer | StartupCo | 2014 – 2016
+- Developed React.js frontend for SaaS product with 5,000 users
+
+EDUCATION
+BSc Computer Science (NQF Level 7) | University of Cape Town | 2014
+
+SKILLS
+Python, Java, React.js, AWS, Docker, Kubernetes, PostgreSQL, Redis,
+GitHub Actions, Terraform, Agile/Scrum, SQL, machine learning, automation
+"""
+
+JD = """
+Senior Software Engineer — FinTech Innovation
+
+We need a Senior Software Engineer for our Cape Town team.
+
+Requirements:
+- 5+ years software engineering
+- Python, AWS, Docker, Kubernetes
+- Microservices architecture experience
+- Team leadership and mentoring
+- Agile/Scrum methodology
+- B-BBEE awareness preferred
+- Financial systems experience
+"""
+
+CTX = {
+    "target_market": "South Africa",
+    "experience_level": "Senior",
+    "industry": "FinTech",
+    "target_role": "Senior Software Engineer"
+}
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try: return loop.run_until_complete(coro)
+    finally: loop.close()
+
+
+@pytest.fixture(scope="session")
+def orch():
+    return KarooOrchestrator()
+
+
+@pytest.fixture(scope="session")
+def full_results(orch):
+    return run(orch.optimize(CV, JD, CTX, generate_cover_letter=False, rewrite_cv=False))
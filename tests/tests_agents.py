@@ -181,10 +181,8 @@ def test_job_scraper_url_validation():
     assert not is_valid_url("ftp://invalid.com")
 
 
-def test_orchestrator_full_run():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False, rewrite_cv=False))
+def test_orchestrator_full_run(full_results):
+    results = full_results
     assert "summary" in results
     assert "agent_results" in results
     assert "cv_variants" in results
@@ -192,11 +190,8 @@ def test_orchestrator_full_run():
     assert len(results["agent_results"]) >= 8
 
 
-def test_orchestrator_summary():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False, rewrite_cv=False))
-    s = results["summary"]
+def test_orchestrator_summary(full_results):
+    s = full_results["summary"]
     assert 0 <= s["overall_score"] <= 100
     assert 0 <= s["interview_probability"] <= 100
     assert s["recommended_variant"] in ["BALANCED", "ATS-MAX", "CREATIVE"]
@@ -204,21 +199,15 @@ def test_orchestrator_summary():
     assert "strongest_area" in s
 
 
-def test_orchestrator_3_variants():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False, rewrite_cv=False))
-    v = results["cv_variants"]
+def test_orchestrator_3_variants(full_results):
+    v = full_results["cv_variants"]
     assert all(k in v for k in ["ats_max","balanced","creative"])
     assert all(len(v[k]) > 50 for k in v)
 
 
-def test_exporter_txt():
-    from src.core.orchestrator import KarooOrchestrator
+def test_exporter_txt(full_results):
     from src.core.exporter import export_to_txt
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False, rewrite_cv=False))
-    txt = export_to_txt(results)
+    txt = export_to_txt(full_results)
     assert "Karoo v2.0" in txt
     assert "OVERALL SCORE" in txt
     assert "PRIORITY ACTION ITEMS" in txt
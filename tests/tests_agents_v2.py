@@ -2,10 +2,30 @@
 Karoo- v2.0 Test Suite
 All tests run in rule-based mode — no API key required.
 Run: pytest tests/ -v
+With pytest-xdist: pytest -n auto --dist=loadfile tests/
+(--dist=loadfile keeps this whole file on one worker so the
+module-scoped orchestrator/agent fixtures are shared, not re-run.)
 """
 import asyncio
+import importlib
+import re
+
 import pytest
 
+from src.agents.algorithm_breaker import AlgorithmBreaker
+from src.agents.sa_specialist import SASpecialist
+from src.agents.global_setter import GlobalSetter
+from src.agents.recruiter_scanner import RecruiterScanner
+from src.agents.hiring_manager_whisperer import HiringManagerWhisperer
+from src.agents.semantic_matcher import SemanticMatcher
+from src.agents.compliance_guardian import ComplianceGuardian
+from src.agents.future_architect import FutureArchitect
+from src.agents.linkedin_optimizer import LinkedInOptimizer
+from src.agents.interview_coach import InterviewCoach
+from src.agents.cover_letter_agent import CoverLetterAgent
+from src.core.orchestrator import KarooOrchestrator
+from src.core.exporter import export_to_txt, export_to_docx
+
 # ─── Sample Data ─────────────────────────────────────────────────────────────
 
 CV = """
@@ -68,38 +88,126 @@ CTX = {
     "generate_cover_letter": False,
 }
 
+# Perturbed CV variants, built once at import instead of per test run.
+DIRTY_CV = CV + "\nMarital Status: Married | Religion: Christian | DOB: 1985-01-15"
+KILLER_CV = CV + "\nResponsible for managing the team. Duties included reporting."
+NO_LI_CV = CV.replace("linkedin.com/in/janesmith", "")
+ID_CV = CV + "\nID Number: 8501015000082\nMarried | DOB: 1985-01-15"
+RISKY_CV = CV + "\nGraduated class of 1985. Hobbies: Church choir, family."
+
+# Keyword sets the finding-scan tests look for, compiled once into
+# alternations so each scan is a single C-level pass. Patterns keep the
+# exact substrings of the old any(w in text) checks.
+NQF_RE = re.compile(r"NQF|7")
+GDPR_RE = re.compile(r"marital|religion|remove|gdpr", re.I)
+KILLER_RE = re.compile(r"responsible for|duties|replace|killer", re.I)
+SENSITIVE_RE = re.compile(r"id|remove|popia|marital|sensitive", re.I)
+MISSING_LI_RE = re.compile(r"missing|linkedin|url|add", re.I)
+
+# First-matching-finding probes, compiled once for the next(filter())
+# scans below.
+_AF_RE = re.compile(r"Above|Fold")
+_AI_RE = re.compile(r"AI Displacement")
+_LOW_MED_RE = re.compile(r"LOW|MEDIUM")
+
+
+def _all_text(r):
+    """Findings and recommendations as one lowered haystack."""
+    return " ".join(r.findings + r.recommendations).lower()
+
+
+# One event loop for the whole module. run() used to build and tear
+# down a fresh loop per call — ~30 selector/handle setups for tests
+# that only need somewhere to drive a coroutine.
+_LOOP = None
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _event_loop():
+    global _LOOP
+    _LOOP = asyncio.new_event_loop()
+    asyncio.set_event_loop(_LOOP)
+    yield
+    _LOOP.close()
+    asyncio.set_event_loop(None)
+    _LOOP = None
+
 
 def run(coro):
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    return _LOOP.run_until_complete(coro)
+
+
+# Every clean-CV agent test awaits the same analyze(CV, JD, CTX) call —
+# three of them on an agent another test already ran. One gather per
+# module produces all ten results; edge-case tests with perturbed CVs
+# keep their own calls.
+@pytest.fixture(scope="module")
+def agent_results():
+    classes = {
+        "algorithm_breaker": AlgorithmBreaker,
+        "sa_specialist": SASpecialist,
+        "global_setter": GlobalSetter,
+        "recruiter_scanner": RecruiterScanner,
+        "compliance_guardian": ComplianceGuardian,
+        "semantic_matcher": SemanticMatcher,
+        "future_architect": FutureArchitect,
+        "linkedin_optimizer": LinkedInOptimizer,
+        "interview_coach": InterviewCoach,
+        "cover_letter_agent": CoverLetterAgent,
+    }
+
+    async def _gather():
+        outs = await asyncio.gather(
+            *(cls(llm=None).analyze(CV, JD, CTX) for cls in classes.values()))
+        return dict(zip(classes, outs))
+
+    return run(_gather())
+
+
+# One full pipeline run shared by every orchestrator/exporter test below.
+# The rule-based pipeline is deterministic for a fixed (CV, JD, CTX), so
+# seven identical optimize() runs were pure recompute.
+@pytest.fixture(scope="module")
+def orch():
+    return KarooOrchestrator()
+
+
+@pytest.fixture(scope="module")
+def orch_results(orch):
+    return run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
 
 
 # ─── Import Tests ─────────────────────────────────────────────────────────────
 
+# Single source of truth for the public surface the suite relies on.
+_MODULES = (
+    "src.agents.algorithm_breaker:AlgorithmBreaker",
+    "src.agents.sa_specialist:SASpecialist",
+    "src.agents.global_setter:GlobalSetter",
+    "src.agents.recruiter_scanner:RecruiterScanner",
+    "src.agents.hiring_manager_whisperer:HiringManagerWhisperer",
+    "src.agents.semantic_matcher:SemanticMatcher",
+    "src.agents.compliance_guardian:ComplianceGuardian",
+    "src.agents.future_architect:FutureArchitect",
+    "src.agents.linkedin_optimizer:LinkedInOptimizer",
+    "src.agents.interview_coach:InterviewCoach",
+    "src.agents.cover_letter_agent:CoverLetterAgent",
+    "src.core.orchestrator:KarooOrchestrator",
+    "src.core.exporter:export_to_txt",
+    "src.core.exporter:export_to_docx",
+)
+
+
 def test_all_v2_imports():
-    from src.agents.algorithm_breaker import AlgorithmBreaker
-    from src.agents.sa_specialist import SASpecialist
-    from src.agents.global_setter import GlobalSetter
-    from src.agents.recruiter_scanner import RecruiterScanner
-    from src.agents.hiring_manager_whisperer import HiringManagerWhisperer
-    from src.agents.semantic_matcher import SemanticMatcher
-    from src.agents.compliance_guardian import ComplianceGuardian
-    from src.agents.future_architect import FutureArchitect
-    from src.agents.linkedin_optimizer import LinkedInOptimizer
-    from src.agents.interview_coach import InterviewCoach
-    from src.agents.cover_letter_agent import CoverLetterAgent
-    from src.core.orchestrator import KarooOrchestrator
-    from src.core.exporter import export_to_txt, export_to_docx
+    for spec in _MODULES:
+        mod, name = spec.split(":")
+        assert hasattr(importlib.import_module(mod), name), spec
 
 
 # ─── Original Agent Tests ─────────────────────────────────────────────────────
 
-def test_algorithm_breaker():
-    from src.agents.algorithm_breaker import AlgorithmBreaker
-    r = run(AlgorithmBreaker(llm=None).analyze(CV, JD, CTX))
+def test_algorithm_breaker(agent_results):
+    r = agent_results["algorithm_breaker"]
     assert r.agent_name == "The Algorithm Breaker"
     assert 0 <= r.score <= 100
     assert len(r.findings) >= 5
@@ -107,73 +215,58 @@ def test_algorithm_breaker():
     assert r.mode == "rule-based"
 
 
-def test_sa_specialist_nqf_detection():
-    from src.agents.sa_specialist import SASpecialist
-    r = run(SASpecialist(llm=None).analyze(CV, JD, CTX))
+def test_sa_specialist_nqf_detection(agent_results):
+    r = agent_results["sa_specialist"]
     assert r.agent_name == "The South African Specialist"
     assert 0 <= r.score <= 100
-    assert any("NQF" in f or "7" in f for f in r.findings)
+    assert any(NQF_RE.search(f) for f in r.findings)
     assert r.weight == 1.5  # v2 weight
 
 
-def test_global_setter_clean_cv():
-    from src.agents.global_setter import GlobalSetter
-    r = run(GlobalSetter(llm=None).analyze(CV, JD, CTX))
+def test_global_setter_clean_cv(agent_results):
+    r = agent_results["global_setter"]
     assert r.score >= 40
     gdpr_violations = [f for f in r.findings if "NON-COMPLIANT" in f]
     assert len(gdpr_violations) == 0  # Clean CV should pass
 
 
 def test_global_setter_catches_gdpr():
-    from src.agents.global_setter import GlobalSetter
-    dirty = CV + "\nMarital Status: Married | Religion: Christian | DOB: 1985-01-15"
-    r = run(GlobalSetter(llm=None).analyze(dirty, JD, CTX))
-    all_text = " ".join(r.findings + r.recommendations).lower()
-    assert any(w in all_text for w in ["marital", "religion", "remove", "gdpr"])
+    r = run(GlobalSetter(llm=None).analyze(DIRTY_CV, JD, CTX))
+    assert GDPR_RE.search(_all_text(r))
 
 
 def test_recruiter_scanner_finds_killers():
-    from src.agents.recruiter_scanner import RecruiterScanner
-    killer_cv = CV + "\nResponsible for managing the team. Duties included reporting."
-    r = run(RecruiterScanner(llm=None).analyze(killer_cv, JD, CTX))
-    all_text = " ".join(r.findings + r.recommendations).lower()
-    assert any(w in all_text for w in ["responsible for", "duties", "replace", "killer"])
+    r = run(RecruiterScanner(llm=None).analyze(KILLER_CV, JD, CTX))
+    assert KILLER_RE.search(_all_text(r))
 
 
-def test_recruiter_scanner_above_fold():
-    from src.agents.recruiter_scanner import RecruiterScanner
-    r = run(RecruiterScanner(llm=None).analyze(CV, JD, CTX))
-    above_fold_finding = next((f for f in r.findings if "Above" in f or "Fold" in f), None)
+def test_recruiter_scanner_above_fold(agent_results):
+    r = agent_results["recruiter_scanner"]
+    above_fold_finding = next(filter(_AF_RE.search, r.findings), None)
     assert above_fold_finding is not None  # v2 should report above-fold score
 
 
-def test_compliance_clean_cv():
-    from src.agents.compliance_guardian import ComplianceGuardian
-    r = run(ComplianceGuardian(llm=None).analyze(CV, JD, CTX))
+def test_compliance_clean_cv(agent_results):
+    r = agent_results["compliance_guardian"]
     assert r.score >= 50
     assert any("COMPLIANT" in f for f in r.findings)
 
 
 def test_compliance_catches_sensitive():
-    from src.agents.compliance_guardian import ComplianceGuardian
-    id_cv = CV + "\nID Number: 8501015000082\nMarried | DOB: 1985-01-15"
-    r = run(ComplianceGuardian(llm=None).analyze(id_cv, JD, CTX))
-    all_text = " ".join(r.findings + r.recommendations).lower()
-    assert any(w in all_text for w in ["id", "remove", "popia", "marital", "sensitive"])
+    r = run(ComplianceGuardian(llm=None).analyze(ID_CV, JD, CTX))
+    assert SENSITIVE_RE.search(_all_text(r))
     assert r.score < 90
 
 
-def test_semantic_matcher():
-    from src.agents.semantic_matcher import SemanticMatcher
-    r = run(SemanticMatcher(llm=None).analyze(CV, JD, CTX))
+def test_semantic_matcher(agent_results):
+    r = agent_results["semantic_matcher"]
     assert 0 <= r.score <= 100
     assert any("Cosine" in f for f in r.findings)
     assert any("Skill Tree" in f for f in r.findings)  # v2 addition
 
 
-def test_future_architect_emerging_skills():
-    from src.agents.future_architect import FutureArchitect
-    r = run(FutureArchitect(llm=None).analyze(CV, JD, CTX))
+def test_future_architect_emerging_skills(agent_results):
+    r = agent_results["future_architect"]
     assert 0 <= r.score <= 100
     assert any("Emerging" in f for f in r.findings)
     assert any("AI Displacement" in f for f in r.findings)  # v2 addition
@@ -181,9 +274,8 @@ def test_future_architect_emerging_skills():
 
 # ─── NEW v2 Agent Tests ───────────────────────────────────────────────────────
 
-def test_linkedin_optimizer_new():
-    from src.agents.linkedin_optimizer import LinkedInOptimizer
-    r = run(LinkedInOptimizer(llm=None).analyze(CV, JD, CTX))
+def test_linkedin_optimizer_new(agent_results):
+    r = agent_results["linkedin_optimizer"]
     assert r.agent_name == "The LinkedIn Optimizer"
     assert 0 <= r.score <= 100
     assert len(r.findings) >= 4
@@ -192,23 +284,18 @@ def test_linkedin_optimizer_new():
 
 
 def test_linkedin_optimizer_missing_url():
-    from src.agents.linkedin_optimizer import LinkedInOptimizer
-    no_li_cv = CV.replace("linkedin.com/in/janesmith", "")
-    r = run(LinkedInOptimizer(llm=None).analyze(no_li_cv, JD, CTX))
-    all_text = " ".join(r.findings + r.recommendations).lower()
-    assert any(w in all_text for w in ["missing", "linkedin", "url", "add"])
+    r = run(LinkedInOptimizer(llm=None).analyze(NO_LI_CV, JD, CTX))
+    assert MISSING_LI_RE.search(_all_text(r))
 
 
-def test_interview_coach_new():
-    from src.agents.interview_coach import InterviewCoach
-    r = run(InterviewCoach(llm=None).analyze(CV, JD, CTX))
+def test_interview_coach_new(agent_results):
+    r = agent_results["interview_coach"]
     assert r.agent_name == "The Interview Coach"
     assert 0 <= r.score <= 100
     assert len(r.findings) >= 3
 
 
 def test_interview_coach_extracts_claims():
-    from src.agents.interview_coach import InterviewCoach
     coach = InterviewCoach(llm=None)
     claims = coach._extract_key_claims(CV)
     # CV has many quantified bullets — should find some
@@ -216,9 +303,8 @@ def test_interview_coach_extracts_claims():
     assert any('%' in c or 'R' in c or 'x' in c for c in claims)
 
 
-def test_cover_letter_v2():
-    from src.agents.cover_letter_agent import CoverLetterAgent
-    r = run(CoverLetterAgent(llm=None).analyze(CV, JD, CTX))
+def test_cover_letter_v2(agent_results):
+    r = agent_results["cover_letter_agent"]
     assert r.agent_name == "The Cover Letter Composer"
     assert r.score >= 0
     # v2 should find company name
@@ -227,11 +313,7 @@ def test_cover_letter_v2():
 
 # ─── Orchestrator v2 Tests ────────────────────────────────────────────────────
 
-def test_orchestrator_v2_runs_11_agents():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
-
+def _check_runs_11_agents(results):
     assert "summary" in results
     assert "agent_results" in results
     assert "cv_variants" in results
@@ -242,19 +324,13 @@ def test_orchestrator_v2_runs_11_agents():
     assert len(results["agent_results"]) == 10
 
 
-def test_orchestrator_new_agents_present():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
+def _check_new_agents_present(results):
     agents = results["agent_results"]
     assert "linkedin_optimizer" in agents
     assert "interview_coach" in agents
 
 
-def test_orchestrator_summary_v2():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
+def _check_summary_v2(results):
     s = results["summary"]
     assert "overall_score" in s
     assert "confidence" in s        # v2 addition
@@ -265,10 +341,7 @@ def test_orchestrator_summary_v2():
     assert s["recommended_variant"] in ["BALANCED", "Karoo-MAX", "CREATIVE"]
 
 
-def test_orchestrator_3_variants():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
+def _check_3_variants(results):
     v = results["cv_variants"]
     assert "Karoo_max" in v and "balanced" in v and "creative" in v
     assert all(len(x) > 100 for x in v.values())
@@ -276,45 +349,73 @@ def test_orchestrator_3_variants():
     assert "Jane Smith" in v["balanced"]
 
 
-def test_orchestrator_action_items():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
+def _check_action_items(results):
     items = results["action_items"]
     assert isinstance(items, list)
     # Should have some action items even in rule-based mode
     assert len(items) >= 0  # May be 0 in pure rule-based
 
 
-def test_orchestrator_metadata_v2():
-    from src.core.orchestrator import KarooOrchestrator
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
+def _check_metadata_v2(results):
     meta = results["metadata"]
     assert meta["version"] == "2.0.0"
     assert "total_tokens" in meta
     assert "agents_parallel_ms" in meta
     assert meta["agents_run"] == 10
+    # The fan-out must beat the agents' summed serial time whenever
+    # they do real I/O. Rule-based agents are pure CPU on one loop, so
+    # wall time cannot beat the sum there — only check AI runs.
+    if results["ai_mode"]:
+        assert meta["agents_parallel_ms"] < sum(
+            ar["execution_ms"] for ar in results["agent_results"].values())
+
+
+@pytest.mark.parametrize("check", [
+    pytest.param(_check_runs_11_agents, id="v2_runs_11_agents"),
+    pytest.param(_check_new_agents_present, id="new_agents_present"),
+    pytest.param(_check_summary_v2, id="summary_v2"),
+    pytest.param(_check_3_variants, id="3_variants"),
+    pytest.param(_check_action_items, id="action_items"),
+    pytest.param(_check_metadata_v2, id="metadata_v2"),
+])
+def test_orchestrator(orch_results, check):
+    check(orch_results)
 
 
 # ─── Exporter Tests ───────────────────────────────────────────────────────────
 
-def test_exporter_txt_v2():
-    from src.core.orchestrator import KarooOrchestrator
-    from src.core.exporter import export_to_txt
-    orch = KarooOrchestrator()
-    results = run(orch.optimize(CV, JD, CTX, generate_cover_letter=False))
-    txt = export_to_txt(results)
-    assert "Karoo- v2.0" in txt
-    assert "OVERALL SCORE" in txt
-    assert "PRIORITY ACTION ITEMS" in txt
-    assert "AGENT SCORES" in txt
-    assert len(txt) > 1000
+@pytest.fixture(scope="module")
+def txt_export(orch_results):
+    return export_to_txt(orch_results)
+
+
+@pytest.mark.parametrize("needle", [
+    "Karoo- v2.0",
+    "OVERALL SCORE",
+    "PRIORITY ACTION ITEMS",
+    "AGENT SCORES",
+])
+def test_exporter_txt_v2(txt_export, needle):
+    assert needle in txt_export
+
+
+def test_exporter_txt_v2_length(txt_export):
+    assert len(txt_export) > 1000
 
 
 # ─── Job Scraper Tests ────────────────────────────────────────────────────────
 
-def test_job_scraper_invalid_url():
+def test_job_scraper_invalid_url(monkeypatch):
+    import src.core.job_scraper as job_scraper
+
+    def _no_network():
+        raise AssertionError("invalid URL reached the HTTP layer")
+
+    # Invalid input must short-circuit in-process; if validation ever
+    # regresses, fail immediately instead of hanging on DNS/connect.
+    monkeypatch.setattr(job_scraper, "_http_session", _no_network)
+    # stays local: a failed import here should fail these two tests,
+    # not collection of the whole module
     from src.core.job_scraper import scrape_job_url, is_supported_url
     result = scrape_job_url("not-a-url")
     assert result is None
@@ -329,14 +430,12 @@ def test_job_scraper_supported_url_check():
 
 # ─── SA Specialist v2 Extras ──────────────────────────────────────────────────
 
-def test_sa_specialist_critical_skills():
-    from src.agents.sa_specialist import SASpecialist
-    r = run(SASpecialist(llm=None).analyze(CV, JD, CTX))
+def test_sa_specialist_critical_skills(agent_results):
+    r = agent_results["sa_specialist"]
     assert any("Critical Skills" in f for f in r.findings)
 
 
 def test_sa_specialist_nqf_levels():
-    from src.agents.sa_specialist import SASpecialist
     agent = SASpecialist(llm=None)
     assert agent._detect_nqf("BSc Computer Science")['level'] == 7
     assert agent._detect_nqf("MBA degree holder")['level'] == 9
@@ -347,30 +446,26 @@ def test_sa_specialist_nqf_levels():
 # ─── Compliance v2 Extras ─────────────────────────────────────────────────────
 
 def test_compliance_ai_bias_detection():
-    from src.agents.compliance_guardian import ComplianceGuardian
     agent = ComplianceGuardian(llm=None)
-    risky_cv = CV + "\nGraduated class of 1985. Hobbies: Church choir, family."
-    risks = agent._ai_bias_risks(risky_cv)
+    risks = agent._ai_bias_risks(RISKY_CV)
     # Should detect at least one bias risk
     assert len(risks) >= 0  # May detect graduation year or religion-adjacent
 
 
 # ─── Future Architect v2 ──────────────────────────────────────────────────────
 
-def test_future_architect_ai_risk():
-    from src.agents.future_architect import FutureArchitect
-    r = run(FutureArchitect(llm=None).analyze(CV, JD, CTX))
-    assert any("AI Displacement" in f for f in r.findings)
+def test_future_architect_ai_risk(agent_results):
+    r = agent_results["future_architect"]
+    assert any(_AI_RE.search(f) for f in r.findings)
     # CV has GitHub Copilot, Python etc — should be LOW risk
-    ai_finding = next((f for f in r.findings if "AI Displacement" in f), "")
-    assert "LOW" in ai_finding or "MEDIUM" in ai_finding
+    ai_finding = next(filter(_AI_RE.search, r.findings), "")
+    assert _LOW_MED_RE.search(ai_finding)
 
 
 # ─── Base Agent v2 ────────────────────────────────────────────────────────────
 
-def test_base_agent_output_has_v2_fields():
-    from src.agents.algorithm_breaker import AlgorithmBreaker
-    r = run(AlgorithmBreaker(llm=None).analyze(CV, JD, CTX))
+def test_base_agent_output_has_v2_fields(agent_results):
+    r = agent_results["algorithm_breaker"]
     assert hasattr(r, 'confidence')
     assert hasattr(r, 'tokens_used')
     assert hasattr(r, 'execution_ms')